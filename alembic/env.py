@@ -11,8 +11,13 @@ from app.models.category import Category  # noqa: F401
 from app.models.goal import Goal  # noqa: F401
 from app.models.milestone import Milestone  # noqa: F401
 from app.models.task import Task, TaskNote  # noqa: F401
+from app.models.occurrence import TaskOccurrence  # noqa: F401
 from app.models.checklist import ChecklistItem  # noqa: F401
 from app.models.notification import Notification  # noqa: F401
+from app.models.analytics import UserAnalytics  # noqa: F401
+from app.models.activity import ActivityEvent, DailyActivity  # noqa: F401
+from app.models.resource_version import ResourceVersion  # noqa: F401
+from app.models.job import Job  # noqa: F401
 
 from app.config import get_settings
 
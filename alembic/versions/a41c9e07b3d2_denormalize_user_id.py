@@ -0,0 +1,60 @@
+"""denormalize_user_id
+
+Revision ID: a41c9e07b3d2
+Revises: f3fed425db5a
+Create Date: 2026-10-18 11:40:05
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41c9e07b3d2'
+down_revision: Union[str, None] = 'f3fed425db5a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Table, the parent it copies user_id from, and the column pointing at it
+PARENTS = [
+    ('milestones', 'goals', 'goal_id'),
+    ('tasks', 'milestones', 'milestone_id'),
+    ('checklist_items', 'tasks', 'task_id'),
+    ('task_notes', 'tasks', 'task_id'),
+]
+
+
+def upgrade() -> None:
+    for table, parent, parent_id in PARENTS:
+        op.add_column(table, sa.Column('user_id', sa.String(length=36), nullable=True))
+        # Parents are filled before their children
+        op.execute(f"""
+            UPDATE {table} SET user_id = {parent}.user_id
+            FROM {parent}
+            WHERE {table}.{parent_id} = {parent}.id
+        """)
+        op.alter_column(table, 'user_id', nullable=False)
+        op.create_foreign_key(
+            op.f(f'{table}_user_id_fkey'), table, 'users', ['user_id'], ['id'], ondelete='CASCADE'
+        )
+
+    op.create_index('ix_milestones_user_id_status', 'milestones', ['user_id', 'status'], unique=False)
+    op.create_index('ix_tasks_user_id_status', 'tasks', ['user_id', 'status'], unique=False)
+    op.create_index('ix_tasks_user_id_due_date', 'tasks', ['user_id', 'due_date'], unique=False)
+    op.create_index(op.f('ix_checklist_items_user_id'), 'checklist_items', ['user_id'], unique=False)
+    op.create_index(op.f('ix_task_notes_user_id'), 'task_notes', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_task_notes_user_id'), table_name='task_notes')
+    op.drop_index(op.f('ix_checklist_items_user_id'), table_name='checklist_items')
+    op.drop_index('ix_tasks_user_id_due_date', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_status', table_name='tasks')
+    op.drop_index('ix_milestones_user_id_status', table_name='milestones')
+
+    for table, _, _ in reversed(PARENTS):
+        op.drop_constraint(op.f(f'{table}_user_id_fkey'), table, type_='foreignkey')
+        op.drop_column(table, 'user_id')
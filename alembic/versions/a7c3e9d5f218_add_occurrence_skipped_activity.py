@@ -0,0 +1,29 @@
+"""add_occurrence_skipped_activity
+
+Revision ID: a7c3e9d5f218
+Revises: f5c8e2a7d140
+Create Date: 2026-10-18 21:48:19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9d5f218'
+down_revision: Union[str, None] = 'f5c8e2a7d140'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TYPE activitytype ADD VALUE IF NOT EXISTS 'OCCURRENCE_SKIPPED'")
+    op.add_column('daily_activity', sa.Column('occurrences_skipped', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('daily_activity', 'occurrences_skipped')
+    # Postgres cannot drop an enum value; only the events go
+    op.execute("DELETE FROM activity_events WHERE type = 'OCCURRENCE_SKIPPED'")
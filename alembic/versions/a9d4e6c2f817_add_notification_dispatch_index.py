@@ -0,0 +1,29 @@
+"""add_notification_dispatch_index
+
+Revision ID: a9d4e6c2f817
+Revises: f1b6d3e8a275
+Create Date: 2026-10-18 17:12:03
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d4e6c2f817'
+down_revision: Union[str, None] = 'f1b6d3e8a275'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_notifications_unsent_trigger_at', 'notifications', ['trigger_at'],
+        unique=False, postgresql_where=sa.text('NOT is_sent'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_unsent_trigger_at', table_name='notifications')
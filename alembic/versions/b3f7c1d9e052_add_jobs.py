@@ -0,0 +1,45 @@
+"""add_jobs
+
+Revision ID: b3f7c1d9e052
+Revises: a9d4e6c2f817
+Create Date: 2026-10-18 17:48:21
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f7c1d9e052'
+down_revision: Union[str, None] = 'a9d4e6c2f817'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('jobs',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('key', sa.String(length=255), nullable=True),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'FAILED', name='jobstatus'), nullable=False),
+    sa.Column('run_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('timeout_seconds', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_jobs_runnable', 'jobs', ['priority', 'run_at'], unique=False, postgresql_where=sa.text("status <> 'FAILED'"))
+    op.create_index('uq_jobs_key', 'jobs', ['key'], unique=True, postgresql_where=sa.text("status <> 'FAILED'"))
+
+
+def downgrade() -> None:
+    op.drop_index('uq_jobs_key', table_name='jobs')
+    op.drop_index('ix_jobs_runnable', table_name='jobs')
+    op.drop_table('jobs')
+    sa.Enum(name='jobstatus').drop(op.get_bind(), checkfirst=True)
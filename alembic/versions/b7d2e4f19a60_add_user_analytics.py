@@ -0,0 +1,71 @@
+"""add_user_analytics
+
+Revision ID: b7d2e4f19a60
+Revises: a41c9e07b3d2
+Create Date: 2026-10-18 13:05:47
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e4f19a60'
+down_revision: Union[str, None] = 'a41c9e07b3d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COUNTERS = [
+    'total_goals',
+    'completed_goals',
+    'active_goals',
+    'total_milestones',
+    'completed_milestones',
+    'total_tasks',
+    'completed_tasks',
+    'overdue_tasks',
+]
+
+
+def upgrade() -> None:
+    op.create_table('user_analytics',
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    *[sa.Column(name, sa.Integer(), nullable=False) for name in COUNTERS],
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    op.execute("""
+        INSERT INTO user_analytics (user_id, total_goals, completed_goals, active_goals, total_milestones,
+                                    completed_milestones, total_tasks, completed_tasks, overdue_tasks)
+        SELECT users.id,
+               coalesce(g.total, 0), coalesce(g.completed, 0), coalesce(g.active, 0),
+               coalesce(m.total, 0), coalesce(m.completed, 0),
+               coalesce(t.total, 0), coalesce(t.completed, 0), coalesce(t.overdue, 0)
+        FROM users
+        LEFT JOIN (
+            SELECT user_id, count(*) AS total,
+                   count(*) FILTER (WHERE status = 'COMPLETED') AS completed,
+                   count(*) FILTER (WHERE status = 'ACTIVE') AS active
+            FROM goals GROUP BY user_id
+        ) AS g ON g.user_id = users.id
+        LEFT JOIN (
+            SELECT user_id, count(*) AS total,
+                   count(*) FILTER (WHERE status = 'COMPLETED') AS completed
+            FROM milestones GROUP BY user_id
+        ) AS m ON m.user_id = users.id
+        LEFT JOIN (
+            SELECT user_id, count(*) AS total,
+                   count(*) FILTER (WHERE status = 'COMPLETED') AS completed,
+                   count(*) FILTER (WHERE status = 'OVERDUE') AS overdue
+            FROM tasks GROUP BY user_id
+        ) AS t ON t.user_id = users.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('user_analytics')
@@ -0,0 +1,51 @@
+"""add_activity_log
+
+Revision ID: c5a91f3e7d24
+Revises: b7d2e4f19a60
+Create Date: 2026-10-18 14:22:10
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a91f3e7d24'
+down_revision: Union[str, None] = 'b7d2e4f19a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('activity_events',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('goal_id', sa.String(length=36), nullable=False),
+    sa.Column('task_id', sa.String(length=36), nullable=False),
+    sa.Column('checklist_item_id', sa.String(length=36), nullable=True),
+    sa.Column('type', sa.Enum('TASK_COMPLETED', 'TASK_REOPENED', 'CHECKLIST_ITEM_COMPLETED', 'CHECKLIST_ITEM_REOPENED', name='activitytype'), nullable=False),
+    sa.Column('occurred_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_activity_events_user_id_occurred_at', 'activity_events', ['user_id', 'occurred_at'], unique=False)
+    op.create_table('daily_activity',
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('goal_id', sa.String(length=36), nullable=False),
+    sa.Column('tasks_completed', sa.Integer(), nullable=False),
+    sa.Column('tasks_reopened', sa.Integer(), nullable=False),
+    sa.Column('items_completed', sa.Integer(), nullable=False),
+    sa.Column('items_reopened', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'day', 'goal_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('daily_activity')
+    op.drop_index('ix_activity_events_user_id_occurred_at', table_name='activity_events')
+    op.drop_table('activity_events')
+    sa.Enum(name='activitytype').drop(op.get_bind(), checkfirst=True)
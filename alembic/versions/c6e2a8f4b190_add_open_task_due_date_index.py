@@ -0,0 +1,29 @@
+"""add_open_task_due_date_index
+
+Revision ID: c6e2a8f4b190
+Revises: b3f7c1d9e052
+Create Date: 2026-10-18 18:25:37
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e2a8f4b190'
+down_revision: Union[str, None] = 'b3f7c1d9e052'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_tasks_open_due_date', 'tasks', ['due_date'],
+        unique=False, postgresql_where=sa.text("status IN ('PENDING', 'IN_PROGRESS')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_open_due_date', table_name='tasks')
@@ -0,0 +1,63 @@
+"""add_task_occurrences
+
+Revision ID: d4a9f0b7c318
+Revises: c6e2a8f4b190
+Create Date: 2026-10-18 19:06:52
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a9f0b7c318'
+down_revision: Union[str, None] = 'c6e2a8f4b190'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('task_occurrences',
+    sa.Column('task_id', sa.String(length=36), nullable=False),
+    sa.Column('occurs_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('status', sa.Enum('COMPLETED', 'SKIPPED', name='occurrencestatus'), nullable=True),
+    sa.Column('scheduled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('task_id', 'occurs_at')
+    )
+    op.create_index('ix_task_occurrences_user_id_occurs_at', 'task_occurrences', ['user_id', 'occurs_at'], unique=False)
+    op.create_index(
+        'ix_task_occurrences_user_id_scheduled_at', 'task_occurrences', ['user_id', 'scheduled_at'],
+        unique=False, postgresql_where=sa.text('scheduled_at IS NOT NULL'),
+    )
+
+    # Repeating tasks are no longer swept to OVERDUE; their occurrences are
+    op.drop_index('ix_tasks_open_due_date', table_name='tasks')
+    op.create_index(
+        'ix_tasks_open_due_date', 'tasks', ['due_date'],
+        unique=False, postgresql_where=sa.text("status IN ('PENDING', 'IN_PROGRESS') AND repeat_type = 'NONE'"),
+    )
+    op.create_index(
+        'ix_tasks_user_id_repeating', 'tasks', ['user_id'],
+        unique=False, postgresql_where=sa.text("repeat_type <> 'NONE'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_user_id_repeating', table_name='tasks')
+    op.drop_index('ix_tasks_open_due_date', table_name='tasks')
+    op.create_index(
+        'ix_tasks_open_due_date', 'tasks', ['due_date'],
+        unique=False, postgresql_where=sa.text("status IN ('PENDING', 'IN_PROGRESS')"),
+    )
+    op.drop_index('ix_task_occurrences_user_id_scheduled_at', table_name='task_occurrences')
+    op.drop_index('ix_task_occurrences_user_id_occurs_at', table_name='task_occurrences')
+    op.drop_table('task_occurrences')
+    sa.Enum(name='occurrencestatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,50 @@
+"""add_fractional_ranks
+
+Revision ID: d8e3b5a0c461
+Revises: c5a91f3e7d24
+Create Date: 2026-10-18 15:05:37
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8e3b5a0c461'
+down_revision: Union[str, None] = 'c5a91f3e7d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Table and the column its siblings share
+PARENTS = [
+    ('milestones', 'goal_id'),
+    ('checklist_items', 'task_id'),
+]
+
+
+def upgrade() -> None:
+    for table, parent_id in PARENTS:
+        op.add_column(table, sa.Column('rank', sa.String(length=64, collation='C'), nullable=True))
+        # Existing order becomes zero-padded hex positions with a non-zero
+        # last digit, which are valid base-62 ranks (see app.core.ranking)
+        op.execute(f"""
+            UPDATE {table} SET rank = ordered.rank
+            FROM (
+                SELECT id, lpad(to_hex(row_number() OVER (
+                    PARTITION BY {parent_id} ORDER BY order_index, created_at, id
+                )), 8, '0') || 'V' AS rank
+                FROM {table}
+            ) AS ordered
+            WHERE {table}.id = ordered.id
+        """)
+        op.alter_column(table, 'rank', nullable=False)
+        op.create_index(f'ix_{table}_{parent_id}_rank', table, [parent_id, 'rank'], unique=False)
+
+
+def downgrade() -> None:
+    for table, parent_id in reversed(PARENTS):
+        op.drop_index(f'ix_{table}_{parent_id}_rank', table_name=table)
+        op.drop_column(table, 'rank')
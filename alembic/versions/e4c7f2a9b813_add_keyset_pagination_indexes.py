@@ -0,0 +1,36 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: e4c7f2a9b813
+Revises: d8e3b5a0c461
+Create Date: 2026-10-18 15:48:12
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4c7f2a9b813'
+down_revision: Union[str, None] = 'd8e3b5a0c461'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Index, table and the columns each list route pages by
+INDEXES = [
+    ('ix_goals_user_id_created_at_id', 'goals', ['user_id', 'created_at', 'id']),
+    ('ix_notifications_user_id_created_at_id', 'notifications', ['user_id', 'created_at', 'id']),
+    ('ix_tasks_milestone_id_created_at_id', 'tasks', ['milestone_id', 'created_at', 'id']),
+    ('ix_task_notes_task_id_created_at_id', 'task_notes', ['task_id', 'created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
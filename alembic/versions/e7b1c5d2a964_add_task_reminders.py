@@ -0,0 +1,40 @@
+"""add_task_reminders
+
+Revision ID: e7b1c5d2a964
+Revises: d4a9f0b7c318
+Create Date: 2026-10-18 19:41:15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b1c5d2a964'
+down_revision: Union[str, None] = 'd4a9f0b7c318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('notifications', sa.Column('task_id', sa.String(length=36), nullable=True))
+    op.create_foreign_key(
+        'notifications_task_id_fkey', 'notifications', 'tasks', ['task_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_index(
+        'uq_notifications_task_id_reminder', 'notifications', ['task_id', 'trigger_at'],
+        unique=True, postgresql_where=sa.text("type = 'TASK_REMINDER'"),
+    )
+    op.create_index(
+        'ix_tasks_pending_reminder_at', 'tasks', ['reminder_at'],
+        unique=False, postgresql_where=sa.text("reminder_at IS NOT NULL AND status <> 'COMPLETED'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_pending_reminder_at', table_name='tasks')
+    op.drop_index('uq_notifications_task_id_reminder', table_name='notifications')
+    op.drop_constraint('notifications_task_id_fkey', 'notifications', type_='foreignkey')
+    op.drop_column('notifications', 'task_id')
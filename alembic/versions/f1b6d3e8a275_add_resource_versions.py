@@ -0,0 +1,33 @@
+"""add_resource_versions
+
+Revision ID: f1b6d3e8a275
+Revises: e4c7f2a9b813
+Create Date: 2026-10-18 16:30:44
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b6d3e8a275'
+down_revision: Union[str, None] = 'e4c7f2a9b813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Starts empty: a missing row reads as version 0
+    op.create_table('resource_versions',
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('resource', sa.String(length=32), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'resource')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('resource_versions')
@@ -0,0 +1,98 @@
+"""add_progress_counters
+
+Revision ID: f3fed425db5a
+Revises: f2a8c7d1b9e4
+Create Date: 2026-10-18 09:12:31
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3fed425db5a'
+down_revision: Union[str, None] = 'f2a8c7d1b9e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COUNTERS = {
+    'tasks': [
+        sa.Column('checklist_total', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('checklist_completed', sa.Integer(), server_default='0', nullable=False),
+    ],
+    'milestones': [
+        sa.Column('task_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('completed_task_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('task_weight_total', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('weighted_progress_sum', sa.Float(), server_default='0', nullable=False),
+    ],
+    'goals': [
+        sa.Column('milestone_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('completed_milestone_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('milestone_progress_sum', sa.Float(), server_default='0', nullable=False),
+    ],
+}
+
+
+def upgrade() -> None:
+    for table, columns in COUNTERS.items():
+        for column in columns:
+            op.add_column(table, column)
+
+    # Backfill bottom-up from the current rows
+    op.execute("""
+        UPDATE tasks SET
+            checklist_total = c.total,
+            checklist_completed = c.completed
+        FROM (
+            SELECT task_id, count(*) AS total, count(*) FILTER (WHERE is_completed) AS completed
+            FROM checklist_items
+            GROUP BY task_id
+        ) AS c
+        WHERE tasks.id = c.task_id
+    """)
+    op.execute("""
+        UPDATE milestones SET
+            task_count = t.task_count,
+            completed_task_count = t.completed,
+            task_weight_total = t.weight_total,
+            weighted_progress_sum = t.weighted_sum
+        FROM (
+            SELECT milestone_id,
+                   count(*) AS task_count,
+                   count(*) FILTER (WHERE status = 'COMPLETED') AS completed,
+                   sum(CASE WHEN estimated_time > 0 THEN estimated_time ELSE 1 END) AS weight_total,
+                   sum(progress * CASE WHEN estimated_time > 0 THEN estimated_time ELSE 1 END) AS weighted_sum
+            FROM tasks
+            GROUP BY milestone_id
+        ) AS t
+        WHERE milestones.id = t.milestone_id
+    """)
+    op.execute("""
+        UPDATE goals SET
+            milestone_count = m.milestone_count,
+            completed_milestone_count = m.completed,
+            milestone_progress_sum = m.progress_sum
+        FROM (
+            SELECT goal_id,
+                   count(*) AS milestone_count,
+                   count(*) FILTER (WHERE status = 'COMPLETED') AS completed,
+                   sum(progress) AS progress_sum
+            FROM milestones
+            GROUP BY goal_id
+        ) AS m
+        WHERE goals.id = m.goal_id
+    """)
+
+    for table, columns in COUNTERS.items():
+        for column in columns:
+            op.alter_column(table, column.name, server_default=None)
+
+
+def downgrade() -> None:
+    for table, columns in COUNTERS.items():
+        for column in columns:
+            op.drop_column(table, column.name)
@@ -0,0 +1,38 @@
+"""add_notification_attempts
+
+Revision ID: f5c8e2a7d140
+Revises: e7b1c5d2a964
+Create Date: 2026-10-18 21:06:42
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5c8e2a7d140'
+down_revision: Union[str, None] = 'e7b1c5d2a964'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('notifications', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('notifications', sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=True))
+    op.drop_index('ix_notifications_unsent_trigger_at', table_name='notifications')
+    op.create_index(
+        'ix_notifications_unsent_due_at', 'notifications', [sa.text('coalesce(next_attempt_at, trigger_at)')],
+        unique=False, postgresql_where=sa.text('NOT is_sent'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_unsent_due_at', table_name='notifications')
+    op.create_index(
+        'ix_notifications_unsent_trigger_at', 'notifications', ['trigger_at'],
+        unique=False, postgresql_where=sa.text('NOT is_sent'),
+    )
+    op.drop_column('notifications', 'next_attempt_at')
+    op.drop_column('notifications', 'attempts')
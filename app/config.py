@@ -5,6 +5,13 @@ from functools import lru_cache
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    # Optional replica for read-only handlers; unset means reads use DATABASE_URL
+    DATABASE_REPLICA_URL: str | None = None
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = -1  # seconds, -1 disables
+    DB_POOL_PRE_PING: bool = False
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements per connection, 0 disables
 
     # JWT
     JWT_SECRET_KEY: str
@@ -12,6 +19,45 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Auth cache (set the TTL to 0 to disable)
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    # Let read-only endpoints trust the signed token without loading the user
+    AUTH_TRUST_CLAIMS_FOR_READS: bool = False
+
+    # Conditional GETs: responses that depend on the clock (due reminders,
+    # overdue occurrences) get a new ETag at least this often
+    ETAG_CLOCK_SECONDS: int = 60
+
+    # Push dispatcher (python -m app.dispatcher)
+    PUSH_BACKEND: str = "app.core.push:FakePushBackend"  # "module:ClassName"
+    DISPATCH_BATCH_SIZE: int = 100
+    DISPATCH_POLL_SECONDS: float = 60.0  # fallback; due times are known ahead, see app.core.reminders
+    DISPATCH_RETRY_SECONDS: int = 300  # first retry delay, doubled per attempt
+    DISPATCH_MAX_ATTEMPTS: int = 5  # failed pushes before giving up; the notification stays listed
+    DISPATCH_DIGEST_MIN: int = 3  # pushes per device in a batch before they become one digest
+
+    # Reminder scheduler, run by the dispatcher
+    REMINDER_HORIZON_SECONDS: int = 900  # how far ahead reminders are materialized
+    REMINDER_REFRESH_SECONDS: int = 300  # how often the window is rescanned; keep below the horizon
+    REMINDER_GRACE_SECONDS: int = 3600  # reminders missed by up to this long are still sent
+
+    # Job worker (python -m app.worker); see app.core.job_queue
+    JOB_CONCURRENCY: int = 4
+    JOB_POLL_SECONDS: float = 2.0
+    JOB_TIMEOUT_SECONDS: int = 300  # default lease per attempt
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_BACKOFF_SECONDS: int = 10  # first retry delay, doubled per attempt
+    JOB_BACKOFF_MAX_SECONDS: int = 3600
+
+    # Live progress stream (GET /api/live/progress); see app.core.live
+    LIVE_MAX_PENDING: int = 500  # unsent entities per client before it is told to resync
+    LIVE_KEEPALIVE_SECONDS: float = 15.0
+
+    # Overdue sweeper job (app.jobs.overdue)
+    OVERDUE_SWEEP_SECONDS: int = 300
+    OVERDUE_SWEEP_BATCH_SIZE: int = 1000
+
     # App
     APP_NAME: str = "GoalPilot"
     DEBUG: bool = False
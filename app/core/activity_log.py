@@ -0,0 +1,143 @@
+from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, delete, func, cast, Date
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.models.activity import ActivityEvent, ActivityType, DailyActivity
+from app.models.task import Task, TaskStatus
+from app.models.occurrence import OccurrenceStatus
+from app.models.milestone import Milestone
+
+# Completions are recorded on the session while a request runs and written
+# by flush_activity() right before commit: one INSERT for the events and one
+# upsert for the daily rollups they touch. Reads go to daily_activity only.
+
+_PENDING_KEY = "pending_activity"
+
+# Rollup column each event type increments
+ROLLUP_COLUMNS = {
+    ActivityType.TASK_COMPLETED: "tasks_completed",
+    ActivityType.TASK_REOPENED: "tasks_reopened",
+    ActivityType.CHECKLIST_ITEM_COMPLETED: "items_completed",
+    ActivityType.CHECKLIST_ITEM_REOPENED: "items_reopened",
+    ActivityType.OCCURRENCE_SKIPPED: "occurrences_skipped",
+}
+
+
+def _pending(db: AsyncSession) -> list[tuple]:
+    return db.info.setdefault(_PENDING_KEY, [])
+
+
+def record_task_status(
+    db: AsyncSession, user_id: str, task_id: str, before: TaskStatus | None, after: TaskStatus | None
+) -> None:
+    """Log a task completing or being reopened. Creation and deletion are not activity."""
+    if before is None or after is None or before == after:
+        return
+    if after == TaskStatus.COMPLETED:
+        _pending(db).append((user_id, task_id, None, ActivityType.TASK_COMPLETED))
+    elif before == TaskStatus.COMPLETED:
+        _pending(db).append((user_id, task_id, None, ActivityType.TASK_REOPENED))
+
+
+def record_occurrence_status(
+    db: AsyncSession, user_id: str, task_id: str, before: OccurrenceStatus | None, after: OccurrenceStatus | None
+) -> None:
+    """Log an occurrence of a repeating task completing, being reopened or being skipped.
+
+    A skip is its own activity: it neither counts as a completion nor undoes
+    one. Taking a skip back (to pending) is not logged.
+    """
+    if before == after:
+        return
+    if after == OccurrenceStatus.SKIPPED:
+        _pending(db).append((user_id, task_id, None, ActivityType.OCCURRENCE_SKIPPED))
+    elif after == OccurrenceStatus.COMPLETED:
+        _pending(db).append((user_id, task_id, None, ActivityType.TASK_COMPLETED))
+    elif before == OccurrenceStatus.COMPLETED:
+        _pending(db).append((user_id, task_id, None, ActivityType.TASK_REOPENED))
+
+
+def record_checklist_toggle(db: AsyncSession, user_id: str, task_id: str, item_id: str, completed: bool) -> None:
+    activity_type = ActivityType.CHECKLIST_ITEM_COMPLETED if completed else ActivityType.CHECKLIST_ITEM_REOPENED
+    _pending(db).append((user_id, task_id, item_id, activity_type))
+
+
+async def flush_activity(db: AsyncSession) -> None:
+    pending = db.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+
+    task_ids = {task_id for _, task_id, _, _ in pending}
+    result = await db.execute(
+        select(Task.id, Milestone.goal_id)
+        .join(Milestone, Milestone.id == Task.milestone_id)
+        .where(Task.id.in_(task_ids))
+    )
+    goal_ids = dict(result.all())
+
+    now = datetime.now(timezone.utc)
+    events = [
+        {
+            "user_id": user_id,
+            "goal_id": goal_ids[task_id],
+            "task_id": task_id,
+            "checklist_item_id": item_id,
+            "type": activity_type,
+            "occurred_at": now,
+        }
+        # A task deleted later in the same request leaves nothing to attribute
+        for user_id, task_id, item_id, activity_type in pending
+        if task_id in goal_ids
+    ]
+    if not events:
+        return
+
+    await db.execute(insert(ActivityEvent), events)
+
+    rollups: dict[tuple, dict] = {}
+    for event in events:
+        key = (event["user_id"], now.date(), event["goal_id"])
+        counts = rollups.setdefault(key, dict.fromkeys(ROLLUP_COLUMNS.values(), 0))
+        counts[ROLLUP_COLUMNS[event["type"]]] += 1
+    await _upsert_rollups(
+        db, [{"user_id": u, "day": d, "goal_id": g, **counts} for (u, d, g), counts in rollups.items()]
+    )
+
+
+async def _upsert_rollups(db: AsyncSession, rows: list[dict]) -> None:
+    stmt = pg_insert(DailyActivity).values(rows)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[DailyActivity.user_id, DailyActivity.day, DailyActivity.goal_id],
+            set_={
+                column: getattr(DailyActivity, column) + stmt.excluded[column]
+                for column in ROLLUP_COLUMNS.values()
+            },
+        )
+    )
+
+
+async def rebuild_daily_activity(db: AsyncSession, user_ids: list[str] | None = None) -> None:
+    """Recompute daily_activity from the event log, for the given users or everyone."""
+    clear = delete(DailyActivity)
+    day = cast(func.timezone("UTC", ActivityEvent.occurred_at), Date)
+    totals = select(
+        ActivityEvent.user_id,
+        day.label("day"),
+        ActivityEvent.goal_id,
+        *(
+            func.count().filter(ActivityEvent.type == activity_type).label(column)
+            for activity_type, column in ROLLUP_COLUMNS.items()
+        ),
+    ).group_by(ActivityEvent.user_id, day, ActivityEvent.goal_id)
+
+    if user_ids is not None:
+        clear = clear.where(DailyActivity.user_id.in_(user_ids))
+        totals = totals.where(ActivityEvent.user_id.in_(user_ids))
+
+    await db.execute(clear)
+    await db.execute(
+        insert(DailyActivity).from_select(
+            ["user_id", "day", "goal_id", *ROLLUP_COLUMNS.values()], totals
+        )
+    )
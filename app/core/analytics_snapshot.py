@@ -0,0 +1,183 @@
+from collections.abc import Iterable
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, literal
+from sqlalchemy.dialects.postgresql import insert
+from app.models.analytics import UserAnalytics
+from app.models.user import User
+from app.models.goal import Goal, GoalStatus
+from app.models.milestone import Milestone, MilestoneStatus
+from app.models.task import Task, TaskStatus
+
+# The user_analytics row is kept in step with the hierarchy the same way the
+# progress counters are: services and the progress engine record status
+# transitions on the session, and flush_analytics() applies the summed deltas
+# of all users with one upsert right before commit. Changes whose effect is not
+# known up front (cascading deletes) mark the user for a full recount instead.
+
+COUNTERS = (
+    "total_goals",
+    "completed_goals",
+    "active_goals",
+    "total_milestones",
+    "completed_milestones",
+    "total_tasks",
+    "completed_tasks",
+    "overdue_tasks",
+)
+
+_PENDING_KEY = "pending_analytics"
+
+
+def _pending(db: AsyncSession) -> dict:
+    return db.info.setdefault(_PENDING_KEY, {"deltas": {}, "dirty": set()})
+
+
+def _goal_counts(status: GoalStatus | None) -> dict:
+    if status is None:
+        return {}
+    return {
+        "total_goals": 1,
+        "completed_goals": int(status == GoalStatus.COMPLETED),
+        "active_goals": int(status == GoalStatus.ACTIVE),
+    }
+
+
+def _milestone_counts(status: MilestoneStatus | None) -> dict:
+    if status is None:
+        return {}
+    return {"total_milestones": 1, "completed_milestones": int(status == MilestoneStatus.COMPLETED)}
+
+
+def _task_counts(status: TaskStatus | None) -> dict:
+    if status is None:
+        return {}
+    return {
+        "total_tasks": 1,
+        "completed_tasks": int(status == TaskStatus.COMPLETED),
+        "overdue_tasks": int(status == TaskStatus.OVERDUE),
+    }
+
+
+def _record(db: AsyncSession, user_id: str, before: dict, after: dict) -> None:
+    if before == after:
+        return
+    deltas = _pending(db)["deltas"].setdefault(user_id, dict.fromkeys(COUNTERS, 0))
+    for key in COUNTERS:
+        deltas[key] += after.get(key, 0) - before.get(key, 0)
+
+
+def mark_goal(db: AsyncSession, user_id: str, before: GoalStatus | None = None, after: GoalStatus | None = None) -> None:
+    """Record a goal being created (no before), changing status, or deleted (no after)."""
+    _record(db, user_id, _goal_counts(before), _goal_counts(after))
+
+
+def mark_milestone(
+    db: AsyncSession, user_id: str, before: MilestoneStatus | None = None, after: MilestoneStatus | None = None
+) -> None:
+    """Record a milestone being created (no before), changing status, or deleted (no after)."""
+    _record(db, user_id, _milestone_counts(before), _milestone_counts(after))
+
+
+def mark_task(db: AsyncSession, user_id: str, before: TaskStatus | None = None, after: TaskStatus | None = None) -> None:
+    """Record a task being created (no before), changing status, or deleted (no after)."""
+    _record(db, user_id, _task_counts(before), _task_counts(after))
+
+
+def mark_overdue(db: AsyncSession, user_id: str, count: int) -> None:
+    """Record `count` open tasks becoming overdue at once (see app.jobs.overdue)."""
+    _record(db, user_id, {}, {"overdue_tasks": count})
+
+
+def mark_recount(db: AsyncSession, user_id: str) -> None:
+    """Recount the user from scratch at flush, e.g. after a cascading delete."""
+    _pending(db)["dirty"].add(user_id)
+
+
+async def flush_analytics(db: AsyncSession) -> None:
+    """Apply recorded analytics changes: one upsert covering every affected user."""
+    pending = db.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+
+    # Sorted, so concurrent flushes lock the rows in the same order
+    rows = [
+        {"user_id": user_id, **deltas}
+        for user_id, deltas in sorted(pending["deltas"].items())
+        if user_id not in pending["dirty"] and any(deltas.values())
+    ]
+    if rows:
+        stmt = insert(UserAnalytics).values(rows)
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[UserAnalytics.user_id],
+                set_={key: getattr(UserAnalytics, key) + stmt.excluded[key] for key in COUNTERS}
+                | {"updated_at": func.now()},
+            )
+        )
+
+    await rebuild_analytics(db, pending["dirty"])
+
+
+def _totals(user_ids: list[str] | None):
+    goals = select(
+        Goal.user_id,
+        func.count().label("total_goals"),
+        func.count().filter(Goal.status == GoalStatus.COMPLETED).label("completed_goals"),
+        func.count().filter(Goal.status == GoalStatus.ACTIVE).label("active_goals"),
+    ).group_by(Goal.user_id)
+    milestones = select(
+        Milestone.user_id,
+        func.count().label("total_milestones"),
+        func.count().filter(Milestone.status == MilestoneStatus.COMPLETED).label("completed_milestones"),
+    ).group_by(Milestone.user_id)
+    tasks = select(
+        Task.user_id,
+        func.count().label("total_tasks"),
+        func.count().filter(Task.status == TaskStatus.COMPLETED).label("completed_tasks"),
+        func.count().filter(Task.status == TaskStatus.OVERDUE).label("overdue_tasks"),
+    ).group_by(Task.user_id)
+    users = select(User.id)
+
+    if user_ids is not None:
+        goals = goals.where(Goal.user_id.in_(user_ids))
+        milestones = milestones.where(Milestone.user_id.in_(user_ids))
+        tasks = tasks.where(Task.user_id.in_(user_ids))
+        users = users.where(User.id.in_(user_ids))
+
+    goals, milestones, tasks, users = (q.subquery() for q in (goals, milestones, tasks, users))
+    counts = {
+        key: func.coalesce(sub.c[key], literal(0))
+        for sub in (goals, milestones, tasks)
+        for key in sub.c.keys()
+        if key != "user_id"
+    }
+    return (
+        select(users.c.id.label("user_id"), *(counts[key].label(key) for key in COUNTERS))
+        .outerjoin(goals, goals.c.user_id == users.c.id)
+        .outerjoin(milestones, milestones.c.user_id == users.c.id)
+        .outerjoin(tasks, tasks.c.user_id == users.c.id)
+    )
+
+
+async def rebuild_analytics(db: AsyncSession, user_ids: Iterable[str] | None = None) -> None:
+    """Recount the snapshot of the given users, or of every user when None."""
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+
+    stmt = insert(UserAnalytics).from_select(["user_id", *COUNTERS], _totals(user_ids))
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[UserAnalytics.user_id],
+            set_={key: stmt.excluded[key] for key in COUNTERS} | {"updated_at": func.now()},
+        )
+    )
+
+
+async def get_snapshot(db: AsyncSession, user_id: str) -> dict:
+    snapshot = await db.get(UserAnalytics, user_id)
+    if snapshot is None:
+        # Nothing recorded yet, so the user has nothing to count
+        return dict.fromkeys(COUNTERS, 0)
+    return {key: getattr(snapshot, key) for key in COUNTERS}
@@ -1,19 +1,23 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.database import get_db
+from app.config import get_settings
+import time
+from app.database import get_db, async_session, is_read_only
 from app.core.security import decode_token
+from app.core.principal_cache import principal_cache, snapshot_user, attach_user
+from app.core.resource_versions import bind_user, get_version
 from app.models.user import User
 
+settings = get_settings()
 security_scheme = HTTPBearer()
 
+READ_METHODS = {"GET", "HEAD"}
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security_scheme),
-    db: AsyncSession = Depends(get_db),
-) -> User:
-    payload = decode_token(credentials.credentials)
+
+def _token_subject(token: str) -> str:
+    payload = decode_token(token)
     if payload is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
 
@@ -24,10 +28,88 @@ async def get_current_user(
     if user_id is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
 
+    return user_id
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    token = credentials.credentials
+    user_id = _token_subject(token)
+
+    bind_user(db, user_id)
+    cached = principal_cache.get(user_id, token)
+    if cached is not None:
+        return await attach_user(db, cached)
+
+    version = principal_cache.version
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
 
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
+    principal_cache.put(user_id, token, snapshot_user(user), version)
     return user
+
+
+async def get_current_user_id(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> str:
+    """The authenticated user's ID, for handlers that need nothing else.
+
+    With AUTH_TRUST_CLAIMS_FOR_READS, read requests take the ID from the signed
+    token alone, so a deleted user keeps read access until the token expires.
+    """
+    if settings.AUTH_TRUST_CLAIMS_FOR_READS and request.method in READ_METHODS:
+        return _token_subject(credentials.credentials)
+
+    user = await get_current_user(credentials, db)
+    return user.id
+
+
+def etag(resource: str, clock: bool = False):
+    """Route dependency answering conditional GETs from the user's `resource` counter.
+
+    A matching If-None-Match short-circuits with 304 before the handler runs;
+    otherwise the ETag is set on the response and returned, for handlers that
+    build their own response. See app.core.resource_versions.
+
+    The counter is read from the primary, so a client never gets a 304 for
+    data older than its own last write. A read-only handler reads from the
+    replica, though; while the replica is behind, the response carries no
+    ETag, so a stale body is never cached under the current tag. With
+    `clock`, for responses that change as time passes without a write, the
+    tag also changes every ETAG_CLOCK_SECONDS.
+    """
+
+    async def check(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_db),
+        user_id: str = Depends(get_current_user_id),
+    ) -> str | None:
+        on_replica = settings.DATABASE_REPLICA_URL and is_read_only(request)
+        if on_replica:
+            async with async_session() as primary:
+                version = await get_version(primary, user_id, resource)
+        else:
+            version = await get_version(db, user_id, resource)
+
+        # The user is part of the tag so a device shared between accounts never matches
+        tag = f'W/"{resource}.{user_id}.{version}'
+        if clock:
+            tag += f".{int(time.time()) // settings.ETAG_CLOCK_SECONDS}"
+        tag += '"'
+        candidates = {candidate.strip() for candidate in request.headers.get("if-none-match", "").split(",")}
+        if tag in candidates or "*" in candidates:
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": tag})
+        if on_replica and await get_version(db, user_id, resource) != version:
+            return None
+        response.headers["ETag"] = tag
+        return tag
+
+    return check
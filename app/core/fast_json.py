@@ -0,0 +1,41 @@
+from collections.abc import Iterable
+from fastapi import Response
+from sqlalchemy import Row
+import pydantic_core
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Opt-in fast path for large list and tree responses. The service selects
+# exactly the response schema's columns (see columns()), so rows already have
+# the schema's shape and types, and the handler returns them through
+# rows_response() instead of letting FastAPI validate each row through the
+# response_model and encode the result with the stdlib json module. Routes
+# keep their response_model, which still documents the body in OpenAPI; the
+# bytes are the same either way.
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        # Pydantic writes UTC as "Z"; match it
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return pydantic_core.to_json(content)
+
+
+def columns(model, schema) -> list:
+    """The model's columns for each field of the response schema, in schema order."""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def rows_response(rows: Iterable[Row], response: Response) -> FastJSONResponse:
+    """Encode rows from a columns() select, keeping headers set on the injected `response`."""
+    return FastJSONResponse([row._asdict() for row in rows], headers=response.headers)
@@ -0,0 +1,185 @@
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, func, literal_column, text
+from sqlalchemy.dialects.postgresql import insert
+from app.config import get_settings
+from app.models.job import Job, JobStatus, ACTIVE_SQL
+
+# Background jobs live in the jobs table. enqueue() inserts a row in the
+# caller's transaction, so a job is queued exactly when the write that wanted
+# it commits. Workers (app.worker) claim due rows with FOR UPDATE SKIP LOCKED
+# and lease them: a claimed row stays RUNNING with run_at pushed out by the
+# job's timeout, and becomes claimable again if the worker dies. Every claim
+# bumps attempts, which fences the outcome: a worker whose lease expired and
+# was re-claimed can no longer complete or fail the job.
+#
+# Successful jobs are deleted, periodic ones rescheduled. Failures are
+# retried with exponential backoff until max_attempts, then kept as FAILED
+# with their last error.
+
+settings = get_settings()
+
+# Lease runs out every timeout_seconds after the claim
+_LEASE = literal_column("interval '1 second'")
+
+
+@dataclass(frozen=True)
+class JobHandler:
+    name: str
+    run: Callable[..., Awaitable[None]]
+    max_attempts: int
+    timeout_seconds: int
+    every: timedelta | None
+
+
+REGISTRY: dict[str, JobHandler] = {}
+
+
+def job(name: str, *, max_attempts: int | None = None, timeout_seconds: int | None = None, every: timedelta | None = None):
+    """Register an async handler, called as handler(db, **payload).
+
+    The handler's writes and the job's completion commit together, so work
+    confined to the database happens exactly once. Handlers with `every` are
+    periodic: the worker keeps one instance queued and reschedules it after
+    each run.
+    """
+
+    def register(run):
+        REGISTRY[name] = JobHandler(
+            name=name,
+            run=run,
+            max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+            timeout_seconds=timeout_seconds or settings.JOB_TIMEOUT_SECONDS,
+            every=every,
+        )
+        return run
+
+    return register
+
+
+def load_handlers() -> dict[str, JobHandler]:
+    # Imported here: the handler modules register themselves on import
+    import app.jobs  # noqa: F401
+
+    return REGISTRY
+
+
+async def enqueue(
+    db: AsyncSession,
+    name: str,
+    payload: dict | None = None,
+    *,
+    priority: int = 0,
+    run_at: datetime | None = None,
+    key: str | None = None,
+) -> bool:
+    """Queue a job in the current transaction; False if one with the same key is pending."""
+    handler = load_handlers().get(name)
+    if handler is None:
+        raise ValueError(f"No job handler named {name!r}")
+
+    values = dict(
+        name=name,
+        payload=payload or {},
+        key=key,
+        priority=priority,
+        status=JobStatus.QUEUED,
+        attempts=0,
+        max_attempts=handler.max_attempts,
+        timeout_seconds=handler.timeout_seconds,
+    )
+    if run_at is not None:
+        values["run_at"] = run_at
+    stmt = insert(Job).values(**values)
+    if key is not None:
+        stmt = stmt.on_conflict_do_nothing(index_elements=[Job.key], index_where=text(ACTIVE_SQL))
+    result = await db.execute(stmt)
+    return result.rowcount == 1
+
+
+async def schedule_periodic(db: AsyncSession) -> None:
+    """Make sure every periodic handler has its job queued, keyed by its name."""
+    for handler in load_handlers().values():
+        if handler.every is not None:
+            await enqueue(db, handler.name, key=f"periodic:{handler.name}")
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    id: str
+    name: str
+    payload: dict
+    attempts: int
+    max_attempts: int
+    timeout_seconds: int
+
+
+async def claim(db: AsyncSession, limit: int) -> list[ClaimedJob]:
+    """Lease up to `limit` due jobs, highest priority first; the caller commits."""
+    picked = (
+        select(Job.id)
+        .where(text(ACTIVE_SQL), Job.run_at <= func.now())
+        .order_by(Job.priority, Job.run_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .cte("picked")
+    )
+    result = await db.execute(
+        update(Job)
+        .where(Job.id == picked.c.id)
+        .values(
+            status=JobStatus.RUNNING,
+            attempts=Job.attempts + 1,
+            run_at=func.now() + Job.timeout_seconds * _LEASE,
+        )
+        .returning(Job.id, Job.name, Job.payload, Job.attempts, Job.max_attempts, Job.timeout_seconds)
+        .execution_options(synchronize_session=False)
+    )
+    return [ClaimedJob(*row) for row in result.all()]
+
+
+def _fenced(claimed: ClaimedJob):
+    return (Job.id == claimed.id) & (Job.attempts == claimed.attempts) & (Job.status == JobStatus.RUNNING)
+
+
+async def complete(db: AsyncSession, claimed: ClaimedJob) -> bool:
+    """Delete the job, or requeue it if periodic; False if the lease was lost."""
+    handler = REGISTRY.get(claimed.name)
+    if handler is not None and handler.every is not None:
+        stmt = (
+            update(Job)
+            .where(_fenced(claimed))
+            .values(status=JobStatus.QUEUED, attempts=0, last_error=None, run_at=func.now() + handler.every)
+        )
+    else:
+        stmt = delete(Job).where(_fenced(claimed))
+    result = await db.execute(stmt.execution_options(synchronize_session=False))
+    return result.rowcount == 1
+
+
+def backoff(attempts: int) -> timedelta:
+    """Exponential, capped, with jitter so failed batches do not retry in lockstep."""
+    seconds = min(settings.JOB_BACKOFF_SECONDS * 2 ** (attempts - 1), settings.JOB_BACKOFF_MAX_SECONDS)
+    return timedelta(seconds=seconds * random.uniform(0.5, 1.0))
+
+
+async def fail(db: AsyncSession, claimed: ClaimedJob, error: str) -> bool:
+    """Schedule a retry, or give up after max_attempts; False if the lease was lost."""
+    handler = REGISTRY.get(claimed.name)
+    if handler is not None and handler.every is not None and claimed.attempts >= claimed.max_attempts:
+        # A periodic job never gives up; it waits for its next run
+        values = dict(status=JobStatus.QUEUED, attempts=0, run_at=func.now() + handler.every)
+    elif claimed.attempts >= claimed.max_attempts:
+        values = dict(status=JobStatus.FAILED)
+    else:
+        values = dict(status=JobStatus.QUEUED, run_at=func.now() + backoff(claimed.attempts))
+    result = await db.execute(
+        update(Job)
+        .where(_fenced(claimed))
+        .values(last_error=error, **values)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
@@ -0,0 +1,130 @@
+import asyncio
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import get_settings
+from app.database import TrackedSession
+from app.core.fast_json import dumps
+
+# Live progress for GET /api/live/progress. The progress engine records the
+# new progress and status of every task, milestone and goal it writes on the
+# session; once the transaction commits, the changes are published to the
+# owner's subscribers through an in-process hub. Nothing is published for a
+# rolled back transaction.
+#
+# Each subscriber holds at most one pending delta per entity: a newer state
+# replaces the one not yet sent, so a slow client receives the latest values
+# instead of a backlog. A client that falls more than LIVE_MAX_PENDING
+# entities behind gets a resync event and should reload over REST.
+#
+# The hub lives in the API process, so it only sees commits made by that
+# process; run the API as a single process (or put a broker in front of
+# publish()) before relying on it across workers.
+
+settings = get_settings()
+
+TASK = "task"
+MILESTONE = "milestone"
+GOAL = "goal"
+
+_PENDING_KEY = "pending_live"
+
+
+def record(db: AsyncSession, user_id: str, kind: str, entity_id: str, progress: float, status) -> None:
+    """Queue a progress delta for publishing when the session commits."""
+    pending = db.info.setdefault(_PENDING_KEY, {})
+    pending[kind, entity_id] = (
+        user_id,
+        {"type": kind, "id": entity_id, "progress": progress, "status": getattr(status, "value", status)},
+    )
+
+
+@event.listens_for(TrackedSession, "after_commit")
+def _committed(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    by_user = defaultdict(list)
+    for key, (user_id, delta) in pending.items():
+        by_user[user_id].append((key, delta))
+    for user_id, deltas in by_user.items():
+        hub.publish(user_id, deltas)
+
+
+@event.listens_for(TrackedSession, "after_rollback")
+def _rolled_back(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+class Subscription:
+    def __init__(self, limit: int) -> None:
+        self._limit = limit
+        self._pending: dict[tuple[str, str], dict] = {}
+        self._overflowed = False
+        self._ready = asyncio.Event()
+
+    def offer(self, key: tuple[str, str], delta: dict) -> None:
+        if key in self._pending:
+            # Conflate: keep the latest state, sent in the order of the last change
+            del self._pending[key]
+        elif len(self._pending) >= self._limit:
+            self._pending.clear()
+            self._overflowed = True
+        if not self._overflowed:
+            self._pending[key] = delta
+        self._ready.set()
+
+    async def next(self) -> tuple[list[dict], bool]:
+        """Wait for changes; returns the deltas and whether the client must resync instead."""
+        await self._ready.wait()
+        self._ready.clear()
+        deltas, overflowed = list(self._pending.values()), self._overflowed
+        self._pending.clear()
+        self._overflowed = False
+        return ([] if overflowed else deltas), overflowed
+
+
+class Hub:
+    def __init__(self) -> None:
+        self._subscribers: dict[str, set[Subscription]] = defaultdict(set)
+
+    @contextmanager
+    def subscribe(self, user_id: str) -> Iterator[Subscription]:
+        subscription = Subscription(settings.LIVE_MAX_PENDING)
+        self._subscribers[user_id].add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers[user_id]
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[user_id]
+
+    def publish(self, user_id: str, deltas: list[tuple[tuple[str, str], dict]]) -> None:
+        # Never blocks: a subscriber only accumulates (bounded) pending state
+        for subscription in self._subscribers.get(user_id, ()):
+            for key, delta in deltas:
+                subscription.offer(key, delta)
+
+
+hub = Hub()
+
+
+async def stream(user_id: str) -> AsyncIterator[bytes]:
+    """The user's changes as server-sent events, until the client disconnects."""
+    with hub.subscribe(user_id) as subscription:
+        # Tell the client to resync on (re)connect; deltas from before are lost
+        yield b"retry: 3000\nevent: resync\ndata: {}\n\n"
+        while True:
+            try:
+                deltas, overflowed = await asyncio.wait_for(subscription.next(), settings.LIVE_KEEPALIVE_SECONDS)
+            except TimeoutError:
+                # Keeps proxies from closing an idle stream
+                yield b": keepalive\n\n"
+                continue
+            if overflowed:
+                yield b"event: resync\ndata: {}\n\n"
+            elif deltas:
+                yield b"event: progress\ndata: " + dumps(deltas) + b"\n\n"
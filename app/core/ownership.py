@@ -0,0 +1,157 @@
+from sqlalchemy import select, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+from app.models.goal import Goal
+from app.models.milestone import Milestone
+from app.models.task import Task, TaskNote
+from app.models.checklist import ChecklistItem
+
+# Every row carries its owner's user_id, so ownership is a single primary-key
+# lookup filtered on it. Results are memoised on the session, which lives for
+# exactly one request. Resolving a child also proves ownership of its parent,
+# so a later lookup of that only needs a primary-key fetch (usually answered by
+# the identity map).
+#
+# Writers that derive a progress delta from the row's current state pass
+# for_update=True: the row is locked and re-read, so two concurrent requests
+# cannot both compute their delta from the same old state.
+_OWNED_KEY = "owned"
+
+
+def _cache(db: AsyncSession) -> dict:
+    return db.info.setdefault(_OWNED_KEY, {})
+
+
+def _key(user_id: str, model: type, entity_id: str) -> tuple:
+    return user_id, model.__name__, entity_id
+
+
+def _remember(db: AsyncSession, user_id: str, model: type, entity_id: str, entity=None) -> None:
+    """Record that the user owns the row; `entity` is None when only the ID is known."""
+    _cache(db)[_key(user_id, model, entity_id)] = entity
+
+
+def _is_gone(db: AsyncSession, entity) -> bool:
+    state = inspect(entity)
+    return state.was_deleted or state.detached or entity in db.deleted
+
+
+async def _cached(db: AsyncSession, user_id: str, model: type, entity_id: str):
+    key = _key(user_id, model, entity_id)
+    cache = _cache(db)
+    if key not in cache:
+        return None
+
+    entity = cache[key]
+    if entity is None:
+        # Ownership already proven through a descendant; fetch the row by primary key
+        entity = await db.get(model, entity_id)
+
+    if entity is None or _is_gone(db, entity):
+        cache.pop(key, None)
+        return None
+
+    cache[key] = entity
+    return entity
+
+
+async def _cached_locked(db: AsyncSession, user_id: str, model: type, entity_id: str, for_update: bool):
+    entity = await _cached(db, user_id, model, entity_id)
+    if entity is not None and for_update:
+        await db.refresh(entity, with_for_update=True)
+    return entity
+
+
+def _owned(model: type, entity_id: str, user_id: str, for_update: bool):
+    query = select(model).where(model.id == entity_id, model.user_id == user_id)
+    if for_update:
+        query = query.with_for_update().execution_options(populate_existing=True)
+    return query
+
+
+async def get_owned_goal(db: AsyncSession, user_id: str, goal_id: str, for_update: bool = False) -> Goal:
+    goal = await _cached_locked(db, user_id, Goal, goal_id, for_update)
+    if goal is not None:
+        return goal
+
+    result = await db.execute(_owned(Goal, goal_id, user_id, for_update))
+    goal = result.scalar_one_or_none()
+    if not goal:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Goal not found")
+
+    _remember(db, user_id, Goal, goal_id, goal)
+    return goal
+
+
+async def get_owned_milestone(db: AsyncSession, user_id: str, milestone_id: str, for_update: bool = False) -> Milestone:
+    milestone = await _cached_locked(db, user_id, Milestone, milestone_id, for_update)
+    if milestone is not None:
+        return milestone
+
+    result = await db.execute(_owned(Milestone, milestone_id, user_id, for_update))
+    milestone = result.scalar_one_or_none()
+    if not milestone:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Milestone not found")
+
+    _remember(db, user_id, Milestone, milestone_id, milestone)
+    _remember_ancestors(db, user_id, goal_id=milestone.goal_id)
+    return milestone
+
+
+async def get_owned_task(db: AsyncSession, user_id: str, task_id: str, for_update: bool = False) -> Task:
+    task = await _cached_locked(db, user_id, Task, task_id, for_update)
+    if task is not None:
+        return task
+
+    result = await db.execute(_owned(Task, task_id, user_id, for_update))
+    task = result.scalar_one_or_none()
+    if not task:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+
+    _remember(db, user_id, Task, task_id, task)
+    _remember_ancestors(db, user_id, milestone_id=task.milestone_id)
+    return task
+
+
+async def get_owned_checklist_item(db: AsyncSession, user_id: str, item_id: str, for_update: bool = False) -> ChecklistItem:
+    item = await _cached_locked(db, user_id, ChecklistItem, item_id, for_update)
+    if item is not None:
+        return item
+
+    result = await db.execute(_owned(ChecklistItem, item_id, user_id, for_update))
+    item = result.scalar_one_or_none()
+    if not item:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Checklist item not found")
+
+    _remember(db, user_id, ChecklistItem, item_id, item)
+    _remember_ancestors(db, user_id, task_id=item.task_id)
+    return item
+
+
+async def get_owned_note(db: AsyncSession, user_id: str, note_id: str) -> TaskNote:
+    note = await _cached(db, user_id, TaskNote, note_id)
+    if note is not None:
+        return note
+
+    result = await db.execute(select(TaskNote).where(TaskNote.id == note_id, TaskNote.user_id == user_id))
+    note = result.scalar_one_or_none()
+    if not note:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Note not found")
+
+    _remember(db, user_id, TaskNote, note_id, note)
+    _remember_ancestors(db, user_id, task_id=note.task_id)
+    return note
+
+
+def _remember_ancestors(
+    db: AsyncSession,
+    user_id: str,
+    task_id: str | None = None,
+    milestone_id: str | None = None,
+    goal_id: str | None = None,
+) -> None:
+    cache = _cache(db)
+    for model, entity_id in ((Task, task_id), (Milestone, milestone_id), (Goal, goal_id)):
+        if entity_id:
+            # Keep an entity we already hold
+            cache.setdefault(_key(user_id, model, entity_id), None)
@@ -0,0 +1,84 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# List routes page with keyset cursors: the cursor is the sort key of the last
+# row returned, and the next page starts strictly after it. Every key ends in
+# the primary key so it is unique, and each ordering has a matching composite
+# index, so a page costs the same however deep it is. The cursor itself is
+# opaque to clients; the next one is sent back in the X-Next-Cursor header and
+# is absent on the last page. Every page is bounded, DEFAULT_PAGE_SIZE rows
+# when the client does not ask for a size.
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(values: tuple) -> str:
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def _cursor_value(column, value):
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    # Anything the column could not compare with would fail in the database
+    if type(value) is not python_type or (python_type is str and "\x00" in value):
+        raise TypeError(value)
+    return value
+
+
+def decode_cursor(cursor: str, columns: list) -> tuple:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(payload, list) or len(payload) != len(columns):
+            raise ValueError(cursor)
+        return tuple(_cursor_value(column, value) for column, value in zip(columns, payload))
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from None
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    columns: list,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    descending: bool = False,
+    skip: int = 0,
+) -> tuple[list, str | None]:
+    """Run `query` ordered by `columns` from `cursor` on; returns the rows and the next cursor.
+
+    A query for one entity returns its objects, a query for several columns
+    returns rows. `skip` is the OFFSET of the deprecated skip parameter; it
+    cannot be combined with a cursor.
+    """
+    key = tuple_(*columns)
+    if cursor is not None:
+        if skip:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="skip cannot be combined with cursor")
+        after = tuple_(*decode_cursor(cursor, columns))
+        query = query.where(key < after if descending else key > after)
+    query = query.order_by(*(column.desc() if descending else column for column in columns))
+    # One extra row tells whether there is a next page
+    query = query.offset(skip or None).limit(limit + 1)
+
+    result = await db.execute(query)
+    rows = list(result.scalars().all() if len(query.column_descriptions) == 1 else result.all())
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(tuple(getattr(last, column.key) for column in columns))
+
+
+def set_next_cursor(response: Response, next_cursor: str | None) -> None:
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,108 @@
+import time
+from collections import OrderedDict
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import get_settings
+from app.database import TrackedSession
+from app.models.user import User
+
+settings = get_settings()
+
+
+class PrincipalCache:
+    """Bounded, TTL-based cache of authenticated users keyed by (user_id, token).
+
+    Only plain column values are stored, never the ORM instance, so nothing
+    loaded in one request's session is shared with another.
+
+    The cache is per process and invalidation only reaches the process that
+    made the change: another API worker (or a change made by the dispatcher)
+    can serve the old user for up to AUTH_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], tuple[float, dict]] = OrderedDict()
+        # Bumped by every invalidation; see put()
+        self.version = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, user_id: str, token: str) -> dict | None:
+        key = (user_id, token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, values = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return values
+
+    def put(self, user_id: str, token: str, values: dict, version: int) -> None:
+        """Cache values read when `version` was current.
+
+        Values read before an invalidation may predate the change it was for,
+        so they are dropped rather than cached over it.
+        """
+        if not self.enabled or version != self.version:
+            return
+
+        key = (user_id, token)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, values)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        self.version += 1
+        for key in [key for key in self._entries if key[0] == user_id]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self.version += 1
+        self._entries.clear()
+
+
+principal_cache = PrincipalCache(settings.AUTH_CACHE_TTL_SECONDS, settings.AUTH_CACHE_MAX_ENTRIES)
+
+
+def snapshot_user(user: User) -> dict:
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+
+async def attach_user(db: AsyncSession, values: dict) -> User:
+    """Rebuild a cached user as a persistent instance of `db` without a query."""
+    user = User(**values)
+    make_transient_to_detached(user)
+    return await db.merge(user, load=False)
+
+
+_INVALIDATED_KEY = "invalidated_principals"
+
+
+def invalidate_user(db: AsyncSession, user_id: str) -> None:
+    """Drop the user's cached principal once the session commits.
+
+    Invalidating before the commit would let a concurrent request re-cache
+    the row as it was until then.
+    """
+    db.info.setdefault(_INVALIDATED_KEY, set()).add(user_id)
+
+
+@event.listens_for(TrackedSession, "after_commit")
+def _committed(session):
+    for user_id in session.info.pop(_INVALIDATED_KEY, ()):
+        principal_cache.invalidate(user_id)
+
+
+@event.listens_for(TrackedSession, "after_rollback")
+def _rolled_back(session):
+    session.info.pop(_INVALIDATED_KEY, None)
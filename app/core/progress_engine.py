@@ -1,107 +1,539 @@
+from collections.abc import Iterable
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, update, func, case, and_, or_, literal
 from app.models.task import Task, TaskStatus
 from app.models.milestone import Milestone, MilestoneStatus
 from app.models.goal import Goal, GoalStatus
 from app.models.checklist import ChecklistItem
+from app.core import analytics_snapshot, activity_log, live
 
+# Progress sums are floats; anything closer than this counts as consistent.
+PROGRESS_TOLERANCE = 1e-6
 
-async def recalculate_task_progress(db: AsyncSession, task_id: str) -> None:
-    """Recalculate task progress based on checklist items."""
-    total = await db.scalar(
-        select(func.count()).where(ChecklistItem.task_id == task_id)
+
+def _status(column, value):
+    """Bind a status enum value with the column's type so CASE branches share one type."""
+    return literal(value, column.type)
+
+
+def _task_weight():
+    """Weight of a task in its milestone average: estimated_time if set, otherwise 1."""
+    return case((Task.estimated_time > 0, Task.estimated_time), else_=1)
+
+
+def _task_progress(total, completed):
+    return case((total > 0, completed * 100.0 / total), else_=Task.progress)
+
+
+def _task_status(total, completed):
+    # Auto-complete task if all checklist items done
+    return case(
+        (total == 0, Task.status),
+        (completed == total, _status(Task.status, TaskStatus.COMPLETED)),
+        (Task.status == TaskStatus.COMPLETED, _status(Task.status, TaskStatus.IN_PROGRESS)),
+        else_=Task.status,
     )
 
-    if total == 0:
+
+def _milestone_progress(weight_total, weighted_sum):
+    return case((weight_total > 0, weighted_sum / weight_total), else_=0.0)
+
+
+def _milestone_status(task_count, completed):
+    # Auto-complete milestone if ALL tasks are completed
+    return case(
+        (and_(task_count > 0, completed == task_count), _status(Milestone.status, MilestoneStatus.COMPLETED)),
+        (and_(task_count > 0, Milestone.status == MilestoneStatus.COMPLETED), _status(Milestone.status, MilestoneStatus.ACTIVE)),
+        else_=Milestone.status,
+    )
+
+
+def _goal_progress(milestone_count, progress_sum):
+    return case((milestone_count > 0, progress_sum / milestone_count), else_=0.0)
+
+
+def _goal_status(milestone_count, completed):
+    # Auto-complete goal if ALL milestones are completed
+    return case(
+        (and_(milestone_count > 0, completed == milestone_count), _status(Goal.status, GoalStatus.COMPLETED)),
+        (and_(milestone_count > 0, Goal.status == GoalStatus.COMPLETED), _status(Goal.status, GoalStatus.ACTIVE)),
+        else_=Goal.status,
+    )
+
+
+# --- Counter deltas ---
+#
+# Every level keeps counters of its children, so a change to one row is
+# applied as a delta to its parent instead of rescanning the siblings:
+#   task      -> milestone: (task_count, completed_task_count, task_weight_total, weighted_progress_sum)
+#   milestone -> goal:      (milestone_count, completed_milestone_count, milestone_progress_sum)
+#
+# Services only record changes on the session (mark_*). flush_progress()
+# applies them right before commit, touching each affected task,
+# milestone and goal exactly once however many rows the request changed.
+# Every status transition the engine makes is passed on to the analytics
+# snapshot and, for tasks, to the activity log.
+
+_PENDING_KEY = "pending_progress"
+
+
+def _pending(db: AsyncSession) -> dict:
+    return db.info.setdefault(
+        _PENDING_KEY,
+        {
+            "checklists": {},
+            "milestones": {},
+            "goals": {},
+        },
+    )
+
+
+def _add(deltas: dict, key: str, delta: tuple) -> None:
+    current = deltas.get(key)
+    deltas[key] = delta if current is None else tuple(a + b for a, b in zip(current, delta))
+
+
+def task_share(task: Task) -> tuple[int, int, int, float]:
+    """What a task currently contributes to its milestone counters."""
+    weight = task.estimated_time if task.estimated_time and task.estimated_time > 0 else 1
+    return 1, int(task.status == TaskStatus.COMPLETED), weight, weight * task.progress
+
+
+def milestone_share(milestone: Milestone) -> tuple[int, int, float]:
+    """What a milestone currently contributes to its goal counters."""
+    return 1, int(milestone.status == MilestoneStatus.COMPLETED), milestone.progress
+
+
+def _delta(before: tuple | None, after: tuple | None, size: int) -> tuple:
+    before = before or (0,) * size
+    after = after or (0,) * size
+    return tuple(a - b for a, b in zip(after, before))
+
+
+def mark_checklist_changed(db: AsyncSession, task_id: str, total_delta: int = 0, completed_delta: int = 0) -> None:
+    """Record a change in a task's checklist counts."""
+    _add(_pending(db)["checklists"], task_id, (total_delta, completed_delta))
+
+
+def mark_task_changed(
+    db: AsyncSession,
+    milestone_id: str,
+    before: tuple[int, int, int, float] | None = None,
+    after: tuple[int, int, int, float] | None = None,
+) -> None:
+    """Record a task being created (no before), changed, or deleted (no after).
+
+    `before` and `after` are `task_share()` snapshots.
+    """
+    _add(_pending(db)["milestones"], milestone_id, _delta(before, after, 4))
+
+
+def mark_milestone_changed(
+    db: AsyncSession,
+    goal_id: str,
+    before: tuple[int, int, float] | None = None,
+    after: tuple[int, int, float] | None = None,
+) -> None:
+    """Record a milestone being created (no before) or deleted (no after).
+
+    `before` and `after` are `milestone_share()` snapshots.
+    """
+    _add(_pending(db)["goals"], goal_id, _delta(before, after, 3))
+
+
+async def flush_progress(db: AsyncSession) -> None:
+    """Apply all recorded progress changes, bottom-up, once per affected row."""
+    pending = db.info.pop(_PENDING_KEY, None)
+    if not pending:
         return
 
-    completed = await db.scalar(
-        select(func.count()).where(
-            ChecklistItem.task_id == task_id,
-            ChecklistItem.is_completed == True,
+    await db.flush()
+
+    milestone_deltas = pending["milestones"]
+    for task_id, (total_delta, completed_delta) in pending["checklists"].items():
+        change = await _apply_checklist_delta(db, task_id, total_delta, completed_delta)
+        if change:
+            _add(milestone_deltas, *change)
+
+    goal_deltas = pending["goals"]
+    for milestone_id, delta in milestone_deltas.items():
+        change = await _apply_milestone_delta(db, milestone_id, delta)
+        if change:
+            _add(goal_deltas, *change)
+
+    for goal_id, delta in goal_deltas.items():
+        await _apply_goal_delta(db, goal_id, delta)
+
+
+async def _apply_checklist_delta(
+    db: AsyncSession, task_id: str, total_delta: int, completed_delta: int
+) -> tuple[str, tuple] | None:
+    if not total_delta and not completed_delta:
+        return None
+
+    previous = (
+        select(Task.id, Task.progress, Task.status)
+        .where(Task.id == task_id)
+        .with_for_update()
+        .subquery()
+    )
+    total = Task.checklist_total + total_delta
+    completed = Task.checklist_completed + completed_delta
+
+    result = await db.execute(
+        update(Task)
+        .where(Task.id == previous.c.id)
+        .values(
+            checklist_total=total,
+            checklist_completed=completed,
+            progress=_task_progress(total, completed),
+            status=_task_status(total, completed),
+        )
+        .returning(
+            Task.milestone_id,
+            Task.user_id,
+            _task_weight(),
+            previous.c.progress,
+            previous.c.status,
+            Task.progress,
+            Task.status,
         )
+        .execution_options(synchronize_session=False)
     )
+    row = result.one_or_none()
+    if row is None:
+        return None
 
-    result = await db.execute(select(Task).where(Task.id == task_id))
-    task = result.scalar_one_or_none()
-    if not task:
-        return
+    milestone_id, user_id, weight, old_progress, old_status, new_progress, new_status = row
+    analytics_snapshot.mark_task(db, user_id, old_status, new_status)
+    activity_log.record_task_status(db, user_id, task_id, old_status, new_status)
+    live.record(db, user_id, live.TASK, task_id, new_progress, new_status)
+    return milestone_id, (
+        0,
+        int(new_status == TaskStatus.COMPLETED) - int(old_status == TaskStatus.COMPLETED),
+        0,
+        weight * (new_progress - old_progress),
+    )
 
-    task.progress = (completed / total) * 100
 
-    # Auto-complete task if all checklist items done
-    if completed == total:
-        task.status = TaskStatus.COMPLETED
-    elif task.status == TaskStatus.COMPLETED and completed < total:
-        task.status = TaskStatus.IN_PROGRESS
+async def _apply_milestone_delta(db: AsyncSession, milestone_id: str, delta: tuple) -> tuple[str, tuple] | None:
+    if not any(delta):
+        return None
 
-    await db.flush()
-    await recalculate_milestone_progress(db, task.milestone_id)
+    count_delta, completed_delta, weight_delta, weighted_delta = delta
+    previous = (
+        select(Milestone.id, Milestone.progress, Milestone.status)
+        .where(Milestone.id == milestone_id)
+        .with_for_update()
+        .subquery()
+    )
+    task_count = Milestone.task_count + count_delta
+    completed = Milestone.completed_task_count + completed_delta
+    weight_total = Milestone.task_weight_total + weight_delta
+    weighted_sum = Milestone.weighted_progress_sum + weighted_delta
 
+    result = await db.execute(
+        update(Milestone)
+        .where(Milestone.id == previous.c.id)
+        .values(
+            task_count=task_count,
+            completed_task_count=completed,
+            task_weight_total=weight_total,
+            weighted_progress_sum=weighted_sum,
+            progress=_milestone_progress(weight_total, weighted_sum),
+            status=_milestone_status(task_count, completed),
+        )
+        .returning(
+            Milestone.goal_id,
+            Milestone.user_id,
+            previous.c.progress,
+            previous.c.status,
+            Milestone.progress,
+            Milestone.status,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+
+    goal_id, user_id, old_progress, old_status, new_progress, new_status = row
+    analytics_snapshot.mark_milestone(db, user_id, old_status, new_status)
+    live.record(db, user_id, live.MILESTONE, milestone_id, new_progress, new_status)
+    return goal_id, (
+        0,
+        int(new_status == MilestoneStatus.COMPLETED) - int(old_status == MilestoneStatus.COMPLETED),
+        new_progress - old_progress,
+    )
 
-async def recalculate_milestone_progress(db: AsyncSession, milestone_id: str) -> None:
-    """Recalculate milestone progress using weighted average of task progresses."""
-    result = await db.execute(select(Task).where(Task.milestone_id == milestone_id))
-    tasks = result.scalars().all()
 
-    if not tasks:
-        milestone_result = await db.execute(select(Milestone).where(Milestone.id == milestone_id))
-        milestone = milestone_result.scalar_one_or_none()
-        if milestone:
-            milestone.progress = 0.0
-            await db.flush()
-            await recalculate_goal_progress(db, milestone.goal_id)
+async def _apply_goal_delta(db: AsyncSession, goal_id: str, delta: tuple) -> None:
+    if not any(delta):
         return
 
-    # Weighted by estimated_time if available, otherwise equal weight
-    total_weight = 0
-    weighted_progress = 0.0
+    count_delta, completed_delta, progress_delta = delta
+    previous = select(Goal.id, Goal.status).where(Goal.id == goal_id).with_for_update().subquery()
+    milestone_count = Goal.milestone_count + count_delta
+    completed = Goal.completed_milestone_count + completed_delta
+    progress_sum = Goal.milestone_progress_sum + progress_delta
 
-    for task in tasks:
-        weight = task.estimated_time if task.estimated_time and task.estimated_time > 0 else 1
-        total_weight += weight
-        weighted_progress += task.progress * weight
+    result = await db.execute(
+        update(Goal)
+        .where(Goal.id == previous.c.id)
+        .values(
+            milestone_count=milestone_count,
+            completed_milestone_count=completed,
+            milestone_progress_sum=progress_sum,
+            progress=_goal_progress(milestone_count, progress_sum),
+            status=_goal_status(milestone_count, completed),
+        )
+        .returning(Goal.user_id, previous.c.status, Goal.progress, Goal.status)
+        .execution_options(synchronize_session=False)
+    )
+    for user_id, old_status, new_progress, new_status in result.all():
+        analytics_snapshot.mark_goal(db, user_id, old_status, new_status)
+        live.record(db, user_id, live.GOAL, goal_id, new_progress, new_status)
 
-    milestone_result = await db.execute(select(Milestone).where(Milestone.id == milestone_id))
-    milestone = milestone_result.scalar_one_or_none()
-    if not milestone:
-        return
 
-    milestone.progress = weighted_progress / total_weight if total_weight > 0 else 0.0
+# --- Full rollups ---
+#
+# Recompute counters and progress from the child rows with one aggregate
+# UPDATE per level. Only the drift repair (repair_counter_drift) uses them;
+# the write path applies deltas.
 
-    # Auto-complete milestone if ALL tasks are completed
-    all_completed = all(t.status == TaskStatus.COMPLETED for t in tasks)
-    if all_completed and len(tasks) > 0:
-        milestone.status = MilestoneStatus.COMPLETED
-    elif milestone.status == MilestoneStatus.COMPLETED and not all_completed:
-        milestone.status = MilestoneStatus.ACTIVE
 
-    await db.flush()
-    await recalculate_goal_progress(db, milestone.goal_id)
+def _task_totals(task_ids: list[str]):
+    return (
+        select(
+            Task.id.label("task_id"),
+            func.count(ChecklistItem.id).label("total"),
+            func.count(ChecklistItem.id).filter(ChecklistItem.is_completed.is_(True)).label("completed"),
+        )
+        .outerjoin(ChecklistItem, ChecklistItem.task_id == Task.id)
+        .where(Task.id.in_(task_ids))
+        .group_by(Task.id)
+        .subquery()
+    )
 
 
-async def recalculate_goal_progress(db: AsyncSession, goal_id: str) -> None:
-    """Recalculate goal progress as average of milestone progresses."""
-    result = await db.execute(select(Milestone).where(Milestone.goal_id == goal_id))
-    milestones = result.scalars().all()
+def _milestone_totals(milestone_ids: list[str]):
+    weight = _task_weight()
+    return (
+        select(
+            Milestone.id.label("milestone_id"),
+            func.count(Task.id).label("task_count"),
+            func.count(Task.id).filter(Task.status == TaskStatus.COMPLETED).label("completed"),
+            func.coalesce(func.sum(weight), 0).label("weight_total"),
+            func.coalesce(func.sum(Task.progress * weight), 0.0).label("weighted_sum"),
+        )
+        .outerjoin(Task, Task.milestone_id == Milestone.id)
+        .where(Milestone.id.in_(milestone_ids))
+        .group_by(Milestone.id)
+        .subquery()
+    )
 
-    goal_result = await db.execute(select(Goal).where(Goal.id == goal_id))
-    goal = goal_result.scalar_one_or_none()
-    if not goal:
-        return
 
-    if not milestones:
-        goal.progress = 0.0
-        await db.flush()
+def _goal_totals(goal_ids: list[str]):
+    return (
+        select(
+            Goal.id.label("goal_id"),
+            func.count(Milestone.id).label("milestone_count"),
+            func.count(Milestone.id).filter(Milestone.status == MilestoneStatus.COMPLETED).label("completed"),
+            func.coalesce(func.sum(Milestone.progress), 0.0).label("progress_sum"),
+        )
+        .outerjoin(Milestone, Milestone.goal_id == Goal.id)
+        .where(Goal.id.in_(goal_ids))
+        .group_by(Goal.id)
+        .subquery()
+    )
+
+
+async def rollup_tasks(db: AsyncSession, task_ids: Iterable[str]) -> set[str]:
+    """Recompute checklist counters, progress and status of tasks.
+
+    Tasks without checklist items keep their progress and status. Returns the
+    IDs of the milestones the tasks belong to.
+    """
+    task_ids = list(task_ids)
+    if not task_ids:
+        return set()
+
+    totals = _task_totals(task_ids)
+    previous = select(Task.id, Task.status).where(Task.id.in_(task_ids)).with_for_update().subquery()
+    result = await db.execute(
+        update(Task)
+        .where(Task.id == totals.c.task_id, Task.id == previous.c.id)
+        .values(
+            checklist_total=totals.c.total,
+            checklist_completed=totals.c.completed,
+            progress=_task_progress(totals.c.total, totals.c.completed),
+            status=_task_status(totals.c.total, totals.c.completed),
+        )
+        .returning(Task.id, Task.milestone_id, Task.user_id, previous.c.status, Task.progress, Task.status)
+        .execution_options(synchronize_session=False)
+    )
+
+    milestone_ids = set()
+    for task_id, milestone_id, user_id, old_status, new_progress, new_status in result.all():
+        analytics_snapshot.mark_task(db, user_id, old_status, new_status)
+        activity_log.record_task_status(db, user_id, task_id, old_status, new_status)
+        live.record(db, user_id, live.TASK, task_id, new_progress, new_status)
+        milestone_ids.add(milestone_id)
+    return milestone_ids
+
+
+async def rollup_milestones(db: AsyncSession, milestone_ids: Iterable[str]) -> set[str]:
+    """Recompute milestones as the estimated_time-weighted average of their tasks.
+
+    Returns the IDs of the goals the milestones belong to.
+    """
+    milestone_ids = list(milestone_ids)
+    if not milestone_ids:
+        return set()
+
+    totals = _milestone_totals(milestone_ids)
+    previous = (
+        select(Milestone.id, Milestone.status).where(Milestone.id.in_(milestone_ids)).with_for_update().subquery()
+    )
+    result = await db.execute(
+        update(Milestone)
+        .where(Milestone.id == totals.c.milestone_id, Milestone.id == previous.c.id)
+        .values(
+            task_count=totals.c.task_count,
+            completed_task_count=totals.c.completed,
+            task_weight_total=totals.c.weight_total,
+            weighted_progress_sum=totals.c.weighted_sum,
+            progress=_milestone_progress(totals.c.weight_total, totals.c.weighted_sum),
+            status=_milestone_status(totals.c.task_count, totals.c.completed),
+        )
+        .returning(
+            Milestone.id,
+            Milestone.goal_id,
+            Milestone.user_id,
+            previous.c.status,
+            Milestone.progress,
+            Milestone.status,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    goal_ids = set()
+    for milestone_id, goal_id, user_id, old_status, new_progress, new_status in result.all():
+        analytics_snapshot.mark_milestone(db, user_id, old_status, new_status)
+        live.record(db, user_id, live.MILESTONE, milestone_id, new_progress, new_status)
+        goal_ids.add(goal_id)
+    return goal_ids
+
+
+async def rollup_goals(db: AsyncSession, goal_ids: Iterable[str]) -> None:
+    """Recompute goals as the plain average of their milestones."""
+    goal_ids = list(goal_ids)
+    if not goal_ids:
         return
 
-    goal.progress = sum(m.progress for m in milestones) / len(milestones)
+    totals = _goal_totals(goal_ids)
+    previous = select(Goal.id, Goal.status).where(Goal.id.in_(goal_ids)).with_for_update().subquery()
+    result = await db.execute(
+        update(Goal)
+        .where(Goal.id == totals.c.goal_id, Goal.id == previous.c.id)
+        .values(
+            milestone_count=totals.c.milestone_count,
+            completed_milestone_count=totals.c.completed,
+            milestone_progress_sum=totals.c.progress_sum,
+            progress=_goal_progress(totals.c.milestone_count, totals.c.progress_sum),
+            status=_goal_status(totals.c.milestone_count, totals.c.completed),
+        )
+        .returning(Goal.id, Goal.user_id, previous.c.status, Goal.progress, Goal.status)
+        .execution_options(synchronize_session=False)
+    )
+    for goal_id, user_id, old_status, new_progress, new_status in result.all():
+        analytics_snapshot.mark_goal(db, user_id, old_status, new_status)
+        live.record(db, user_id, live.GOAL, goal_id, new_progress, new_status)
 
-    # Auto-complete goal if ALL milestones are completed
-    all_completed = all(m.status == MilestoneStatus.COMPLETED for m in milestones)
-    if all_completed and len(milestones) > 0:
-        goal.status = GoalStatus.COMPLETED
-    elif goal.status == GoalStatus.COMPLETED and not all_completed:
-        goal.status = GoalStatus.ACTIVE
 
-    await db.flush()
+# --- Consistency checks ---
+
+
+async def find_counter_drift(db: AsyncSession) -> dict[str, list[str]]:
+    """Return the IDs of tasks, milestones and goals whose counters disagree with their children."""
+    task_totals = (
+        select(
+            ChecklistItem.task_id.label("task_id"),
+            func.count().label("total"),
+            func.count().filter(ChecklistItem.is_completed.is_(True)).label("completed"),
+        )
+        .group_by(ChecklistItem.task_id)
+        .subquery()
+    )
+    tasks = await db.scalars(
+        select(Task.id)
+        .outerjoin(task_totals, task_totals.c.task_id == Task.id)
+        .where(
+            or_(
+                Task.checklist_total != func.coalesce(task_totals.c.total, 0),
+                Task.checklist_completed != func.coalesce(task_totals.c.completed, 0),
+            )
+        )
+    )
+
+    weight = _task_weight()
+    milestone_totals = (
+        select(
+            Task.milestone_id.label("milestone_id"),
+            func.count().label("task_count"),
+            func.count().filter(Task.status == TaskStatus.COMPLETED).label("completed"),
+            func.sum(weight).label("weight_total"),
+            func.sum(Task.progress * weight).label("weighted_sum"),
+        )
+        .group_by(Task.milestone_id)
+        .subquery()
+    )
+    milestones = await db.scalars(
+        select(Milestone.id)
+        .outerjoin(milestone_totals, milestone_totals.c.milestone_id == Milestone.id)
+        .where(
+            or_(
+                Milestone.task_count != func.coalesce(milestone_totals.c.task_count, 0),
+                Milestone.completed_task_count != func.coalesce(milestone_totals.c.completed, 0),
+                Milestone.task_weight_total != func.coalesce(milestone_totals.c.weight_total, 0),
+                func.abs(Milestone.weighted_progress_sum - func.coalesce(milestone_totals.c.weighted_sum, 0.0))
+                > PROGRESS_TOLERANCE,
+            )
+        )
+    )
+
+    goal_totals = (
+        select(
+            Milestone.goal_id.label("goal_id"),
+            func.count().label("milestone_count"),
+            func.count().filter(Milestone.status == MilestoneStatus.COMPLETED).label("completed"),
+            func.sum(Milestone.progress).label("progress_sum"),
+        )
+        .group_by(Milestone.goal_id)
+        .subquery()
+    )
+    goals = await db.scalars(
+        select(Goal.id)
+        .outerjoin(goal_totals, goal_totals.c.goal_id == Goal.id)
+        .where(
+            or_(
+                Goal.milestone_count != func.coalesce(goal_totals.c.milestone_count, 0),
+                Goal.completed_milestone_count != func.coalesce(goal_totals.c.completed, 0),
+                func.abs(Goal.milestone_progress_sum - func.coalesce(goal_totals.c.progress_sum, 0.0))
+                > PROGRESS_TOLERANCE,
+            )
+        )
+    )
+
+    return {
+        "tasks": list(tasks.all()),
+        "milestones": list(milestones.all()),
+        "goals": list(goals.all()),
+    }
+
+
+async def repair_counter_drift(db: AsyncSession, drift: dict[str, list[str]]) -> None:
+    """Rebuild the rows reported by find_counter_drift, bottom-up."""
+    milestone_ids = await rollup_tasks(db, drift["tasks"])
+    goal_ids = await rollup_milestones(db, milestone_ids | set(drift["milestones"]))
+    await rollup_goals(db, goal_ids | set(drift["goals"]))
@@ -0,0 +1,59 @@
+import enum
+import importlib
+import logging
+from dataclasses import dataclass, field
+from typing import Protocol
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PushMessage:
+    """One push to one device; a digest carries several notifications."""
+
+    token: str
+    title: str
+    body: str
+    notification_ids: list[str]
+    data: dict = field(default_factory=dict)
+
+
+class PushResult(str, enum.Enum):
+    ACCEPTED = "ACCEPTED"
+    # Worth retrying later: throttled, unavailable, timed out
+    FAILED = "FAILED"
+    # The device token is no longer valid; retrying cannot succeed
+    INVALID_TOKEN = "INVALID_TOKEN"
+
+
+class PushBackend(Protocol):
+    async def send(self, messages: list[PushMessage]) -> list[PushResult]:
+        """Deliver the messages; returns the outcome of each one, in order."""
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+class FakePushBackend:
+    """Accepts everything and keeps what it was given, for development and tests."""
+
+    def __init__(self) -> None:
+        self.deliveries: list[PushMessage] = []
+
+    async def send(self, messages: list[PushMessage]) -> list[PushResult]:
+        for message in messages:
+            logger.info("push to %s: %s (%d notifications)", message.token, message.title, len(message.notification_ids))
+        self.deliveries.extend(messages)
+        return [PushResult.ACCEPTED] * len(messages)
+
+    async def close(self) -> None:
+        pass
+
+
+def load_backend(path: str) -> PushBackend:
+    """Instantiate the backend class named by "module:ClassName"."""
+    module_name, _, class_name = path.partition(":")
+    if not class_name:
+        raise ValueError(f"PUSH_BACKEND must look like 'package.module:ClassName', got {path!r}")
+    return getattr(importlib.import_module(module_name), class_name)()
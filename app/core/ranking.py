@@ -0,0 +1,203 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, values, column, String
+from fastapi import HTTPException, status
+
+# Sibling order is a string rank compared byte-wise (the columns use the "C"
+# collation). A rank is the fractional digits of a number in (0, 1) written in
+# base 62, so there is always room for another rank between two neighbours:
+# moving a row rewrites only that row's rank. Ranks never end in the zero
+# digit, which keeps string order and numeric order identical.
+#
+# Appends count upwards instead of bisecting towards the unbounded end: the
+# rank after "a3" is "a4", after "az" it is "b", and only after "zz" does it
+# grow, to "zz1". A rank then grows by one character every 61 appends rather
+# than every 6, and past MAX_RANK_LENGTH the siblings are respaced.
+#
+# Rank alone decides the order. An order_index sent by a client is taken as a
+# position among the siblings and applied with move_to(); the column keeps
+# the value as sent.
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# Repeated inserts at the same spot grow a rank by about one character every
+# six moves; past this length the siblings are respaced. Well below the
+# 64-character rank columns.
+MAX_RANK_LENGTH = 24
+
+
+def key_between(before: str | None, after: str | None) -> str:
+    """A rank strictly between `before` and `after`; None means unbounded on that side."""
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"{before!r} is not below {after!r}")
+
+    lower = before or ""
+    digits = []
+    i = 0
+    while True:
+        low = DIGITS.index(lower[i]) if i < len(lower) else 0
+        high = DIGITS.index(after[i]) if after is not None and i < len(after) else BASE
+        if low == high:
+            digits.append(DIGITS[low])
+        elif high - low > 1:
+            digits.append(DIGITS[(low + high) // 2])
+            return "".join(digits)
+        else:
+            # Adjacent digits: keep the lower one and continue above the rest of `lower`
+            digits.append(DIGITS[low])
+            after = None
+        i += 1
+
+
+def key_after(before: str | None) -> str:
+    """The next rank above `before` for an append: its last incrementable digit, bumped."""
+    if before is None:
+        return key_between(None, None)
+    for i in range(len(before) - 1, -1, -1):
+        digit = DIGITS.index(before[i])
+        if digit < BASE - 1:
+            return before[:i] + DIGITS[digit + 1]
+    return before + DIGITS[1]
+
+
+def keys_between(before: str | None, after: str | None, count: int) -> list[str]:
+    """`count` ascending ranks between `before` and `after`, split evenly so they stay short."""
+    if count <= 0:
+        return []
+    if after is None:
+        keys = [key_after(before)]
+        while len(keys) < count:
+            keys.append(key_after(keys[-1]))
+        return keys
+    middle = key_between(before, after)
+    half = count // 2
+    return keys_between(before, middle, half) + [middle] + keys_between(middle, after, count - half - 1)
+
+
+def spread_keys(count: int) -> list[str]:
+    """`count` evenly spaced ranks of the shortest fixed width that fits them."""
+    width = 1
+    while BASE ** width <= count:
+        width += 1
+    step = BASE ** width // (count + 1)
+
+    keys = []
+    for position in range(1, count + 1):
+        value, digits = position * step, []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        keys.append("".join(reversed(digits)).rstrip(DIGITS[0]))
+    return keys
+
+
+async def last_rank(db: AsyncSession, model, parent_column, parent_id: str) -> str | None:
+    result = await db.execute(
+        select(model.rank).where(parent_column == parent_id).order_by(model.rank.desc()).limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def append_ranks(db: AsyncSession, model, parent_column, parent_id: str, count: int = 1) -> list[str]:
+    """Ranks for `count` new rows after the last sibling, respacing the siblings if they would grow too long."""
+    ranks = keys_between(await last_rank(db, model, parent_column, parent_id), None, count)
+    if ranks and len(ranks[-1]) > MAX_RANK_LENGTH:
+        result = await db.execute(select(model.id).where(parent_column == parent_id).order_by(model.rank))
+        await rewrite_ranks(db, model, parent_column, parent_id, list(result.scalars().all()))
+        ranks = keys_between(await last_rank(db, model, parent_column, parent_id), None, count)
+    return ranks
+
+
+async def rewrite_ranks(db: AsyncSession, model, parent_column, parent_id: str, ordered_ids: list[str]) -> None:
+    """Respace the given siblings in this order with one UPDATE."""
+    if not ordered_ids:
+        return
+
+    ordering = values(column("id", String), column("rank", String), name="ordering").data(
+        list(zip(ordered_ids, spread_keys(len(ordered_ids))))
+    )
+    await db.execute(
+        update(model)
+        .where(model.id == ordering.c.id, parent_column == parent_id)
+        .values(rank=ordering.c.rank)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def reorder(db: AsyncSession, model, parent_column, parent_id: str, ordered_ids: list[str]) -> None:
+    """Put `ordered_ids` first, in that order, followed by the remaining siblings in their current order."""
+    result = await db.execute(select(model.id).where(parent_column == parent_id).order_by(model.rank))
+    current = list(result.scalars().all())
+    existing = set(current)
+
+    listed = list(dict.fromkeys(row_id for row_id in ordered_ids if row_id in existing))
+    placed = set(listed)
+    await rewrite_ranks(db, model, parent_column, parent_id, listed + [row_id for row_id in current if row_id not in placed])
+
+
+async def move(
+    db: AsyncSession,
+    model,
+    parent_column,
+    entity,
+    after_id: str | None,
+    before_id: str | None,
+    not_found: str,
+) -> None:
+    """Rank `entity` directly after `after_id` and/or before `before_id`.
+
+    With neither, the entity moves to the end. Writes only the moved row
+    unless the new rank is too long, in which case the siblings are respaced.
+    """
+    parent_id = getattr(entity, parent_column.key)
+    neighbour_ids = [row_id for row_id in (after_id, before_id) if row_id]
+    ranks = {}
+    if neighbour_ids:
+        result = await db.execute(
+            select(model.id, model.rank).where(model.id.in_(neighbour_ids), parent_column == parent_id)
+        )
+        ranks = dict(result.all())
+        if len(ranks) != len(set(neighbour_ids)):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+    if entity.id in neighbour_ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot move an item next to itself")
+
+    siblings = select(model.rank).where(parent_column == parent_id, model.id != entity.id)
+    lower = ranks.get(after_id)
+    upper = ranks.get(before_id)
+    if after_id and not before_id:
+        upper = await db.scalar(siblings.where(model.rank > lower).order_by(model.rank).limit(1))
+    elif before_id and not after_id:
+        lower = await db.scalar(siblings.where(model.rank < upper).order_by(model.rank.desc()).limit(1))
+    elif not neighbour_ids:
+        lower = await db.scalar(siblings.order_by(model.rank.desc()).limit(1))
+
+    if lower is not None and upper is not None and lower >= upper:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="after_id must come before before_id")
+
+    rank = key_after(lower) if upper is None else key_between(lower, upper)
+    if len(rank) <= MAX_RANK_LENGTH:
+        entity.rank = rank
+        return
+
+    # Respace everything, placing the entity where it was asked to go
+    result = await db.execute(
+        select(model.id).where(parent_column == parent_id, model.id != entity.id).order_by(model.rank)
+    )
+    ordered = list(result.scalars().all())
+    position = ordered.index(after_id) + 1 if after_id else ordered.index(before_id) if before_id else len(ordered)
+    ordered.insert(position, entity.id)
+    await rewrite_ranks(db, model, parent_column, parent_id, ordered)
+    await db.refresh(entity)
+
+
+async def move_to(db: AsyncSession, model, parent_column, entity, position: int, not_found: str) -> None:
+    """Rank `entity` at `position` (0 is first) among its siblings, or last if there are fewer."""
+    parent_id = getattr(entity, parent_column.key)
+    siblings = select(model.id).where(parent_column == parent_id, model.id != entity.id).order_by(model.rank)
+    if position > 0:
+        after_id = await db.scalar(siblings.offset(position - 1).limit(1))
+        await move(db, model, parent_column, entity, after_id, None, not_found)
+    else:
+        before_id = await db.scalar(siblings.limit(1))
+        await move(db, model, parent_column, entity, None, before_id, not_found)
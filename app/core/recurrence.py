@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+from app.models.task import Task, RepeatType
+
+# A repeating task is a series. Its occurrences are never stored: they follow
+# from the rule, every period from the anchor (due date, else start date,
+# else creation time), in UTC. Only what the user did with an occurrence
+# (completed, skipped, moved) is kept, as a sparse TaskOccurrence row keyed by
+# the slot it was generated for. Listing a window therefore costs the window,
+# not the series' history.
+#
+# Progress: the series is one task in its milestone. Completing an occurrence
+# is logged as activity but does not change the task's status, progress or
+# the milestone counters. The series counts as completed when the task itself
+# is marked COMPLETED, which also ends it. The overdue sweeper leaves
+# repeating tasks alone; a past, unfinished occurrence is shown as OVERDUE.
+
+PERIODS = {
+    RepeatType.DAILY: timedelta(days=1),
+    RepeatType.WEEKLY: timedelta(weeks=1),
+}
+
+
+def anchor(task: Task) -> datetime:
+    return task.due_date or task.start_date or task.created_at
+
+
+def slots(first: datetime, period: timedelta, start: datetime, end: datetime) -> list[datetime]:
+    """Occurrences of a series anchored at `first` within [start, end)."""
+    if end <= first:
+        return []
+    # Index of the first occurrence at or after start (ceiling division)
+    index = max(0, -((first - start) // period))
+    occurrences = []
+    when = first + index * period
+    while when < end:
+        occurrences.append(when)
+        when += period
+    return occurrences
+
+
+def is_slot(first: datetime, period: timedelta, when: datetime) -> bool:
+    return when >= first and (when - first) % period == timedelta(0)
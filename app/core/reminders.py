@@ -0,0 +1,92 @@
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import String, select, delete, func, literal, false, text
+from sqlalchemy.dialects.postgresql import insert
+from app.config import get_settings
+from app.models.notification import Notification, NotificationType
+from app.models.task import Task, PENDING_REMINDER_SQL
+
+# Task.reminder_at becomes a TASK_REMINDER notification shortly before it is
+# due. The dispatcher materializes every reminder of the next
+# REMINDER_HORIZON_SECONDS with one range scan of the pending-reminder index,
+# then keeps their times in a heap and wakes up as each one comes due (see
+# app.dispatcher). Reminders set or moved inside the window are rescheduled
+# by the request itself, which also wakes the dispatcher through NOTIFY on
+# commit. Rescans overlap, so inserts are idempotent on (task_id, trigger_at).
+# A failed push is retried at next_attempt_at and never moves trigger_at, so a
+# reminder whose push failed is not materialized again.
+# A deleted task takes its reminders with it; a reminder for a task completed
+# in the meantime is dropped at dispatch.
+
+settings = get_settings()
+
+CHANNEL = "notifications_due"
+
+_COLUMNS = ["id", "user_id", "task_id", "title", "body", "type", "trigger_at", "is_sent", "is_read"]
+
+
+def _window() -> tuple:
+    return (
+        func.now() - timedelta(seconds=settings.REMINDER_GRACE_SECONDS),
+        func.now() + timedelta(seconds=settings.REMINDER_HORIZON_SECONDS),
+    )
+
+
+async def materialize(db: AsyncSession, task_ids: list[str] | None = None) -> list[datetime]:
+    """Create the reminders due in the window, of these tasks or all; returns the new trigger times."""
+    start, end = _window()
+    reminders = select(
+        func.gen_random_uuid().cast(String),
+        Task.user_id,
+        Task.id,
+        func.left(literal("Reminder: ") + Task.title, 255),
+        func.coalesce(Task.description, literal("")),
+        literal(NotificationType.TASK_REMINDER, Notification.type.type),
+        Task.reminder_at,
+        false(),
+        false(),
+    ).where(text(PENDING_REMINDER_SQL), Task.reminder_at >= start, Task.reminder_at < end)
+    if task_ids is not None:
+        reminders = reminders.where(Task.id.in_(task_ids))
+
+    stmt = (
+        insert(Notification)
+        .from_select(_COLUMNS, reminders)
+        .on_conflict_do_nothing(
+            index_elements=[Notification.task_id, Notification.trigger_at],
+            index_where=text("type = 'TASK_REMINDER'"),
+        )
+        .returning(Notification.trigger_at)
+    )
+    result = await db.execute(stmt)
+    return list(result.scalars())
+
+
+async def schedule(db: AsyncSession, tasks: Iterable[Task]) -> None:
+    """Materialize the reminders of new or changed tasks that fall in the current window."""
+    # Outside the window the next rescan picks them up
+    horizon = datetime.now(timezone.utc) + timedelta(seconds=settings.REMINDER_HORIZON_SECONDS)
+    task_ids = [task.id for task in tasks if task.reminder_at is not None and task.reminder_at < horizon]
+    if task_ids:
+        for trigger_at in set(await materialize(db, task_ids)):
+            await notify(db, trigger_at)
+
+
+async def reschedule(db: AsyncSession, task: Task) -> None:
+    """Replace the task's unsent reminder after a change to reminder_at."""
+    await db.execute(
+        delete(Notification)
+        .where(
+            Notification.task_id == task.id,
+            Notification.type == NotificationType.TASK_REMINDER,
+            Notification.is_sent.is_(False),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await schedule(db, [task])
+
+
+async def notify(db: AsyncSession, trigger_at: datetime) -> None:
+    """Tell dispatchers a notification comes due at trigger_at, once the transaction commits."""
+    await db.execute(select(func.pg_notify(CHANNEL, trigger_at.isoformat())))
@@ -0,0 +1,69 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from app.database import TOUCHED_KEY, USER_KEY
+from app.models.resource_version import ResourceVersion
+
+# Each user has a revision counter per polled resource. The session records
+# which tables a request wrote (see app.database.TrackedSession), and
+# flush_versions() bumps the matching counters in the same transaction, right
+# before commit. Conditional GETs compare the counter with If-None-Match and
+# answer 304 without loading the payload.
+
+GOALS = "goals"
+NOTIFICATIONS = "notifications"
+
+_PENDING_KEY = "pending_versions"
+
+# Resource whose responses a write to each table can change. The dashboard
+# counters and progress follow the hierarchy, so they share its counter.
+TABLE_RESOURCES = {
+    "goals": GOALS,
+    "milestones": GOALS,
+    "tasks": GOALS,
+    "checklist_items": GOALS,
+    "task_notes": GOALS,
+    "task_occurrences": GOALS,
+    "categories": GOALS,
+    "notifications": NOTIFICATIONS,
+}
+
+
+def bind_user(db: AsyncSession, user_id: str) -> None:
+    """Attribute writes the session cannot trace to a row (bulk statements) to this user."""
+    db.info[USER_KEY] = user_id
+
+
+def touch(db: AsyncSession, user_id: str, resource: str) -> None:
+    """Bump a user's counter at flush, for writes made outside a request."""
+    db.info.setdefault(_PENDING_KEY, set()).add((user_id, resource))
+
+
+async def flush_versions(db: AsyncSession) -> None:
+    # Pending objects would otherwise only be flushed, and recorded, by the commit
+    await db.flush()
+    keys = db.info.pop(_PENDING_KEY, set())
+    fallback = db.info.get(USER_KEY)
+    for table, user_id in db.info.pop(TOUCHED_KEY, ()):
+        resource = TABLE_RESOURCES.get(table)
+        if resource and (user_id or fallback):
+            keys.add((user_id or fallback, resource))
+    if not keys:
+        return
+
+    stmt = insert(ResourceVersion).values(
+        [{"user_id": user_id, "resource": resource, "version": 1} for user_id, resource in sorted(keys)]
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ResourceVersion.user_id, ResourceVersion.resource],
+            set_={"version": ResourceVersion.version + 1},
+        )
+    )
+
+
+async def get_version(db: AsyncSession, user_id: str, resource: str) -> int:
+    result = await db.execute(
+        select(ResourceVersion.version).where(ResourceVersion.user_id == user_id, ResourceVersion.resource == resource)
+    )
+    return result.scalar_one_or_none() or 0
@@ -1,22 +1,111 @@
+from fastapi import Request
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
 from app.config import get_settings
 
 settings = get_settings()
 
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.DEBUG)
-async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+class TrackedSession(Session):
+    """Session that records whether it has written anything, so reads can skip the commit.
+
+    It also records which tables were written, with the owning user when the
+    row is known, for app.core.resource_versions.
+    """
+
+
+_WROTE_KEY = "wrote"
+# (table name, user ID or None) pairs written since the last flush_versions()
+TOUCHED_KEY = "touched"
+# The authenticated user, owner of writes that carry no row (bulk statements)
+USER_KEY = "user_id"
+
+
+@event.listens_for(TrackedSession, "after_flush")
+def _flushed(session, flush_context):
+    session.info[_WROTE_KEY] = True
+    touched = session.info.setdefault(TOUCHED_KEY, set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        # Read the loaded state directly: an attribute load here would be blocking I/O
+        touched.add((instance.__tablename__, instance.__dict__.get("user_id")))
+
+
+@event.listens_for(TrackedSession, "do_orm_execute")
+def _executed(orm_execute_state):
+    # Anything but a SELECT (UPDATE, DELETE, INSERT or raw SQL) counts as a write
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[_WROTE_KEY] = True
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            orm_execute_state.session.info.setdefault(TOUCHED_KEY, set()).add((table.name, None))
+
+
+def _create_engine(url: str):
+    return create_async_engine(
+        url,
+        echo=settings.DEBUG,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    )
+
+
+engine = _create_engine(settings.DATABASE_URL)
+replica_engine = _create_engine(settings.DATABASE_REPLICA_URL) if settings.DATABASE_REPLICA_URL else engine
+
+async_session = async_sessionmaker(engine, class_=AsyncSession, sync_session_class=TrackedSession, expire_on_commit=False)
+# Transactions are started as READ ONLY, on the replica when one is configured
+read_only_session = async_sessionmaker(
+    replica_engine.execution_options(postgresql_readonly=True), class_=AsyncSession, expire_on_commit=False
+)
 
 
 class Base(DeclarativeBase):
     pass
 
 
-async def get_db() -> AsyncSession:
+def read_only(endpoint):
+    """Declare a route handler read-only.
+
+    Apply it below the router decorator. The request's session then runs in a
+    READ ONLY transaction, on the replica if configured, and is closed without
+    a commit. Replicas lag, so only mark handlers that tolerate slightly stale
+    data.
+    """
+    endpoint.read_only = True
+    return endpoint
+
+
+def is_read_only(request: Request) -> bool:
+    return getattr(request.scope.get("endpoint"), "read_only", False)
+
+
+async def get_db(request: Request) -> AsyncSession:
+    # Sessions only check out a connection when the first statement runs, so
+    # requests that never touch the database never take one from the pool
+    if is_read_only(request):
+        async with read_only_session() as session:
+            yield session
+        return
+
+    # Imported here: both depend on the models, which depend on Base
+    from app.core.progress_engine import flush_progress
+    from app.core.analytics_snapshot import flush_analytics
+    from app.core.activity_log import flush_activity
+    from app.core.resource_versions import flush_versions
+
     async with async_session() as session:
         try:
             yield session
-            await session.commit()
+            await flush_progress(session)
+            await flush_analytics(session)
+            await flush_activity(session)
+            await flush_versions(session)
+            if session.info.get(_WROTE_KEY):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
@@ -0,0 +1,320 @@
+"""Push notification dispatcher.
+
+Usage:
+    python -m app.dispatcher [--once]
+
+Each pass claims a batch of due, unsent notifications with FOR UPDATE SKIP
+LOCKED, so any number of dispatcher processes can run side by side: a row
+locked by one is skipped by the others, and it stays locked until the pass
+that claimed it has delivered it and committed. Delivery is at least once: a
+process that dies after the push but before the commit leaves the rows to be
+claimed again.
+
+Within a batch, a user's notifications for the same device are coalesced into
+one digest push once there are DISPATCH_DIGEST_MIN of them. Notifications of
+users without a device token are marked sent without a push; they remain in
+the in-app list. Reminders for tasks completed before they came due are
+dropped. Pushes that fail are retried with exponential backoff from
+DISPATCH_RETRY_SECONDS, up to DISPATCH_MAX_ATTEMPTS attempts, after which the
+notification is only kept in the in-app list. A token the backend reports as
+invalid is cleared from the user, and the notification is kept the same way.
+A retry never moves trigger_at; it waits for next_attempt_at.
+
+The dispatcher also schedules task reminders (app.core.reminders). Every
+REMINDER_REFRESH_SECONDS it materializes the reminders of the coming window and
+loads the due times of everything unsent in it into a heap. It then sleeps
+until the earliest one instead of polling, and requests that set a reminder
+inside the window wake it through LISTEN/NOTIFY. Notifications created by any
+other path are still picked up by a poll every DISPATCH_POLL_SECONDS.
+"""
+import argparse
+import asyncio
+import heapq
+import logging
+import signal
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update, delete, func, literal_column, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncConnection
+
+from app.config import get_settings
+from app.database import async_session, engine
+from app.core import reminders
+from app.core.principal_cache import invalidate_user
+from app.core.push import PushBackend, PushMessage, PushResult, load_backend
+from app.core.resource_versions import NOTIFICATIONS, touch, flush_versions
+
+# Import all models so relationships resolve outside the API process
+from app.models.user import User
+from app.models.category import Category  # noqa: F401
+from app.models.goal import Goal  # noqa: F401
+from app.models.milestone import Milestone  # noqa: F401
+from app.models.task import Task, TaskNote, TaskStatus  # noqa: F401
+from app.models.occurrence import TaskOccurrence  # noqa: F401
+from app.models.checklist import ChecklistItem  # noqa: F401
+from app.models.notification import Notification, UNSENT_SQL
+from app.models.analytics import UserAnalytics  # noqa: F401
+from app.models.activity import ActivityEvent, DailyActivity  # noqa: F401
+from app.models.resource_version import ResourceVersion  # noqa: F401
+from app.models.job import Job  # noqa: F401
+
+settings = get_settings()
+logger = logging.getLogger("app.dispatcher")
+
+# Wake a moment after a due time, so the database clock has passed it too
+_WAKE_SLACK_SECONDS = 1.0
+# Due times held in memory; later ones are loaded by the next rescan
+_MAX_WAKEUPS = 10000
+
+_SECOND = literal_column("interval '1 second'")
+# Matches the partial index on DUE_SQL in app.models.notification
+_DUE = func.coalesce(Notification.next_attempt_at, Notification.trigger_at)
+
+
+def _messages(token: str, rows: list) -> list[PushMessage]:
+    if len(rows) < settings.DISPATCH_DIGEST_MIN:
+        return [
+            PushMessage(
+                token=token,
+                title=row.title,
+                body=row.body,
+                notification_ids=[row.id],
+                data={"type": row.type.value, "notification_id": row.id, "task_id": row.task_id},
+            )
+            for row in rows
+        ]
+
+    titles = [row.title for row in rows[:3]]
+    if len(rows) > 3:
+        titles.append(f"and {len(rows) - 3} more")
+    return [
+        PushMessage(
+            token=token,
+            title=f"{len(rows)} new notifications",
+            body="; ".join(titles),
+            notification_ids=[row.id for row in rows],
+            data={"type": "DIGEST"},
+        )
+    ]
+
+
+async def dispatch_once(db: AsyncSession, backend: PushBackend) -> int:
+    """Claim, deliver and mark one batch; returns how many notifications were claimed."""
+    result = await db.execute(
+        select(
+            Notification.id,
+            Notification.user_id,
+            Notification.title,
+            Notification.body,
+            Notification.type,
+            Notification.task_id,
+            User.fcm_token,
+            Task.status.label("task_status"),
+        )
+        .join(User, User.id == Notification.user_id)
+        .outerjoin(Task, Task.id == Notification.task_id)
+        .where(text(UNSENT_SQL), _DUE <= func.now())
+        .order_by(_DUE)
+        .limit(settings.DISPATCH_BATCH_SIZE)
+        .with_for_update(of=Notification, skip_locked=True)
+    )
+    claimed = result.all()
+    if not claimed:
+        return 0
+
+    # One device per user token; the same token under two accounts stays apart
+    devices = defaultdict(list)
+    sent = []
+    moot = []
+    for row in claimed:
+        if row.task_status == TaskStatus.COMPLETED:
+            # A reminder for a task finished in the meantime
+            moot.append(row.id)
+        elif row.fcm_token:
+            devices[(row.user_id, row.fcm_token)].append(row)
+        else:
+            sent.append(row.id)
+
+    messages = [
+        (user_id, message) for (user_id, token), rows in devices.items() for message in _messages(token, rows)
+    ]
+    failed = []
+    invalid_tokens = set()
+    if messages:
+        results = await backend.send([message for _, message in messages])
+        for (user_id, message), result in zip(messages, results):
+            if result == PushResult.FAILED:
+                failed.extend(message.notification_ids)
+            else:
+                sent.extend(message.notification_ids)
+                if result == PushResult.INVALID_TOKEN:
+                    invalid_tokens.add((user_id, message.token))
+
+    if sent:
+        await db.execute(
+            update(Notification)
+            .where(Notification.id.in_(sent))
+            .values(is_sent=True)
+            .execution_options(synchronize_session=False)
+        )
+    if moot:
+        await db.execute(
+            delete(Notification).where(Notification.id.in_(moot)).execution_options(synchronize_session=False)
+        )
+    if failed:
+        # The last attempt gives up on the push; the notification stays listed
+        await db.execute(
+            update(Notification)
+            .where(Notification.id.in_(failed))
+            .values(
+                attempts=Notification.attempts + 1,
+                is_sent=Notification.attempts + 1 >= settings.DISPATCH_MAX_ATTEMPTS,
+                next_attempt_at=func.now()
+                + settings.DISPATCH_RETRY_SECONDS * func.power(2, Notification.attempts) * _SECOND,
+            )
+            .execution_options(synchronize_session=False)
+        )
+    if invalid_tokens:
+        # Unless the user registered a new token since
+        await db.execute(
+            update(User)
+            .where(tuple_(User.id, User.fcm_token).in_(invalid_tokens))
+            .values(fcm_token=None)
+            .execution_options(synchronize_session=False)
+        )
+        # Only reaches this process's cache; API workers expire theirs by TTL
+        for user_id, _ in invalid_tokens:
+            invalidate_user(db, user_id)
+    for user_id in {row.user_id for row in claimed}:
+        touch(db, user_id, NOTIFICATIONS)
+    await flush_versions(db)
+    await db.commit()
+
+    logger.info(
+        "claimed %d, pushed %d messages, %d failed, %d invalid tokens",
+        len(claimed), len(messages), len(failed), len(invalid_tokens),
+    )
+    return len(claimed)
+
+
+class Wakeups:
+    """Due times of unsent notifications in the current window, earliest first."""
+
+    def __init__(self) -> None:
+        self._heap: list[datetime] = []
+        self._known: set[datetime] = set()
+        self.changed = asyncio.Event()
+
+    def add(self, when: datetime) -> None:
+        if when not in self._known:
+            self._known.add(when)
+            heapq.heappush(self._heap, when)
+            self.changed.set()
+
+    def replace(self, times: Iterable[datetime]) -> None:
+        # A sorted list is a valid heap
+        self._heap = sorted(set(times))
+        self._known = set(self._heap)
+
+    def pop_due(self, now: datetime) -> None:
+        while self._heap and self._heap[0] <= now:
+            self._known.discard(heapq.heappop(self._heap))
+
+    def seconds_until_next(self, now: datetime) -> float | None:
+        return (self._heap[0] - now).total_seconds() if self._heap else None
+
+
+async def refresh(wakeups: Wakeups) -> None:
+    """Materialize the reminders of the coming window and reload the due times."""
+    async with async_session() as db:
+        created = await reminders.materialize(db)
+        await db.commit()
+        # Retries of failed pushes come due at next_attempt_at
+        result = await db.execute(
+            select(_DUE)
+            .distinct()
+            .where(
+                text(UNSENT_SQL),
+                _DUE < func.now() + timedelta(seconds=settings.REMINDER_HORIZON_SECONDS),
+            )
+            .order_by(_DUE)
+            .limit(_MAX_WAKEUPS)
+        )
+        wakeups.replace(result.scalars())
+    logger.info("materialized %d reminders", len(created))
+
+
+async def listen(wakeups: Wakeups) -> AsyncConnection:
+    """Hold a connection that feeds NOTIFYs from app.core.reminders into the heap."""
+    connection = await engine.connect()
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.add_listener(
+        reminders.CHANNEL, lambda conn, pid, channel, payload: wakeups.add(datetime.fromisoformat(payload))
+    )
+    return connection
+
+
+async def run(once: bool) -> int:
+    backend = load_backend(settings.PUSH_BACKEND)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    wakeups = Wakeups()
+    listener = None if once else await listen(wakeups)
+    next_refresh = loop.time()
+    try:
+        while not stop.is_set():
+            if loop.time() >= next_refresh:
+                try:
+                    await refresh(wakeups)
+                except Exception:
+                    logger.exception("refreshing reminders failed")
+                next_refresh = loop.time() + settings.REMINDER_REFRESH_SECONDS
+
+            wakeups.pop_due(datetime.now(timezone.utc))
+            # A full batch means more is probably due
+            while not stop.is_set():
+                try:
+                    async with async_session() as db:
+                        claimed = await dispatch_once(db, backend)
+                except Exception:
+                    logger.exception("dispatch pass failed")
+                    claimed = 0
+                if claimed < settings.DISPATCH_BATCH_SIZE:
+                    break
+            if once:
+                break
+
+            # Sleep until the next due time, the next rescan or the fallback
+            # poll, whichever is first; a NOTIFY cuts it short
+            wakeups.changed.clear()
+            delay = min(settings.DISPATCH_POLL_SECONDS, next_refresh - loop.time())
+            until_next = wakeups.seconds_until_next(datetime.now(timezone.utc))
+            if until_next is not None:
+                delay = min(delay, until_next + _WAKE_SLACK_SECONDS)
+            waiters = [asyncio.ensure_future(stop.wait()), asyncio.ensure_future(wakeups.changed.wait())]
+            await asyncio.wait(waiters, timeout=max(delay, 0), return_when=asyncio.FIRST_COMPLETED)
+            for waiter in waiters:
+                waiter.cancel()
+    finally:
+        if listener is not None:
+            await listener.close()
+        await backend.close()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.dispatcher")
+    parser.add_argument("--once", action="store_true", help="Deliver everything due now, then exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if settings.DEBUG else logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    return asyncio.run(run(args.once))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
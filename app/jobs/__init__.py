@@ -0,0 +1,2 @@
+"""Background job handlers, registered with app.core.job_queue.job on import."""
+from app.jobs import maintenance, overdue  # noqa: F401
@@ -0,0 +1,23 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import progress_engine, analytics_snapshot, activity_log
+from app.core.job_queue import job
+
+# Queued versions of the app.manage repairs, for running them off the request
+# path (python -m app.manage enqueue rebuild-analytics ...)
+
+
+@job("repair-progress", timeout_seconds=3600)
+async def repair_progress(db: AsyncSession) -> None:
+    drift = await progress_engine.find_counter_drift(db)
+    if any(drift.values()):
+        await progress_engine.repair_counter_drift(db, drift)
+
+
+@job("rebuild-analytics", timeout_seconds=3600)
+async def rebuild_analytics(db: AsyncSession, user_ids: list[str] | None = None) -> None:
+    await analytics_snapshot.rebuild_analytics(db, user_ids)
+
+
+@job("rebuild-activity", timeout_seconds=3600)
+async def rebuild_activity(db: AsyncSession, user_ids: list[str] | None = None) -> None:
+    await activity_log.rebuild_daily_activity(db, user_ids)
@@ -0,0 +1,59 @@
+from datetime import timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, text
+from app.config import get_settings
+from app.models.task import Task, TaskStatus, OVERDUE_CANDIDATES_SQL
+from app.core import analytics_snapshot
+from app.core.job_queue import job
+from app.core.resource_versions import GOALS, touch, flush_versions
+
+settings = get_settings()
+
+# OVERDUE only changes a task's status: it is not counted in any milestone or
+# goal counter (only COMPLETED is), so progress needs no rollup. Repeating
+# tasks are never swept; their occurrences have their own due times (see
+# app.core.recurrence). What changes
+# is the owner's overdue_tasks count and the polled goals payload.
+
+
+async def sweep_batch(db: AsyncSession, limit: int) -> int:
+    """Mark up to `limit` past-due open tasks OVERDUE; returns how many were marked.
+
+    Rows locked by a request in flight are skipped and picked up by a later
+    batch. Only per-user counts come back to Python.
+    """
+    due = (
+        select(Task.id)
+        .where(text(OVERDUE_CANDIDATES_SQL), Task.due_date < func.now())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .cte("due")
+    )
+    swept = (
+        update(Task)
+        .where(Task.id == due.c.id)
+        .values(status=TaskStatus.OVERDUE)
+        .returning(Task.user_id)
+        .cte("swept")
+    )
+    result = await db.execute(select(swept.c.user_id, func.count()).group_by(swept.c.user_id))
+
+    marked = 0
+    for user_id, count in result.all():
+        analytics_snapshot.mark_overdue(db, user_id, count)
+        touch(db, user_id, GOALS)
+        marked += count
+    await analytics_snapshot.flush_analytics(db)
+    await flush_versions(db)
+    return marked
+
+
+@job("sweep-overdue", timeout_seconds=3600, every=timedelta(seconds=settings.OVERDUE_SWEEP_SECONDS))
+async def sweep_overdue(db: AsyncSession) -> None:
+    # Each batch commits on its own, so row locks last one batch however
+    # large the backlog; a sweep cut short is simply finished by the next one
+    while True:
+        marked = await sweep_batch(db, settings.OVERDUE_SWEEP_BATCH_SIZE)
+        await db.commit()
+        if marked < settings.OVERDUE_SWEEP_BATCH_SIZE:
+            break
@@ -5,7 +5,8 @@ from fastapi.responses import FileResponse
 import os
 
 from app.config import get_settings
-from app.routers import auth, categories, goals, milestones, tasks, checklists, analytics, notifications
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.routers import auth, categories, goals, milestones, tasks, checklists, analytics, notifications, agenda, live
 
 settings = get_settings()
 
@@ -24,6 +25,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Static files
@@ -58,6 +60,8 @@ app.include_router(tasks.router)
 app.include_router(checklists.router)
 app.include_router(analytics.router)
 app.include_router(notifications.router)
+app.include_router(agenda.router)
+app.include_router(live.router)
 
 
 @app.get("/", tags=["Health"])
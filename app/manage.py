@@ -0,0 +1,108 @@
+"""Maintenance commands.
+
+Usage:
+    python -m app.manage check-progress [--repair]
+    python -m app.manage rebuild-analytics [--user USER_ID ...]
+    python -m app.manage rebuild-activity [--user USER_ID ...]
+    python -m app.manage enqueue JOB [--payload JSON] [--priority N] [--key KEY]
+"""
+import argparse
+import asyncio
+import json
+
+from app.database import async_session
+from app.core import progress_engine, analytics_snapshot, activity_log, job_queue
+
+# Import all models so relationships resolve outside the API process
+from app.models.user import User  # noqa: F401
+from app.models.category import Category  # noqa: F401
+from app.models.goal import Goal  # noqa: F401
+from app.models.milestone import Milestone  # noqa: F401
+from app.models.task import Task, TaskNote  # noqa: F401
+from app.models.occurrence import TaskOccurrence  # noqa: F401
+from app.models.checklist import ChecklistItem  # noqa: F401
+from app.models.notification import Notification  # noqa: F401
+from app.models.analytics import UserAnalytics  # noqa: F401
+from app.models.activity import ActivityEvent, DailyActivity  # noqa: F401
+from app.models.resource_version import ResourceVersion  # noqa: F401
+from app.models.job import Job  # noqa: F401
+
+
+async def check_progress(repair: bool) -> int:
+    async with async_session() as db:
+        drift = await progress_engine.find_counter_drift(db)
+        total = sum(len(ids) for ids in drift.values())
+        for kind, ids in drift.items():
+            print(f"{kind}: {len(ids)} inconsistent")
+            for row_id in ids:
+                print(f"  {row_id}")
+
+        if total and repair:
+            await progress_engine.repair_counter_drift(db, drift)
+            # Status changes made by a repair are not user activity, so the
+            # activity log is deliberately not flushed here
+            await analytics_snapshot.flush_analytics(db)
+            await db.commit()
+            print(f"Repaired {total} rows")
+            return 0
+
+    return 1 if total else 0
+
+
+async def rebuild_analytics(user_ids: list[str] | None) -> int:
+    async with async_session() as db:
+        await analytics_snapshot.rebuild_analytics(db, user_ids)
+        await db.commit()
+    print(f"Rebuilt analytics for {len(user_ids) if user_ids else 'all'} users")
+    return 0
+
+
+async def rebuild_activity(user_ids: list[str] | None) -> int:
+    async with async_session() as db:
+        await activity_log.rebuild_daily_activity(db, user_ids)
+        await db.commit()
+    print(f"Rebuilt daily activity for {len(user_ids) if user_ids else 'all'} users")
+    return 0
+
+
+async def enqueue(name: str, payload: dict, priority: int, key: str | None) -> int:
+    async with async_session() as db:
+        queued = await job_queue.enqueue(db, name, payload, priority=priority, key=key)
+        await db.commit()
+    print(f"Queued {name}" if queued else f"{name} is already queued with key {key}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.manage")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    check = commands.add_parser("check-progress", help="Compare progress counters with the rows they summarise")
+    check.add_argument("--repair", action="store_true", help="Rebuild inconsistent counters")
+
+    rebuild = commands.add_parser("rebuild-analytics", help="Recount the per-user dashboard snapshot")
+    rebuild.add_argument("--user", dest="user_ids", action="append", help="Only this user (repeatable)")
+
+    activity = commands.add_parser("rebuild-activity", help="Recompute daily activity rollups from the event log")
+    activity.add_argument("--user", dest="user_ids", action="append", help="Only this user (repeatable)")
+
+    queue = commands.add_parser("enqueue", help="Queue a background job for app.worker")
+    queue.add_argument("name", choices=sorted(job_queue.load_handlers()))
+    queue.add_argument("--payload", type=json.loads, default={}, help="Handler keyword arguments as a JSON object")
+    queue.add_argument("--priority", type=int, default=0, help="Lower runs first")
+    queue.add_argument("--key", help="Skip if a job with this key is already queued or running")
+
+    args = parser.parse_args()
+    if args.command == "check-progress":
+        return asyncio.run(check_progress(args.repair))
+    if args.command == "rebuild-analytics":
+        return asyncio.run(rebuild_analytics(args.user_ids))
+    if args.command == "rebuild-activity":
+        return asyncio.run(rebuild_activity(args.user_ids))
+    if args.command == "enqueue":
+        return asyncio.run(enqueue(args.name, args.payload, args.priority, args.key))
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,48 @@
+import uuid
+from datetime import datetime, date
+from sqlalchemy import String, Integer, Date, DateTime, ForeignKey, Enum as SAEnum, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+import enum
+
+
+class ActivityType(str, enum.Enum):
+    TASK_COMPLETED = "TASK_COMPLETED"
+    TASK_REOPENED = "TASK_REOPENED"
+    CHECKLIST_ITEM_COMPLETED = "CHECKLIST_ITEM_COMPLETED"
+    CHECKLIST_ITEM_REOPENED = "CHECKLIST_ITEM_REOPENED"
+    OCCURRENCE_SKIPPED = "OCCURRENCE_SKIPPED"
+
+
+class ActivityEvent(Base):
+    """Append-only log of completions and skips. Rows are never updated or deleted with their task."""
+
+    __tablename__ = "activity_events"
+    __table_args__ = (
+        Index("ix_activity_events_user_id_occurred_at", "user_id", "occurred_at"),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # Plain IDs, no foreign keys: history outlives the goal, task and item
+    goal_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    task_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    checklist_item_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    type: Mapped[ActivityType] = mapped_column(SAEnum(ActivityType), nullable=False)
+    occurred_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class DailyActivity(Base):
+    """Completions per user, goal and UTC day, rolled up from activity_events."""
+
+    __tablename__ = "daily_activity"
+
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    goal_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    tasks_completed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    tasks_reopened: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    items_completed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    items_reopened: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Occurrences of repeating tasks skipped; not completions, nor reopens
+    occurrences_skipped: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
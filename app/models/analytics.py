@@ -0,0 +1,21 @@
+from datetime import datetime
+from sqlalchemy import String, Integer, DateTime, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+
+class UserAnalytics(Base):
+    """Per-user dashboard counters, maintained on write by app.core.analytics_snapshot."""
+
+    __tablename__ = "user_analytics"
+
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total_goals: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    completed_goals: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    active_goals: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total_milestones: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    completed_milestones: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total_tasks: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    completed_tasks: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    overdue_tasks: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
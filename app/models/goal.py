@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime, Float, ForeignKey, Enum as SAEnum, func, Boolean
+from sqlalchemy import String, Integer, DateTime, Float, ForeignKey, Enum as SAEnum, Index, func, Boolean
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 import enum
@@ -20,6 +20,10 @@ class GoalStatus(str, enum.Enum):
 
 class Goal(Base):
     __tablename__ = "goals"
+    __table_args__ = (
+        # Keyset pagination order, see app.core.pagination
+        Index("ix_goals_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -32,10 +36,14 @@ class Goal(Base):
     status: Mapped[GoalStatus] = mapped_column(SAEnum(GoalStatus), default=GoalStatus.ACTIVE, nullable=False, index=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False, index=True)
     progress: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    # Maintained by the progress engine
+    milestone_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    completed_milestone_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    milestone_progress_sum: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     user = relationship("User", back_populates="goals")
     category_rel = relationship("Category", back_populates="goals")
-    milestones = relationship("Milestone", back_populates="goal", cascade="all, delete-orphan", order_by="Milestone.order_index")
+    milestones = relationship("Milestone", back_populates="goal", cascade="all, delete-orphan", order_by="Milestone.rank")
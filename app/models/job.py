@@ -0,0 +1,43 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import String, DateTime, Integer, Enum as SAEnum, Text, JSON, Index, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+import enum
+
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    FAILED = "FAILED"
+
+
+# Queued or running; the predicate of the partial indexes, written as in their
+# DDL so ON CONFLICT can match it
+ACTIVE_SQL = "status <> 'FAILED'"
+
+
+class Job(Base):
+    """A unit of background work, run by app.worker; see app.core.job_queue."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # The claim query: runnable rows in priority, then due order
+        Index("ix_jobs_runnable", "priority", "run_at", postgresql_where=text(ACTIVE_SQL)),
+        # Deduplicates enqueues: at most one queued or running job per key
+        Index("uq_jobs_key", "key", unique=True, postgresql_where=text(ACTIVE_SQL)),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    key: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    priority: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # lower runs first
+    status: Mapped[JobStatus] = mapped_column(SAEnum(JobStatus), default=JobStatus.QUEUED, nullable=False)
+    # When a queued job becomes due; while running, when its lease expires
+    run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False)
+    timeout_seconds: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import String, Integer, DateTime, Float, ForeignKey, Enum as SAEnum, func
+from sqlalchemy import String, Integer, DateTime, Float, ForeignKey, Enum as SAEnum, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 import enum
@@ -13,15 +13,30 @@ class MilestoneStatus(str, enum.Enum):
 
 class Milestone(Base):
     __tablename__ = "milestones"
+    __table_args__ = (
+        Index("ix_milestones_user_id_status", "user_id", "status"),
+        Index("ix_milestones_goal_id_rank", "goal_id", "rank"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     goal_id: Mapped[str] = mapped_column(String(36), ForeignKey("goals.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Denormalised from the goal (as on tasks, checklist items and notes) so
+    # per-user queries can skip the joins
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
+    # As sent by the client, which moves the row to that position; the order is rank alone
     order_index: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Position among the goal's milestones, see app.core.ranking
+    rank: Mapped[str] = mapped_column(String(64, collation="C"), nullable=False)
     start_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     end_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     status: Mapped[MilestoneStatus] = mapped_column(SAEnum(MilestoneStatus), default=MilestoneStatus.ACTIVE, nullable=False)
     progress: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    # Maintained by the progress engine
+    task_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    completed_task_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    task_weight_total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    weighted_progress_sum: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
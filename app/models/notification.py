@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime, Boolean, ForeignKey, Enum as SAEnum, Text, JSON, func
+from sqlalchemy import String, Integer, DateTime, Boolean, ForeignKey, Enum as SAEnum, Text, JSON, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 import enum
@@ -13,16 +13,40 @@ class NotificationType(str, enum.Enum):
     WEEKLY_SUMMARY = "WEEKLY_SUMMARY"
 
 
+# When the dispatcher next tries to push the notification: at trigger_at, or
+# after a failed attempt at next_attempt_at. trigger_at itself never moves, so
+# the notification stays listed and reminders stay unique per task and time.
+DUE_SQL = "coalesce(next_attempt_at, trigger_at)"
+# The dispatcher's queue, written as in the index so queries can match it
+UNSENT_SQL = "NOT is_sent"
+
+
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Keyset pagination order, see app.core.pagination
+        Index("ix_notifications_user_id_created_at_id", "user_id", "created_at", "id"),
+        # The dispatcher's queue: only unsent rows, in due order
+        Index("ix_notifications_unsent_due_at", text(DUE_SQL), postgresql_where=text(UNSENT_SQL)),
+        # One materialized reminder per task and time, see app.core.reminders
+        Index(
+            "uq_notifications_task_id_reminder", "task_id", "trigger_at",
+            unique=True, postgresql_where=text("type = 'TASK_REMINDER'"),
+        ),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    # The task a reminder is for; removed with the task
+    task_id: Mapped[str | None] = mapped_column(String(36), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     body: Mapped[str] = mapped_column(Text, nullable=False)
     type: Mapped[NotificationType] = mapped_column(SAEnum(NotificationType), nullable=False)
     trigger_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
     is_sent: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    # Failed push attempts, see app.dispatcher
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     is_read: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     metadata_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
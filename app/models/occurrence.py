@@ -0,0 +1,37 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime, ForeignKey, Enum as SAEnum, Index, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+import enum
+
+
+class OccurrenceStatus(str, enum.Enum):
+    COMPLETED = "COMPLETED"
+    SKIPPED = "SKIPPED"
+
+
+class TaskOccurrence(Base):
+    """What the user did with one occurrence of a repeating task.
+
+    Occurrences themselves are computed from the task's rule (see
+    app.core.recurrence); only completed, skipped or moved ones have a row.
+    """
+
+    __tablename__ = "task_occurrences"
+    __table_args__ = (
+        Index("ix_task_occurrences_user_id_occurs_at", "user_id", "occurs_at"),
+        Index(
+            "ix_task_occurrences_user_id_scheduled_at", "user_id", "scheduled_at",
+            postgresql_where=text("scheduled_at IS NOT NULL"),
+        ),
+    )
+
+    task_id: Mapped[str] = mapped_column(String(36), ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    # The slot the rule generated; identifies the occurrence even once moved
+    occurs_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    status: Mapped[OccurrenceStatus | None] = mapped_column(SAEnum(OccurrenceStatus), nullable=True)
+    scheduled_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,13 @@
+from sqlalchemy import String, BigInteger, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+
+class ResourceVersion(Base):
+    """Revision counter per user and resource, bumped by app.core.resource_versions on every write."""
+
+    __tablename__ = "resource_versions"
+
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    resource: Mapped[str] = mapped_column(String(32), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import String, Integer, DateTime, Float, ForeignKey, Enum as SAEnum, Text, func
+from sqlalchemy import String, Integer, DateTime, Float, ForeignKey, Enum as SAEnum, Index, Text, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 import enum
@@ -13,6 +13,14 @@ class TaskStatus(str, enum.Enum):
     OVERDUE = "OVERDUE"
 
 
+# Tasks the overdue sweeper moves to OVERDUE once due_date has passed,
+# repeating tasks, and tasks with a reminder still to send. Kept as literal
+# SQL so queries match the partial indexes exactly.
+OVERDUE_CANDIDATES_SQL = "status IN ('PENDING', 'IN_PROGRESS') AND repeat_type = 'NONE'"
+REPEATING_SQL = "repeat_type <> 'NONE'"
+PENDING_REMINDER_SQL = "reminder_at IS NOT NULL AND status <> 'COMPLETED'"
+
+
 class RepeatType(str, enum.Enum):
     NONE = "NONE"
     DAILY = "DAILY"
@@ -21,9 +29,21 @@ class RepeatType(str, enum.Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_user_id_status", "user_id", "status"),
+        Index("ix_tasks_user_id_due_date", "user_id", "due_date"),
+        Index("ix_tasks_milestone_id_created_at_id", "milestone_id", "created_at", "id"),
+        # The overdue sweeper's scan: stays as small as the set of open tasks
+        Index("ix_tasks_open_due_date", "due_date", postgresql_where=text(OVERDUE_CANDIDATES_SQL)),
+        # The agenda's lookup of a user's series, see app.core.recurrence
+        Index("ix_tasks_user_id_repeating", "user_id", postgresql_where=text(REPEATING_SQL)),
+        # The reminder scheduler's look-ahead scan, see app.core.reminders
+        Index("ix_tasks_pending_reminder_at", "reminder_at", postgresql_where=text(PENDING_REMINDER_SQL)),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     milestone_id: Mapped[str] = mapped_column(String(36), ForeignKey("milestones.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(String(1000), nullable=True)
     start_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -33,20 +53,27 @@ class Task(Base):
     repeat_type: Mapped[RepeatType] = mapped_column(SAEnum(RepeatType), default=RepeatType.NONE, nullable=False)
     reminder_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     progress: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    # Maintained by the progress engine
+    checklist_total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    checklist_completed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     milestone = relationship("Milestone", back_populates="tasks")
-    checklist_items = relationship("ChecklistItem", back_populates="task", cascade="all, delete-orphan", order_by="ChecklistItem.order_index")
+    checklist_items = relationship("ChecklistItem", back_populates="task", cascade="all, delete-orphan", order_by="ChecklistItem.rank")
     notes = relationship("TaskNote", back_populates="task", cascade="all, delete-orphan", order_by="TaskNote.created_at.desc()")
 
 
 class TaskNote(Base):
     __tablename__ = "task_notes"
+    __table_args__ = (
+        Index("ix_task_notes_task_id_created_at_id", "task_id", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     task_id: Mapped[str] = mapped_column(String(36), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,33 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, read_only
+from app.core.dependencies import get_current_user, get_current_user_id, etag
+from app.core.resource_versions import GOALS
+from app.models.user import User
+from app.schemas.agenda import AgendaItem, OccurrenceUpdate
+from app.services import agenda_service
+
+router = APIRouter(prefix="/api", tags=["Agenda"])
+
+
+@router.get("/agenda", response_model=list[AgendaItem], dependencies=[Depends(etag(GOALS, clock=True))])
+@read_only
+async def get_agenda(
+    start: datetime = Query(..., description="Window start, inclusive"),
+    end: datetime = Query(..., description="Window end, exclusive; at most 92 days after start"),
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    return await agenda_service.get_agenda(db, user_id, start, end)
+
+
+# Null status and scheduled_at reset the occurrence to what the rule says
+@router.put("/tasks/{task_id}/occurrences", response_model=AgendaItem)
+async def set_occurrence(
+    task_id: str,
+    data: OccurrenceUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await agenda_service.set_occurrence(db, current_user.id, task_id, data)
@@ -1,25 +1,57 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
-from app.core.dependencies import get_current_user
-from app.models.user import User
-from app.schemas.analytics import DashboardOverview, GoalProgressItem
+from app.database import get_db, read_only
+from app.core.dependencies import get_current_user_id, etag
+from app.core.resource_versions import GOALS
+from app.schemas.analytics import DashboardOverview, GoalProgressItem, DailyCompletions, Streak, WeeklyThroughput
 from app.services import analytics_service
 
 router = APIRouter(prefix="/api/analytics", tags=["Analytics"])
 
 
-@router.get("/overview", response_model=DashboardOverview)
+@router.get("/overview", response_model=DashboardOverview, dependencies=[Depends(etag(GOALS))])
+@read_only
 async def get_overview(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ):
-    return await analytics_service.get_dashboard_overview(db, current_user.id)
+    return await analytics_service.get_dashboard_overview(db, user_id)
 
 
-@router.get("/goal-progress", response_model=list[GoalProgressItem])
+@router.get("/goal-progress", response_model=list[GoalProgressItem], dependencies=[Depends(etag(GOALS))])
+@read_only
 async def get_goal_progress(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ):
-    return await analytics_service.get_goal_progress_bars(db, current_user.id)
+    return await analytics_service.get_goal_progress_bars(db, user_id)
+
+
+@router.get("/completions", response_model=list[DailyCompletions])
+@read_only
+async def get_completions(
+    days: int = Query(30, ge=1, le=366),
+    goal_id: str | None = Query(None),
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    return await analytics_service.get_completion_history(db, user_id, days, goal_id)
+
+
+@router.get("/streak", response_model=Streak)
+@read_only
+async def get_streak(
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    return await analytics_service.get_streak(db, user_id)
+
+
+@router.get("/weekly", response_model=list[WeeklyThroughput])
+@read_only
+async def get_weekly(
+    weeks: int = Query(8, ge=1, le=104),
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    return await analytics_service.get_weekly_throughput(db, user_id, weeks)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
-from app.core.dependencies import get_current_user
+from app.database import get_db, read_only
+from app.core.dependencies import get_current_user, get_current_user_id
 from app.models.user import User
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
 from app.services import category_service
@@ -10,11 +10,12 @@ router = APIRouter(prefix="/api/categories", tags=["Categories"])
 
 
 @router.get("", response_model=list[CategoryResponse])
+@read_only
 async def list_categories(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ):
-    return await category_service.get_categories(db, current_user.id)
+    return await category_service.get_categories(db, user_id)
 
 
 @router.post("", response_model=CategoryResponse, status_code=201)
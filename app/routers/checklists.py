@@ -1,21 +1,29 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
-from app.core.dependencies import get_current_user
+from app.database import get_db, read_only
+from app.core.dependencies import get_current_user, get_current_user_id
 from app.models.user import User
-from app.schemas.checklist import ChecklistItemCreate, ChecklistItemUpdate, ChecklistReorder, ChecklistItemResponse
+from app.schemas.checklist import ChecklistItemCreate, ChecklistItemUpdate, ChecklistReorder, ChecklistMove, ChecklistBatch, ChecklistItemResponse
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, set_next_cursor
+from app.core.fast_json import rows_response
 from app.services import checklist_service
 
 router = APIRouter(prefix="/api", tags=["Checklist"])
 
 
 @router.get("/tasks/{task_id}/checklist", response_model=list[ChecklistItemResponse])
+@read_only
 async def list_checklist(
     task_id: str,
+    response: Response,
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ):
-    return await checklist_service.get_checklist_items(db, current_user.id, task_id)
+    items, next_cursor = await checklist_service.get_checklist_items(db, user_id, task_id, cursor, limit)
+    set_next_cursor(response, next_cursor)
+    return rows_response(items, response)
 
 
 @router.post("/tasks/{task_id}/checklist", response_model=ChecklistItemResponse, status_code=201)
@@ -28,6 +36,16 @@ async def create_checklist_item(
     return await checklist_service.create_checklist_item(db, current_user.id, task_id, data)
 
 
+@router.post("/tasks/{task_id}/checklist/batch", response_model=list[ChecklistItemResponse])
+async def batch_checklist(
+    task_id: str,
+    data: ChecklistBatch,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await checklist_service.batch_checklist(db, current_user.id, task_id, data)
+
+
 @router.patch("/checklist/{item_id}/toggle", response_model=ChecklistItemResponse)
 async def toggle_checklist_item(
     item_id: str,
@@ -65,3 +83,13 @@ async def reorder_checklist(
     current_user: User = Depends(get_current_user),
 ):
     return await checklist_service.reorder_checklist(db, current_user.id, task_id, data)
+
+
+@router.patch("/checklist/{item_id}/move", response_model=ChecklistItemResponse)
+async def move_checklist_item(
+    item_id: str,
+    data: ChecklistMove,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await checklist_service.move_checklist_item(db, current_user.id, item_id, data)
@@ -1,24 +1,33 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
-from app.core.dependencies import get_current_user
+from app.database import get_db, read_only
+from app.core.dependencies import get_current_user, get_current_user_id, etag
+from app.core.resource_versions import GOALS
 from app.models.user import User
-from app.schemas.goal import GoalCreate, GoalUpdate, GoalResponse, GoalDetailResponse, ActiveGoalSummary
+from app.schemas.goal import GoalCreate, GoalUpdate, GoalResponse, GoalDetailResponse, GoalTree, ActiveGoalSummary
+from app.core.pagination import set_next_cursor
+from app.core.fast_json import rows_response
 from app.services import goal_service
 
 router = APIRouter(prefix="/api/goals", tags=["Goals"])
 
 
-@router.get("", response_model=list[GoalResponse])
+@router.get("", response_model=list[GoalResponse], dependencies=[Depends(etag(GOALS))])
+@read_only
 async def list_goals(
+    response: Response,
     status: str | None = Query(None),
     category_id: str | None = Query(None),
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, deprecated=True, description="Not with cursor"),
     limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ):
-    return await goal_service.get_goals(db, current_user.id, status, category_id, skip, limit)
+    goals, next_cursor = await goal_service.get_goals(db, user_id, status, category_id, skip, limit, cursor)
+    set_next_cursor(response, next_cursor)
+    return rows_response(goals, response)
 
 
 @router.post("", response_model=GoalResponse, status_code=201)
@@ -30,12 +39,13 @@ async def create_goal(
     return await goal_service.create_goal(db, current_user.id, data)
 
 
-@router.get("/active", response_model=list[ActiveGoalSummary])
+@router.get("/active", response_model=list[ActiveGoalSummary], dependencies=[Depends(etag(GOALS))])
+@read_only
 async def list_active_goals(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ):
-    return await goal_service.get_active_goals_summary(db, current_user.id)
+    return await goal_service.get_active_goals_summary(db, user_id)
 
 
 @router.patch("/{goal_id}/toggle-active", response_model=GoalResponse)
@@ -47,13 +57,30 @@ async def toggle_active_goal(
     return await goal_service.toggle_goal_active(db, current_user.id, goal_id)
 
 
-@router.get("/{goal_id}", response_model=GoalDetailResponse)
+@router.get("/{goal_id}", response_model=GoalDetailResponse, dependencies=[Depends(etag(GOALS))])
+@read_only
 async def get_goal(
     goal_id: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
+):
+    return await goal_service.get_goal_by_id(db, user_id, goal_id)
+
+
+@router.get("/{goal_id}/tree", response_class=StreamingResponse, responses={200: {"model": GoalTree}})
+@read_only
+async def get_goal_tree(
+    goal_id: str,
+    include_notes: bool = Query(False),
+    tag: str | None = Depends(etag(GOALS)),
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
 ):
-    return await goal_service.get_goal_by_id(db, current_user.id, goal_id)
+    # Rows are loaded here, while the session is open; only serialization is streamed
+    tree = await goal_service.get_goal_tree(db, user_id, goal_id, include_notes)
+    return StreamingResponse(
+        goal_service.stream_goal_tree(tree), media_type="application/json", headers={"ETag": tag} if tag else None
+    )
 
 
 @router.patch("/{goal_id}", response_model=GoalResponse)
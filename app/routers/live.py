@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from app.database import read_only
+from app.core.dependencies import get_current_user_id
+from app.core import live
+
+router = APIRouter(prefix="/api/live", tags=["Live"])
+
+
+# Events: "progress" carries a list of {type, id, progress, status} with the
+# latest state of each task, milestone or goal that changed; "resync" means
+# deltas were dropped and the client should reload what it shows
+@router.get("/progress", response_class=StreamingResponse)
+@read_only
+async def progress_stream(user_id: str = Depends(get_current_user_id)):
+    # The request's session is closed before streaming starts, so an open
+    # stream holds no database connection
+    return StreamingResponse(
+        live.stream(user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,21 +1,29 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
-from app.core.dependencies import get_current_user
+from app.database import get_db, read_only
+from app.core.dependencies import get_current_user, get_current_user_id
 from app.models.user import User
-from app.schemas.milestone import MilestoneCreate, MilestoneUpdate, MilestoneReorder, MilestoneResponse
+from app.schemas.milestone import MilestoneCreate, MilestoneUpdate, MilestoneReorder, MilestoneMove, MilestoneResponse
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, set_next_cursor
+from app.core.fast_json import rows_response
 from app.services import milestone_service
 
 router = APIRouter(prefix="/api", tags=["Milestones"])
 
 
 @router.get("/goals/{goal_id}/milestones", response_model=list[MilestoneResponse])
+@read_only
 async def list_milestones(
     goal_id: str,
+    response: Response,
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ):
-    return await milestone_service.get_milestones(db, current_user.id, goal_id)
+    milestones, next_cursor = await milestone_service.get_milestones(db, user_id, goal_id, cursor, limit)
+    set_next_cursor(response, next_cursor)
+    return rows_response(milestones, response)
 
 
 @router.post("/goals/{goal_id}/milestones", response_model=MilestoneResponse, status_code=201)
@@ -56,3 +64,13 @@ async def reorder_milestones(
     current_user: User = Depends(get_current_user),
 ):
     return await milestone_service.reorder_milestones(db, current_user.id, goal_id, data)
+
+
+@router.patch("/milestones/{milestone_id}/move", response_model=MilestoneResponse)
+async def move_milestone(
+    milestone_id: str,
+    data: MilestoneMove,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await milestone_service.move_milestone(db, current_user.id, milestone_id, data)
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
-from app.core.dependencies import get_current_user
+from app.database import get_db, read_only
+from app.core.dependencies import get_current_user, get_current_user_id, etag
+from app.core.resource_versions import NOTIFICATIONS
 from app.models.user import User
+from app.core.pagination import set_next_cursor
 from app.services import notification_service
 
 router = APIRouter(prefix="/api/notifications", tags=["Notifications"])
@@ -13,14 +15,19 @@ class FCMTokenRequest(BaseModel):
     fcm_token: str
 
 
-@router.get("")
+@router.get("", dependencies=[Depends(etag(NOTIFICATIONS, clock=True))])
+@read_only
 async def list_notifications(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True, description="Not with cursor"),
     limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ):
-    return await notification_service.get_notifications(db, current_user.id, skip, limit)
+    notifications, next_cursor = await notification_service.get_notifications(db, user_id, skip, limit, cursor)
+    set_next_cursor(response, next_cursor)
+    return notifications
 
 
 @router.patch("/{notification_id}/read")
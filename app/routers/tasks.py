@@ -1,21 +1,29 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
-from app.core.dependencies import get_current_user
+from app.database import get_db, read_only
+from app.core.dependencies import get_current_user, get_current_user_id
 from app.models.user import User
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskNoteCreate, TaskNoteUpdate, TaskNoteResponse
+from app.schemas.task import TaskCreate, TaskBulkCreate, TaskUpdate, TaskResponse, TaskNoteCreate, TaskNoteUpdate, TaskNoteResponse
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, set_next_cursor
+from app.core.fast_json import rows_response
 from app.services import task_service
 
 router = APIRouter(prefix="/api", tags=["Tasks"])
 
 
 @router.get("/milestones/{milestone_id}/tasks", response_model=list[TaskResponse])
+@read_only
 async def list_tasks(
     milestone_id: str,
+    response: Response,
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ):
-    return await task_service.get_tasks(db, current_user.id, milestone_id)
+    tasks, next_cursor = await task_service.get_tasks(db, user_id, milestone_id, cursor, limit)
+    set_next_cursor(response, next_cursor)
+    return rows_response(tasks, response)
 
 
 @router.post("/milestones/{milestone_id}/tasks", response_model=TaskResponse, status_code=201)
@@ -28,6 +36,16 @@ async def create_task(
     return await task_service.create_task(db, current_user.id, milestone_id, data)
 
 
+@router.post("/milestones/{milestone_id}/tasks/bulk", response_model=list[TaskResponse], status_code=201)
+async def create_tasks(
+    milestone_id: str,
+    data: TaskBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await task_service.create_tasks(db, current_user.id, milestone_id, data)
+
+
 @router.patch("/tasks/{task_id}", response_model=TaskResponse)
 async def update_task(
     task_id: str,
@@ -50,12 +68,18 @@ async def delete_task(
 
 # --- Task Notes ---
 @router.get("/tasks/{task_id}/notes", response_model=list[TaskNoteResponse])
+@read_only
 async def list_task_notes(
     task_id: str,
+    response: Response,
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ):
-    return await task_service.get_task_notes(db, current_user.id, task_id)
+    notes, next_cursor = await task_service.get_task_notes(db, user_id, task_id, cursor, limit)
+    set_next_cursor(response, next_cursor)
+    return rows_response(notes, response)
 
 
 @router.post("/tasks/{task_id}/notes", response_model=TaskNoteResponse, status_code=201)
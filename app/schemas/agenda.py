@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from app.models.task import RepeatType
+from app.models.occurrence import OccurrenceStatus
+
+
+class AgendaItem(BaseModel):
+    task_id: str
+    milestone_id: str
+    title: str
+    repeat_type: RepeatType
+    # The slot: the task's due date, or the rule's time for this occurrence
+    occurs_at: datetime
+    # Where the occurrence actually sits; differs from occurs_at once moved
+    scheduled_at: datetime
+    status: str = Field(description="PENDING, IN_PROGRESS, COMPLETED, OVERDUE or SKIPPED")
+
+
+class OccurrenceUpdate(BaseModel):
+    occurs_at: datetime = Field(description="The occurrence's slot, as listed by the agenda")
+    status: OccurrenceStatus | None = None
+    scheduled_at: datetime | None = Field(None, description="Move the occurrence; null keeps it at its slot")
@@ -1,3 +1,4 @@
+from datetime import date
 from pydantic import BaseModel
 
 
@@ -17,3 +18,21 @@ class GoalProgressItem(BaseModel):
     title: str
     progress: float
     status: str
+
+
+class DailyCompletions(BaseModel):
+    date: date
+    tasks_completed: int
+    items_completed: int
+
+
+class Streak(BaseModel):
+    current_streak: int
+    longest_streak: int
+    last_active_date: date | None
+
+
+class WeeklyThroughput(BaseModel):
+    week_start: date
+    tasks_completed: int
+    items_completed: int
@@ -1,27 +1,69 @@
-from pydantic import BaseModel
+from typing import Annotated, Literal
+from pydantic import BaseModel, Field
 from datetime import datetime
+from app.schemas.common import POSITION
 
 
 class ChecklistItemCreate(BaseModel):
     title: str
-    order_index: int = 0
+    order_index: int = Field(0, description=POSITION)
 
 
 class ChecklistItemUpdate(BaseModel):
     title: str | None = None
-    order_index: int | None = None
+    order_index: int | None = Field(None, description=POSITION)
 
 
 class ChecklistReorder(BaseModel):
     ordered_ids: list[str]
 
 
+class ChecklistMove(BaseModel):
+    """Place the item right after `after_id` and/or before `before_id`; neither moves it to the end."""
+    after_id: str | None = None
+    before_id: str | None = None
+
+
+class ChecklistCreateOp(BaseModel):
+    op: Literal["create"]
+    title: str
+    order_index: int = Field(0, description=POSITION)
+
+
+class ChecklistToggleOp(BaseModel):
+    op: Literal["toggle"]
+    id: str
+
+
+class ChecklistUpdateOp(BaseModel):
+    op: Literal["update"]
+    id: str
+    title: str | None = None
+    order_index: int | None = Field(None, description=POSITION)
+
+
+class ChecklistDeleteOp(BaseModel):
+    op: Literal["delete"]
+    id: str
+
+
+ChecklistOperation = Annotated[
+    ChecklistCreateOp | ChecklistToggleOp | ChecklistUpdateOp | ChecklistDeleteOp,
+    Field(discriminator="op"),
+]
+
+
+class ChecklistBatch(BaseModel):
+    operations: list[ChecklistOperation] = Field(min_length=1, max_length=500)
+
+
 class ChecklistItemResponse(BaseModel):
     id: str
     task_id: str
     title: str
     is_completed: bool
     order_index: int
+    rank: str
     created_at: datetime
     updated_at: datetime
 
@@ -0,0 +1,14 @@
+from datetime import datetime, timezone
+from typing import Annotated
+from pydantic import AfterValidator
+
+
+def _as_utc(value: datetime) -> datetime:
+    # A time without an offset is taken as UTC, so it compares with aware times
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+UtcDatetime = Annotated[datetime, AfterValidator(_as_utc)]
+
+# Description of the order_index fields, see app.core.ranking.move_to
+POSITION = "Position among the siblings, 0 first. When sent, the row is moved there; otherwise a new row goes last."
@@ -67,4 +67,21 @@ class ActiveGoalSummary(BaseModel):
 
 # Avoid circular import
 from app.schemas.milestone import MilestoneResponse  # noqa: E402
+from app.schemas.task import TaskResponse, TaskNoteResponse  # noqa: E402
+from app.schemas.checklist import ChecklistItemResponse  # noqa: E402
 GoalDetailResponse.model_rebuild()
+
+
+# Shape of GET /api/goals/{id}/tree. The endpoint streams this JSON itself,
+# so these only document it.
+class TaskTree(TaskResponse):
+    checklist_items: list[ChecklistItemResponse] = []
+    notes: list[TaskNoteResponse] | None = None
+
+
+class MilestoneTree(MilestoneResponse):
+    tasks: list[TaskTree] = []
+
+
+class GoalTree(GoalResponse):
+    milestones: list[MilestoneTree] = []
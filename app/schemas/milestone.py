@@ -1,18 +1,19 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from app.models.milestone import MilestoneStatus
+from app.schemas.common import POSITION
 
 
 class MilestoneCreate(BaseModel):
     title: str
-    order_index: int = 0
+    order_index: int = Field(0, description=POSITION)
     start_date: datetime | None = None
     end_date: datetime | None = None
 
 
 class MilestoneUpdate(BaseModel):
     title: str | None = None
-    order_index: int | None = None
+    order_index: int | None = Field(None, description=POSITION)
     start_date: datetime | None = None
     end_date: datetime | None = None
 
@@ -21,11 +22,18 @@ class MilestoneReorder(BaseModel):
     ordered_ids: list[str]
 
 
+class MilestoneMove(BaseModel):
+    """Place the milestone right after `after_id` and/or before `before_id`; neither moves it to the end."""
+    after_id: str | None = None
+    before_id: str | None = None
+
+
 class MilestoneResponse(BaseModel):
     id: str
     goal_id: str
     title: str
     order_index: int
+    rank: str
     start_date: datetime | None
     end_date: datetime | None
     status: MilestoneStatus
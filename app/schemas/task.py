@@ -1,27 +1,32 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from app.models.task import TaskStatus, RepeatType
+from app.schemas.common import UtcDatetime
 
 
 class TaskCreate(BaseModel):
     title: str
     description: str | None = None
-    start_date: datetime | None = None
-    due_date: datetime | None = None
+    start_date: UtcDatetime | None = None
+    due_date: UtcDatetime | None = None
     estimated_time: int | None = None  # minutes
     repeat_type: RepeatType = RepeatType.NONE
-    reminder_at: datetime | None = None
+    reminder_at: UtcDatetime | None = None
+
+
+class TaskBulkCreate(BaseModel):
+    tasks: list[TaskCreate] = Field(min_length=1, max_length=200)
 
 
 class TaskUpdate(BaseModel):
     title: str | None = None
     description: str | None = None
-    start_date: datetime | None = None
-    due_date: datetime | None = None
+    start_date: UtcDatetime | None = None
+    due_date: UtcDatetime | None = None
     estimated_time: int | None = None
     status: TaskStatus | None = None
     repeat_type: RepeatType | None = None
-    reminder_at: datetime | None = None
+    reminder_at: UtcDatetime | None = None
 
 
 class TaskResponse(BaseModel):
@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_, or_, text
+from app.models.task import Task, TaskStatus, RepeatType, REPEATING_SQL
+from app.models.occurrence import TaskOccurrence, OccurrenceStatus
+from app.schemas.agenda import OccurrenceUpdate
+from app.core.ownership import get_owned_task
+from app.core import activity_log
+from app.core.recurrence import PERIODS, anchor, slots, is_slot
+
+MAX_WINDOW = timedelta(days=92)
+
+
+def _utc(value: datetime | None) -> datetime | None:
+    # Rules are computed in UTC; a time without an offset is taken as UTC
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def _status(scheduled_at: datetime, override: TaskOccurrence | None, now: datetime) -> str:
+    if override is not None and override.status is not None:
+        return override.status.value
+    return TaskStatus.OVERDUE.value if scheduled_at < now else TaskStatus.PENDING.value
+
+
+def _occurrence(series, occurs_at: datetime, override: TaskOccurrence | None, now: datetime) -> dict:
+    scheduled_at = override.scheduled_at if override is not None and override.scheduled_at else occurs_at
+    return {
+        "task_id": series.id,
+        "milestone_id": series.milestone_id,
+        "title": series.title,
+        "repeat_type": series.repeat_type,
+        "occurs_at": occurs_at,
+        "scheduled_at": scheduled_at,
+        "status": _status(scheduled_at, override, now),
+    }
+
+
+async def get_agenda(db: AsyncSession, user_id: str, start: datetime, end: datetime) -> list[dict]:
+    """One-off tasks due in [start, end) and the occurrences of repeating tasks scheduled in it."""
+    start, end = _utc(start), _utc(end)
+    if end <= start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end must be after start")
+    if end - start > MAX_WINDOW:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"The window can span at most {MAX_WINDOW.days} days"
+        )
+    now = datetime.now(timezone.utc)
+
+    one_off = await db.execute(
+        select(Task.id, Task.milestone_id, Task.title, Task.repeat_type, Task.due_date, Task.status).where(
+            Task.user_id == user_id,
+            Task.repeat_type == RepeatType.NONE,
+            Task.due_date >= start,
+            Task.due_date < end,
+        )
+    )
+    items = [
+        {
+            "task_id": task.id,
+            "milestone_id": task.milestone_id,
+            "title": task.title,
+            "repeat_type": task.repeat_type,
+            "occurs_at": task.due_date,
+            "scheduled_at": task.due_date,
+            "status": task.status.value,
+        }
+        for task in one_off
+    ]
+
+    # A completed series has ended
+    first = func.coalesce(Task.due_date, Task.start_date, Task.created_at)
+    result = await db.execute(
+        select(Task.id, Task.milestone_id, Task.title, Task.repeat_type, first.label("anchor")).where(
+            Task.user_id == user_id, text(REPEATING_SQL), Task.status != TaskStatus.COMPLETED, first < end
+        )
+    )
+    series = {row.id: row for row in result}
+    if not series:
+        return sorted(items, key=lambda item: (item["scheduled_at"], item["task_id"]))
+
+    # Overrides of occurrences whose slot or new time falls in the window
+    result = await db.execute(
+        select(TaskOccurrence).where(
+            TaskOccurrence.user_id == user_id,
+            or_(
+                and_(TaskOccurrence.occurs_at >= start, TaskOccurrence.occurs_at < end),
+                and_(TaskOccurrence.scheduled_at >= start, TaskOccurrence.scheduled_at < end),
+            ),
+        )
+    )
+    overrides = {}
+    for override in result.scalars():
+        row = series.get(override.task_id)
+        # Slots that no longer match a changed rule are stale
+        if row is not None and is_slot(row.anchor, PERIODS[row.repeat_type], override.occurs_at):
+            overrides[override.task_id, override.occurs_at] = override
+
+    for row in series.values():
+        for occurs_at in slots(row.anchor, PERIODS[row.repeat_type], start, end):
+            override = overrides.pop((row.id, occurs_at), None)
+            if override is None or override.scheduled_at is None or start <= override.scheduled_at < end:
+                items.append(_occurrence(row, occurs_at, override, now))
+    # Left over: occurrences moved into the window from outside it
+    for (task_id, occurs_at), override in overrides.items():
+        if override.scheduled_at is not None and start <= override.scheduled_at < end:
+            items.append(_occurrence(series[task_id], occurs_at, override, now))
+
+    return sorted(items, key=lambda item: (item["scheduled_at"], item["task_id"]))
+
+
+async def _get_occurrence_slot(db: AsyncSession, user_id: str, task_id: str, occurs_at: datetime) -> Task:
+    task = await get_owned_task(db, user_id, task_id)
+    if task.repeat_type == RepeatType.NONE:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Task does not repeat")
+    if not is_slot(anchor(task), PERIODS[task.repeat_type], occurs_at):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="occurs_at is not an occurrence of this task")
+    return task
+
+
+async def set_occurrence(db: AsyncSession, user_id: str, task_id: str, data: OccurrenceUpdate) -> dict:
+    data = data.model_copy(update={"occurs_at": _utc(data.occurs_at), "scheduled_at": _utc(data.scheduled_at)})
+    task = await _get_occurrence_slot(db, user_id, task_id, data.occurs_at)
+    override = await db.get(TaskOccurrence, (task_id, data.occurs_at))
+    before = override.status if override is not None else None
+    now = datetime.now(timezone.utc)
+
+    if data.status is None and data.scheduled_at is None:
+        # Back to what the rule says
+        if override is not None:
+            await db.delete(override)
+            override = None
+    else:
+        if override is None:
+            override = TaskOccurrence(task_id=task_id, occurs_at=data.occurs_at, user_id=user_id)
+            db.add(override)
+        if data.status != OccurrenceStatus.COMPLETED:
+            override.completed_at = None
+        elif before != OccurrenceStatus.COMPLETED:
+            override.completed_at = now
+        override.status = data.status
+        override.scheduled_at = data.scheduled_at
+
+    await db.flush()
+    # Completing an occurrence is activity, as completing a task is
+    activity_log.record_occurrence_status(db, user_id, task_id, before, data.status)
+    return _occurrence(task, data.occurs_at, override, now)
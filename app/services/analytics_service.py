@@ -1,81 +1,14 @@
+from datetime import date, datetime, timedelta, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from app.models.goal import Goal, GoalStatus
-from app.models.milestone import Milestone, MilestoneStatus
-from app.models.task import Task, TaskStatus
+from app.models.activity import DailyActivity
+from app.core import analytics_snapshot
 
 
 async def get_dashboard_overview(db: AsyncSession, user_id: str) -> dict:
-    total_goals = await db.scalar(
-        select(func.count()).where(Goal.user_id == user_id)
-    ) or 0
-
-    completed_goals = await db.scalar(
-        select(func.count()).where(Goal.user_id == user_id, Goal.status == GoalStatus.COMPLETED)
-    ) or 0
-
-    active_goals = await db.scalar(
-        select(func.count()).where(Goal.user_id == user_id, Goal.status == GoalStatus.ACTIVE)
-    ) or 0
-
-    # Get all goal IDs for this user
-    goal_ids_result = await db.execute(
-        select(Goal.id).where(Goal.user_id == user_id)
-    )
-    goal_ids = [r[0] for r in goal_ids_result.all()]
-
-    total_milestones = 0
-    completed_milestones = 0
-    total_tasks = 0
-    completed_tasks = 0
-    overdue_tasks = 0
-
-    if goal_ids:
-        total_milestones = await db.scalar(
-            select(func.count()).where(Milestone.goal_id.in_(goal_ids))
-        ) or 0
-
-        completed_milestones = await db.scalar(
-            select(func.count()).where(
-                Milestone.goal_id.in_(goal_ids),
-                Milestone.status == MilestoneStatus.COMPLETED,
-            )
-        ) or 0
-
-        milestone_ids_result = await db.execute(
-            select(Milestone.id).where(Milestone.goal_id.in_(goal_ids))
-        )
-        milestone_ids = [r[0] for r in milestone_ids_result.all()]
-
-        if milestone_ids:
-            total_tasks = await db.scalar(
-                select(func.count()).where(Task.milestone_id.in_(milestone_ids))
-            ) or 0
-
-            completed_tasks = await db.scalar(
-                select(func.count()).where(
-                    Task.milestone_id.in_(milestone_ids),
-                    Task.status == TaskStatus.COMPLETED,
-                )
-            ) or 0
-
-            overdue_tasks = await db.scalar(
-                select(func.count()).where(
-                    Task.milestone_id.in_(milestone_ids),
-                    Task.status == TaskStatus.OVERDUE,
-                )
-            ) or 0
-
-    return {
-        "total_goals": total_goals,
-        "completed_goals": completed_goals,
-        "active_goals": active_goals,
-        "total_milestones": total_milestones,
-        "completed_milestones": completed_milestones,
-        "total_tasks": total_tasks,
-        "completed_tasks": completed_tasks,
-        "overdue_tasks": overdue_tasks,
-    }
+    # Maintained on write; see app.core.analytics_snapshot
+    return await analytics_snapshot.get_snapshot(db, user_id)
 
 
 async def get_goal_progress_bars(db: AsyncSession, user_id: str) -> list[dict]:
@@ -94,3 +27,76 @@ async def get_goal_progress_bars(db: AsyncSession, user_id: str) -> list[dict]:
         }
         for g in goals
     ]
+
+
+# --- Activity (read from the daily_activity rollup, days are UTC) ---
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+async def get_completion_history(db: AsyncSession, user_id: str, days: int = 30, goal_id: str | None = None) -> list[dict]:
+    start = _today() - timedelta(days=days - 1)
+    query = (
+        select(
+            DailyActivity.day,
+            func.sum(DailyActivity.tasks_completed),
+            func.sum(DailyActivity.items_completed),
+        )
+        .where(DailyActivity.user_id == user_id, DailyActivity.day >= start)
+        .group_by(DailyActivity.day)
+    )
+    if goal_id:
+        query = query.where(DailyActivity.goal_id == goal_id)
+
+    result = await db.execute(query)
+    counts = {day: (tasks, items) for day, tasks, items in result.all()}
+
+    history = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        tasks, items = counts.get(day, (0, 0))
+        history.append({"date": day, "tasks_completed": tasks, "items_completed": items})
+    return history
+
+
+async def get_streak(db: AsyncSession, user_id: str) -> dict:
+    result = await db.execute(
+        select(DailyActivity.day)
+        .where(DailyActivity.user_id == user_id)
+        .group_by(DailyActivity.day)
+        .having(func.sum(DailyActivity.tasks_completed + DailyActivity.items_completed) > 0)
+        .order_by(DailyActivity.day)
+    )
+    active_days = list(result.scalars().all())
+
+    longest = run = 0
+    previous = None
+    for day in active_days:
+        run = run + 1 if previous == day - timedelta(days=1) else 1
+        longest = max(longest, run)
+        previous = day
+
+    # A streak is still alive until a full day passes without activity
+    current = run if previous is not None and previous >= _today() - timedelta(days=1) else 0
+    return {"current_streak": current, "longest_streak": longest, "last_active_date": previous}
+
+
+async def get_weekly_throughput(db: AsyncSession, user_id: str, weeks: int = 8) -> list[dict]:
+    today = _today()
+    first_week = today - timedelta(days=today.weekday(), weeks=weeks - 1)
+    week = func.date_trunc("week", DailyActivity.day)
+    result = await db.execute(
+        select(week, func.sum(DailyActivity.tasks_completed), func.sum(DailyActivity.items_completed))
+        .where(DailyActivity.user_id == user_id, DailyActivity.day >= first_week)
+        .group_by(week)
+    )
+    counts = {week_start.date(): (tasks, items) for week_start, tasks, items in result.all()}
+
+    throughput = []
+    for offset in range(weeks):
+        week_start = first_week + timedelta(weeks=offset)
+        tasks, items = counts.get(week_start, (0, 0))
+        throughput.append({"week_start": week_start, "tasks_completed": tasks, "items_completed": items})
+    return throughput
@@ -1,78 +1,78 @@
+import uuid
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Row, select, insert, update, delete
 from fastapi import HTTPException, status
 from app.models.checklist import ChecklistItem
-from app.models.task import Task
-from app.models.milestone import Milestone
-from app.models.goal import Goal
-from app.schemas.checklist import ChecklistItemCreate, ChecklistItemUpdate, ChecklistReorder
-from app.core.progress_engine import recalculate_task_progress
-
-
-async def _verify_task_ownership(db: AsyncSession, user_id: str, task_id: str) -> Task:
-    result = await db.execute(select(Task).where(Task.id == task_id))
-    task = result.scalar_one_or_none()
-    if not task:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-
-    ms_result = await db.execute(select(Milestone).where(Milestone.id == task.milestone_id))
-    milestone = ms_result.scalar_one_or_none()
-    if not milestone:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-
-    goal_result = await db.execute(select(Goal).where(Goal.id == milestone.goal_id, Goal.user_id == user_id))
-    if not goal_result.scalar_one_or_none():
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-
-    return task
+from app.schemas.checklist import (
+    ChecklistItemCreate,
+    ChecklistItemUpdate,
+    ChecklistReorder,
+    ChecklistMove,
+    ChecklistBatch,
+    ChecklistCreateOp,
+    ChecklistToggleOp,
+    ChecklistUpdateOp,
+    ChecklistItemResponse,
+)
+from app.core.ownership import get_owned_task, get_owned_checklist_item
+from app.core.progress_engine import mark_checklist_changed
+from app.core import activity_log, ranking
+from app.core.pagination import DEFAULT_PAGE_SIZE, paginate
+from app.core.fast_json import columns
 
 
 async def create_checklist_item(db: AsyncSession, user_id: str, task_id: str, data: ChecklistItemCreate) -> ChecklistItem:
-    await _verify_task_ownership(db, user_id, task_id)
+    await get_owned_task(db, user_id, task_id)
 
-    item = ChecklistItem(task_id=task_id, **data.model_dump())
+    [rank] = await ranking.append_ranks(db, ChecklistItem, ChecklistItem.task_id, task_id)
+    item = ChecklistItem(task_id=task_id, user_id=user_id, rank=rank, **data.model_dump())
     db.add(item)
     await db.flush()
-    await recalculate_task_progress(db, task_id)
+    if "order_index" in data.model_fields_set:
+        await ranking.move_to(db, ChecklistItem, ChecklistItem.task_id, item, data.order_index, "Checklist item not found")
+        await db.flush()
+    mark_checklist_changed(db, task_id, total_delta=1)
     await db.refresh(item)
     return item
 
 
-async def get_checklist_items(db: AsyncSession, user_id: str, task_id: str) -> list[ChecklistItem]:
-    await _verify_task_ownership(db, user_id, task_id)
+async def get_checklist_items(
+    db: AsyncSession, user_id: str, task_id: str, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+) -> tuple[list[Row], str | None]:
+    await get_owned_task(db, user_id, task_id)
 
-    result = await db.execute(
-        select(ChecklistItem).where(ChecklistItem.task_id == task_id).order_by(ChecklistItem.order_index)
-    )
-    return list(result.scalars().all())
+    query = select(*columns(ChecklistItem, ChecklistItemResponse)).where(ChecklistItem.task_id == task_id)
+    return await paginate(db, query, [ChecklistItem.rank, ChecklistItem.id], cursor, limit)
 
 
 async def toggle_checklist_item(db: AsyncSession, user_id: str, item_id: str) -> ChecklistItem:
-    result = await db.execute(select(ChecklistItem).where(ChecklistItem.id == item_id))
+    # Flip in the database: concurrent toggles each see the other's result
+    result = await db.execute(
+        update(ChecklistItem)
+        .where(ChecklistItem.id == item_id, ChecklistItem.user_id == user_id)
+        .values(is_completed=~ChecklistItem.is_completed)
+        .returning(ChecklistItem),
+        execution_options={"populate_existing": True},
+    )
     item = result.scalar_one_or_none()
     if not item:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Checklist item not found")
 
-    await _verify_task_ownership(db, user_id, item.task_id)
-
-    item.is_completed = not item.is_completed
-    await db.flush()
-    await recalculate_task_progress(db, item.task_id)
-    await db.refresh(item)
+    mark_checklist_changed(db, item.task_id, completed_delta=1 if item.is_completed else -1)
+    activity_log.record_checklist_toggle(db, user_id, item.task_id, item.id, item.is_completed)
     return item
 
 
 async def update_checklist_item(db: AsyncSession, user_id: str, item_id: str, data: ChecklistItemUpdate) -> ChecklistItem:
-    result = await db.execute(select(ChecklistItem).where(ChecklistItem.id == item_id))
-    item = result.scalar_one_or_none()
-    if not item:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Checklist item not found")
-
-    await _verify_task_ownership(db, user_id, item.task_id)
+    item = await get_owned_checklist_item(db, user_id, item_id)
 
     update_data = data.model_dump(exclude_unset=True)
+    position = update_data.pop("order_index", None)
     for key, value in update_data.items():
         setattr(item, key, value)
+    if position is not None:
+        item.order_index = position
+        await ranking.move_to(db, ChecklistItem, ChecklistItem.task_id, item, position, "Checklist item not found")
 
     await db.flush()
     await db.refresh(item)
@@ -80,33 +80,124 @@ async def update_checklist_item(db: AsyncSession, user_id: str, item_id: str, da
 
 
 async def delete_checklist_item(db: AsyncSession, user_id: str, item_id: str) -> None:
-    result = await db.execute(select(ChecklistItem).where(ChecklistItem.id == item_id))
-    item = result.scalar_one_or_none()
-    if not item:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Checklist item not found")
-
+    item = await get_owned_checklist_item(db, user_id, item_id, for_update=True)
     task_id = item.task_id
-    await _verify_task_ownership(db, user_id, task_id)
+    was_completed = item.is_completed
 
     await db.delete(item)
     await db.flush()
-    await recalculate_task_progress(db, task_id)
+    mark_checklist_changed(db, task_id, total_delta=-1, completed_delta=-1 if was_completed else 0)
 
 
 async def reorder_checklist(db: AsyncSession, user_id: str, task_id: str, data: ChecklistReorder) -> list[ChecklistItem]:
-    await _verify_task_ownership(db, user_id, task_id)
+    await get_owned_task(db, user_id, task_id)
+
+    await ranking.reorder(db, ChecklistItem, ChecklistItem.task_id, task_id, data.ordered_ids)
+
+    result = await db.execute(
+        select(ChecklistItem)
+        .where(ChecklistItem.task_id == task_id)
+        .order_by(ChecklistItem.rank)
+        .execution_options(populate_existing=True)
+    )
+    return list(result.scalars().all())
+
 
-    for index, item_id in enumerate(data.ordered_ids):
+async def move_checklist_item(db: AsyncSession, user_id: str, item_id: str, data: ChecklistMove) -> ChecklistItem:
+    item = await get_owned_checklist_item(db, user_id, item_id)
+
+    await ranking.move(db, ChecklistItem, ChecklistItem.task_id, item, data.after_id, data.before_id, "Checklist item not found")
+    await db.flush()
+    await db.refresh(item)
+    return item
+
+
+async def batch_checklist(db: AsyncSession, user_id: str, task_id: str, data: ChecklistBatch) -> list[ChecklistItem]:
+    """Apply mixed operations in order, folded into one statement per kind."""
+    await get_owned_task(db, user_id, task_id)
+
+    creates, flips, updates, deletes = [], set(), {}, set()
+    # Every id named by an operation, even one whose toggles cancel out
+    referenced = set()
+    # (item ID, order_index) of the items to move, in the order given
+    positions = []
+    for op in data.operations:
+        if isinstance(op, ChecklistCreateOp):
+            item_id = str(uuid.uuid4())
+            creates.append(
+                {"id": item_id, "task_id": task_id, "user_id": user_id, "title": op.title, "order_index": op.order_index}
+            )
+            if "order_index" in op.model_fields_set:
+                positions.append((item_id, op.order_index))
+            continue
+        referenced.add(op.id)
+        if isinstance(op, ChecklistToggleOp):
+            flips ^= {op.id}
+        elif isinstance(op, ChecklistUpdateOp):
+            changes = op.model_dump(exclude_unset=True, exclude={"op", "id"})
+            if changes.get("order_index") is not None:
+                positions.append((op.id, op.order_index))
+            else:
+                changes.pop("order_index", None)
+            updates.setdefault(op.id, {}).update(changes)
+        else:
+            deletes.add(op.id)
+
+    completed_before = {}
+    if referenced:
         result = await db.execute(
-            select(ChecklistItem).where(ChecklistItem.id == item_id, ChecklistItem.task_id == task_id)
+            select(ChecklistItem.id, ChecklistItem.is_completed)
+            .where(ChecklistItem.id.in_(referenced), ChecklistItem.task_id == task_id)
+            .with_for_update()
         )
-        item = result.scalar_one_or_none()
-        if item:
-            item.order_index = index
+        completed_before = dict(result.all())
+        if len(completed_before) != len(referenced):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Checklist item not found")
 
-    await db.flush()
+    flips -= deletes
+    updates = {item_id: values for item_id, values in updates.items() if values and item_id not in deletes}
+
+    if deletes:
+        await db.execute(
+            delete(ChecklistItem).where(ChecklistItem.id.in_(deletes)).execution_options(synchronize_session=False)
+        )
+    if flips:
+        await db.execute(
+            update(ChecklistItem)
+            .where(ChecklistItem.id.in_(flips))
+            .values(is_completed=~ChecklistItem.is_completed)
+            .execution_options(synchronize_session=False)
+        )
+    if updates:
+        await db.execute(
+            update(ChecklistItem).execution_options(synchronize_session=False),
+            [{"id": item_id, **values} for item_id, values in updates.items()],
+        )
+    if creates:
+        ranks = await ranking.append_ranks(db, ChecklistItem, ChecklistItem.task_id, task_id, len(creates))
+        for values, rank in zip(creates, ranks):
+            values["rank"] = rank
+        await db.execute(insert(ChecklistItem), creates)
+    # Moves go last, so positions count the batch's own creates and deletes
+    positions = [(item_id, position) for item_id, position in positions if item_id not in deletes]
+    if positions:
+        result = await db.execute(select(ChecklistItem).where(ChecklistItem.id.in_({item_id for item_id, _ in positions})))
+        moved = {item.id: item for item in result.scalars()}
+        for item_id, position in positions:
+            item = moved[item_id]
+            await ranking.move_to(db, ChecklistItem, ChecklistItem.task_id, item, position, "Checklist item not found")
+        await db.flush()
+
+    completed_delta = sum(-1 if completed_before[item_id] else 1 for item_id in flips)
+    completed_delta -= sum(completed_before[item_id] for item_id in deletes)
+    mark_checklist_changed(db, task_id, total_delta=len(creates) - len(deletes), completed_delta=completed_delta)
+    for item_id in flips:
+        activity_log.record_checklist_toggle(db, user_id, task_id, item_id, not completed_before[item_id])
 
     result = await db.execute(
-        select(ChecklistItem).where(ChecklistItem.task_id == task_id).order_by(ChecklistItem.order_index)
+        select(ChecklistItem)
+        .where(ChecklistItem.task_id == task_id)
+        .order_by(ChecklistItem.rank)
+        .execution_options(populate_existing=True)
     )
     return list(result.scalars().all())
@@ -1,10 +1,21 @@
+from collections import defaultdict
+from collections.abc import AsyncIterator
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Row, select
 from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
 from app.models.goal import Goal, GoalStatus
 from app.models.milestone import Milestone
-from app.schemas.goal import GoalCreate, GoalUpdate
+from app.models.task import Task, TaskNote
+from app.models.checklist import ChecklistItem
+from app.schemas.goal import GoalCreate, GoalUpdate, GoalResponse
+from app.schemas.milestone import MilestoneResponse
+from app.schemas.task import TaskResponse, TaskNoteResponse
+from app.schemas.checklist import ChecklistItemResponse
+from app.core.ownership import get_owned_goal
+from app.core import analytics_snapshot
+from app.core.pagination import paginate
+from app.core.fast_json import columns, dumps
 
 
 async def create_goal(db: AsyncSession, user_id: str, data: GoalCreate) -> Goal:
@@ -17,6 +28,7 @@ async def create_goal(db: AsyncSession, user_id: str, data: GoalCreate) -> Goal:
     db.add(goal)
     await db.flush()
     await db.refresh(goal)
+    analytics_snapshot.mark_goal(db, user_id, after=goal.status)
     return goal
 
 
@@ -27,17 +39,16 @@ async def get_goals(
     category_id: str | None = None,
     skip: int = 0,
     limit: int = 20,
-) -> list[Goal]:
-    query = select(Goal).where(Goal.user_id == user_id)
+    cursor: str | None = None,
+) -> tuple[list[Row], str | None]:
+    query = select(*columns(Goal, GoalResponse)).where(Goal.user_id == user_id)
 
     if status_filter:
         query = query.where(Goal.status == status_filter)
     if category_id:
         query = query.where(Goal.category_id == category_id)
 
-    query = query.order_by(Goal.created_at.desc()).offset(skip).limit(limit)
-    result = await db.execute(query)
-    return list(result.scalars().all())
+    return await paginate(db, query, [Goal.created_at, Goal.id], cursor, limit, descending=True, skip=skip)
 
 
 async def get_goal_by_id(db: AsyncSession, user_id: str, goal_id: str) -> Goal:
@@ -52,14 +63,90 @@ async def get_goal_by_id(db: AsyncSession, user_id: str, goal_id: str) -> Goal:
     return goal
 
 
-async def update_goal(db: AsyncSession, user_id: str, goal_id: str, data: GoalUpdate) -> Goal:
+async def get_goal_tree(db: AsyncSession, user_id: str, goal_id: str, include_notes: bool = False) -> dict:
+    """Load a goal with its milestones, tasks, checklist items and optionally notes.
+
+    One query per level however big the tree is; children are grouped by parent ID.
+    """
     result = await db.execute(
-        select(Goal).where(Goal.id == goal_id, Goal.user_id == user_id)
+        select(*columns(Goal, GoalResponse)).where(Goal.id == goal_id, Goal.user_id == user_id)
     )
-    goal = result.scalar_one_or_none()
+    goal = result.one_or_none()
     if not goal:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Goal not found")
 
+    result = await db.execute(
+        select(*columns(Milestone, MilestoneResponse))
+        .where(Milestone.goal_id == goal_id)
+        .order_by(Milestone.rank, Milestone.id)
+    )
+    milestones = result.all()
+
+    tasks = defaultdict(list)
+    result = await db.execute(
+        select(*columns(Task, TaskResponse))
+        .join(Milestone, Milestone.id == Task.milestone_id)
+        .where(Milestone.goal_id == goal_id)
+        .order_by(Task.created_at, Task.id)
+    )
+    for row in result:
+        tasks[row.milestone_id].append(row)
+
+    items = defaultdict(list)
+    result = await db.execute(
+        select(*columns(ChecklistItem, ChecklistItemResponse))
+        .join(Task, Task.id == ChecklistItem.task_id)
+        .join(Milestone, Milestone.id == Task.milestone_id)
+        .where(Milestone.goal_id == goal_id)
+        .order_by(ChecklistItem.rank, ChecklistItem.id)
+    )
+    for row in result:
+        items[row.task_id].append(row)
+
+    notes = None
+    if include_notes:
+        notes = defaultdict(list)
+        result = await db.execute(
+            select(*columns(TaskNote, TaskNoteResponse))
+            .join(Task, Task.id == TaskNote.task_id)
+            .join(Milestone, Milestone.id == Task.milestone_id)
+            .where(Milestone.goal_id == goal_id)
+            .order_by(TaskNote.created_at.desc(), TaskNote.id.desc())
+        )
+        for row in result:
+            notes[row.task_id].append(row)
+
+    return {"goal": goal, "milestones": milestones, "tasks": tasks, "items": items, "notes": notes}
+
+
+def _open(row: Row) -> bytes:
+    # The node's JSON without its closing brace, so children can follow
+    return dumps(row._asdict())[:-1]
+
+
+def _array(rows) -> bytes:
+    return dumps([row._asdict() for row in rows])
+
+
+async def stream_goal_tree(tree: dict) -> AsyncIterator[bytes]:
+    """Serialize a tree from get_goal_tree() one task at a time."""
+    yield _open(tree["goal"]) + b',"milestones":['
+    for m, milestone in enumerate(tree["milestones"]):
+        yield (b"," if m else b"") + _open(milestone) + b',"tasks":['
+        for t, task in enumerate(tree["tasks"].get(milestone.id, ())):
+            chunk = (b"," if t else b"") + _open(task)
+            chunk += b',"checklist_items":' + _array(tree["items"].get(task.id, ()))
+            if tree["notes"] is not None:
+                chunk += b',"notes":' + _array(tree["notes"].get(task.id, ()))
+            yield chunk + b"}"
+        yield b"]}"
+    yield b"]}"
+
+
+async def update_goal(db: AsyncSession, user_id: str, goal_id: str, data: GoalUpdate) -> Goal:
+    goal = await get_owned_goal(db, user_id, goal_id, for_update=True)
+    before = goal.status
+
     update_data = data.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(goal, key, value)
@@ -68,29 +155,22 @@ async def update_goal(db: AsyncSession, user_id: str, goal_id: str, data: GoalUp
         goal.is_active = False
 
     await db.flush()
+    analytics_snapshot.mark_goal(db, user_id, before, goal.status)
     await db.refresh(goal)
     return goal
 
 
 async def delete_goal(db: AsyncSession, user_id: str, goal_id: str) -> None:
-    result = await db.execute(
-        select(Goal).where(Goal.id == goal_id, Goal.user_id == user_id)
-    )
-    goal = result.scalar_one_or_none()
-    if not goal:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Goal not found")
+    goal = await get_owned_goal(db, user_id, goal_id)
 
     await db.delete(goal)
     await db.flush()
+    # Milestones and tasks go with it
+    analytics_snapshot.mark_recount(db, user_id)
 
 
 async def toggle_goal_active(db: AsyncSession, user_id: str, goal_id: str) -> Goal:
-    result = await db.execute(
-        select(Goal).where(Goal.id == goal_id, Goal.user_id == user_id)
-    )
-    goal = result.scalar_one_or_none()
-    if not goal:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Goal not found")
+    goal = await get_owned_goal(db, user_id, goal_id, for_update=True)
 
     if not goal.is_active and goal.status in {GoalStatus.COMPLETED, GoalStatus.ARCHIVED}:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Goal cannot be activated")
@@ -102,41 +182,52 @@ async def toggle_goal_active(db: AsyncSession, user_id: str, goal_id: str) -> Go
 
 
 async def get_active_goals_summary(db: AsyncSession, user_id: str) -> list[dict]:
+    """IDs, titles and counts for the active goals, from two column-only queries.
+
+    Both come back in display order, so the nesting is built in one pass.
+    """
     result = await db.execute(
-        select(Goal)
+        select(Goal.id, Goal.title, Goal.description, Goal.is_active)
         .where(Goal.user_id == user_id, Goal.is_active.is_(True))
-        .options(selectinload(Goal.milestones).selectinload(Milestone.tasks))
-        .order_by(Goal.created_at.desc())
+        .order_by(Goal.created_at.desc(), Goal.id)
     )
-    goals = result.scalars().all()
-
-    summaries: list[dict] = []
-    for goal in goals:
-        milestones = sorted(goal.milestones, key=lambda m: m.order_index)
-        milestone_summaries = []
-        for milestone in milestones:
-            tasks = sorted(milestone.tasks, key=lambda t: t.created_at)
-            task_summaries = [
-                {"task_id": task.id, "title": task.title}
-                for task in tasks
-            ]
-            milestone_summaries.append(
-                {
-                    "milestone_id": milestone.id,
-                    "title": milestone.title,
-                    "task_count": len(tasks),
-                    "tasks": task_summaries,
-                }
-            )
-        summaries.append(
-            {
-                "goal_id": goal.id,
-                "title": goal.title,
-                "description": goal.description,
-                "is_active": goal.is_active,
-                "milestone_count": len(milestones),
-                "milestones": milestone_summaries,
-            }
+    summaries = [
+        {
+            "goal_id": goal.id,
+            "title": goal.title,
+            "description": goal.description,
+            "is_active": goal.is_active,
+            "milestone_count": 0,
+            "milestones": [],
+        }
+        for goal in result
+    ]
+    if not summaries:
+        return summaries
+
+    goals = {summary["goal_id"]: summary for summary in summaries}
+    result = await db.execute(
+        select(
+            Milestone.goal_id,
+            Milestone.id.label("milestone_id"),
+            Milestone.title.label("milestone_title"),
+            Task.id.label("task_id"),
+            Task.title.label("task_title"),
         )
+        .outerjoin(Task, Task.milestone_id == Milestone.id)
+        .where(Milestone.user_id == user_id, Milestone.goal_id.in_(goals))
+        .order_by(Milestone.goal_id, Milestone.rank, Milestone.id, Task.created_at, Task.id)
+    )
+
+    milestone = None
+    for row in result:
+        if milestone is None or milestone["milestone_id"] != row.milestone_id:
+            milestone = {"milestone_id": row.milestone_id, "title": row.milestone_title, "task_count": 0, "tasks": []}
+            goal = goals[row.goal_id]
+            goal["milestones"].append(milestone)
+            goal["milestone_count"] += 1
+        if row.task_id is not None:
+            milestone["tasks"].append({"task_id": row.task_id, "title": row.task_title})
+            milestone["task_count"] += 1
 
     return summaries
@@ -1,51 +1,49 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from fastapi import HTTPException, status
+from sqlalchemy import Row, select
 from app.models.milestone import Milestone
-from app.models.goal import Goal
-from app.schemas.milestone import MilestoneCreate, MilestoneUpdate, MilestoneReorder
-from app.core.progress_engine import recalculate_goal_progress
-
-
-async def _verify_goal_ownership(db: AsyncSession, user_id: str, goal_id: str) -> Goal:
-    result = await db.execute(select(Goal).where(Goal.id == goal_id, Goal.user_id == user_id))
-    goal = result.scalar_one_or_none()
-    if not goal:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Goal not found")
-    return goal
+from app.schemas.milestone import MilestoneCreate, MilestoneUpdate, MilestoneReorder, MilestoneMove, MilestoneResponse
+from app.core.ownership import get_owned_goal, get_owned_milestone
+from app.core import analytics_snapshot, ranking
+from app.core.pagination import DEFAULT_PAGE_SIZE, paginate
+from app.core.fast_json import columns
+from app.core.progress_engine import mark_milestone_changed, milestone_share
 
 
 async def create_milestone(db: AsyncSession, user_id: str, goal_id: str, data: MilestoneCreate) -> Milestone:
-    await _verify_goal_ownership(db, user_id, goal_id)
+    await get_owned_goal(db, user_id, goal_id)
 
-    milestone = Milestone(goal_id=goal_id, **data.model_dump())
+    [rank] = await ranking.append_ranks(db, Milestone, Milestone.goal_id, goal_id)
+    milestone = Milestone(goal_id=goal_id, user_id=user_id, rank=rank, **data.model_dump())
     db.add(milestone)
     await db.flush()
+    if "order_index" in data.model_fields_set:
+        await ranking.move_to(db, Milestone, Milestone.goal_id, milestone, data.order_index, "Milestone not found")
+        await db.flush()
     await db.refresh(milestone)
+    mark_milestone_changed(db, goal_id, after=milestone_share(milestone))
+    analytics_snapshot.mark_milestone(db, user_id, after=milestone.status)
     return milestone
 
 
-async def get_milestones(db: AsyncSession, user_id: str, goal_id: str) -> list[Milestone]:
-    await _verify_goal_ownership(db, user_id, goal_id)
+async def get_milestones(
+    db: AsyncSession, user_id: str, goal_id: str, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+) -> tuple[list[Row], str | None]:
+    await get_owned_goal(db, user_id, goal_id)
 
-    result = await db.execute(
-        select(Milestone).where(Milestone.goal_id == goal_id).order_by(Milestone.order_index)
-    )
-    return list(result.scalars().all())
+    query = select(*columns(Milestone, MilestoneResponse)).where(Milestone.goal_id == goal_id)
+    return await paginate(db, query, [Milestone.rank, Milestone.id], cursor, limit)
 
 
 async def update_milestone(db: AsyncSession, user_id: str, milestone_id: str, data: MilestoneUpdate) -> Milestone:
-    result = await db.execute(select(Milestone).where(Milestone.id == milestone_id))
-    milestone = result.scalar_one_or_none()
-    if not milestone:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Milestone not found")
-
-    # Verify ownership
-    await _verify_goal_ownership(db, user_id, milestone.goal_id)
+    milestone = await get_owned_milestone(db, user_id, milestone_id)
 
     update_data = data.model_dump(exclude_unset=True)
+    position = update_data.pop("order_index", None)
     for key, value in update_data.items():
         setattr(milestone, key, value)
+    if position is not None:
+        milestone.order_index = position
+        await ranking.move_to(db, Milestone, Milestone.goal_id, milestone, position, "Milestone not found")
 
     await db.flush()
     await db.refresh(milestone)
@@ -53,31 +51,35 @@ async def update_milestone(db: AsyncSession, user_id: str, milestone_id: str, da
 
 
 async def delete_milestone(db: AsyncSession, user_id: str, milestone_id: str) -> None:
-    result = await db.execute(select(Milestone).where(Milestone.id == milestone_id))
-    milestone = result.scalar_one_or_none()
-    if not milestone:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Milestone not found")
-
+    milestone = await get_owned_milestone(db, user_id, milestone_id, for_update=True)
     goal_id = milestone.goal_id
-    await _verify_goal_ownership(db, user_id, goal_id)
+    before = milestone_share(milestone)
 
     await db.delete(milestone)
     await db.flush()
-    await recalculate_goal_progress(db, goal_id)
+    mark_milestone_changed(db, goal_id, before=before)
+    # Its tasks go with it
+    analytics_snapshot.mark_recount(db, user_id)
 
 
 async def reorder_milestones(db: AsyncSession, user_id: str, goal_id: str, data: MilestoneReorder) -> list[Milestone]:
-    await _verify_goal_ownership(db, user_id, goal_id)
+    await get_owned_goal(db, user_id, goal_id)
 
-    for index, milestone_id in enumerate(data.ordered_ids):
-        result = await db.execute(select(Milestone).where(Milestone.id == milestone_id, Milestone.goal_id == goal_id))
-        milestone = result.scalar_one_or_none()
-        if milestone:
-            milestone.order_index = index
-
-    await db.flush()
+    await ranking.reorder(db, Milestone, Milestone.goal_id, goal_id, data.ordered_ids)
 
     result = await db.execute(
-        select(Milestone).where(Milestone.goal_id == goal_id).order_by(Milestone.order_index)
+        select(Milestone)
+        .where(Milestone.goal_id == goal_id)
+        .order_by(Milestone.rank)
+        .execution_options(populate_existing=True)
     )
     return list(result.scalars().all())
+
+
+async def move_milestone(db: AsyncSession, user_id: str, milestone_id: str, data: MilestoneMove) -> Milestone:
+    milestone = await get_owned_milestone(db, user_id, milestone_id)
+
+    await ranking.move(db, Milestone, Milestone.goal_id, milestone, data.after_id, data.before_id, "Milestone not found")
+    await db.flush()
+    await db.refresh(milestone)
+    return milestone
@@ -1,19 +1,23 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, or_
 from fastapi import HTTPException, status
 from app.models.notification import Notification
 from app.models.user import User
+from app.core.principal_cache import invalidate_user
+from app.core.pagination import paginate
 
 
-async def get_notifications(db: AsyncSession, user_id: str, skip: int = 0, limit: int = 20) -> list[Notification]:
-    result = await db.execute(
-        select(Notification)
-        .where(Notification.user_id == user_id)
-        .order_by(Notification.created_at.desc())
-        .offset(skip)
-        .limit(limit)
+async def get_notifications(
+    db: AsyncSession, user_id: str, skip: int = 0, limit: int = 20, cursor: str | None = None
+) -> tuple[list[Notification], str | None]:
+    # Reminders are created ahead of time (app.core.reminders); list them once due
+    query = select(Notification).where(
+        Notification.user_id == user_id,
+        or_(Notification.trigger_at.is_(None), Notification.trigger_at <= func.now()),
+    )
+    return await paginate(
+        db, query, [Notification.created_at, Notification.id], cursor, limit, descending=True, skip=skip
     )
-    return list(result.scalars().all())
 
 
 async def mark_as_read(db: AsyncSession, user_id: str, notification_id: str) -> Notification:
@@ -36,3 +40,4 @@ async def register_fcm_token(db: AsyncSession, user_id: str, fcm_token: str) ->
     if user:
         user.fcm_token = fcm_token
         await db.flush()
+    invalidate_user(db, user_id)
@@ -1,58 +1,59 @@
+from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from fastapi import HTTPException, status
+from sqlalchemy import Row, select, insert
 from app.models.task import Task, TaskNote, TaskStatus
-from app.models.milestone import Milestone
-from app.models.goal import Goal
-from app.schemas.task import TaskCreate, TaskUpdate, TaskNoteCreate, TaskNoteUpdate
-from app.core.progress_engine import recalculate_milestone_progress
-
-
-async def _verify_milestone_ownership(db: AsyncSession, user_id: str, milestone_id: str) -> Milestone:
-    result = await db.execute(select(Milestone).where(Milestone.id == milestone_id))
-    milestone = result.scalar_one_or_none()
-    if not milestone:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Milestone not found")
-
-    goal_result = await db.execute(select(Goal).where(Goal.id == milestone.goal_id, Goal.user_id == user_id))
-    if not goal_result.scalar_one_or_none():
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Milestone not found")
-
-    return milestone
-
-
-async def _verify_task_ownership(db: AsyncSession, user_id: str, task_id: str) -> Task:
-    result = await db.execute(select(Task).where(Task.id == task_id))
-    task = result.scalar_one_or_none()
-    if not task:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-
-    await _verify_milestone_ownership(db, user_id, task.milestone_id)
-    return task
+from app.schemas.task import TaskCreate, TaskBulkCreate, TaskUpdate, TaskResponse, TaskNoteCreate, TaskNoteUpdate, TaskNoteResponse
+from app.core.ownership import get_owned_milestone, get_owned_task, get_owned_note
+from app.core import analytics_snapshot, activity_log, reminders, live
+from app.core.progress_engine import mark_task_changed, task_share
+from app.core.pagination import DEFAULT_PAGE_SIZE, paginate
+from app.core.fast_json import columns
 
 
 async def create_task(db: AsyncSession, user_id: str, milestone_id: str, data: TaskCreate) -> Task:
-    await _verify_milestone_ownership(db, user_id, milestone_id)
+    await get_owned_milestone(db, user_id, milestone_id)
 
-    task = Task(milestone_id=milestone_id, **data.model_dump())
+    task = Task(milestone_id=milestone_id, user_id=user_id, **data.model_dump())
     db.add(task)
     await db.flush()
     await db.refresh(task)
-    await recalculate_milestone_progress(db, milestone_id)
+    mark_task_changed(db, milestone_id, after=task_share(task))
+    analytics_snapshot.mark_task(db, user_id, after=task.status)
+    await reminders.schedule(db, [task])
     return task
 
 
-async def get_tasks(db: AsyncSession, user_id: str, milestone_id: str) -> list[Task]:
-    await _verify_milestone_ownership(db, user_id, milestone_id)
+async def create_tasks(db: AsyncSession, user_id: str, milestone_id: str, data: TaskBulkCreate) -> list[Task]:
+    await get_owned_milestone(db, user_id, milestone_id)
 
-    result = await db.execute(
-        select(Task).where(Task.milestone_id == milestone_id).order_by(Task.created_at)
+    rows = [{"milestone_id": milestone_id, "user_id": user_id, **item.model_dump()} for item in data.tasks]
+    # render_nulls keeps rows with different None fields in one multi-row INSERT
+    result = await db.scalars(
+        insert(Task).returning(Task, sort_by_parameter_order=True).execution_options(render_nulls=True), rows
     )
-    return list(result.scalars().all())
+    tasks = list(result.all())
+
+    # Deltas add up on the session, so the milestone and goal are updated once
+    for task in tasks:
+        mark_task_changed(db, milestone_id, after=task_share(task))
+        analytics_snapshot.mark_task(db, user_id, after=task.status)
+    await reminders.schedule(db, tasks)
+    return tasks
+
+
+async def get_tasks(
+    db: AsyncSession, user_id: str, milestone_id: str, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+) -> tuple[list[Row], str | None]:
+    await get_owned_milestone(db, user_id, milestone_id)
+
+    query = select(*columns(Task, TaskResponse)).where(Task.milestone_id == milestone_id)
+    return await paginate(db, query, [Task.created_at, Task.id], cursor, limit)
 
 
 async def update_task(db: AsyncSession, user_id: str, task_id: str, data: TaskUpdate) -> Task:
-    task = await _verify_task_ownership(db, user_id, task_id)
+    task = await get_owned_task(db, user_id, task_id, for_update=True)
+    before = task_share(task)
+    before_progress, before_status = task.progress, task.status
 
     update_data = data.model_dump(exclude_unset=True)
 
@@ -65,48 +66,62 @@ async def update_task(db: AsyncSession, user_id: str, task_id: str, data: TaskUp
     for key, value in update_data.items():
         setattr(task, key, value)
 
+    # Overdue is set by the sweeper (app.jobs.overdue); moving the due date
+    # out of the past reopens the task
+    if (
+        task.status == TaskStatus.OVERDUE
+        and "due_date" in update_data
+        and "status" not in update_data
+        and (task.due_date is None or task.due_date > datetime.now(timezone.utc))
+    ):
+        task.status = TaskStatus.IN_PROGRESS if task.checklist_completed else TaskStatus.PENDING
+
     await db.flush()
-    await recalculate_milestone_progress(db, task.milestone_id)
+    if "reminder_at" in update_data:
+        await reminders.reschedule(db, task)
+    mark_task_changed(db, task.milestone_id, before=before, after=task_share(task))
+    analytics_snapshot.mark_task(db, user_id, before_status, task.status)
+    activity_log.record_task_status(db, user_id, task.id, before_status, task.status)
+    if (task.progress, task.status) != (before_progress, before_status):
+        live.record(db, user_id, live.TASK, task.id, task.progress, task.status)
     await db.refresh(task)
     return task
 
 
 async def delete_task(db: AsyncSession, user_id: str, task_id: str) -> None:
-    task = await _verify_task_ownership(db, user_id, task_id)
+    task = await get_owned_task(db, user_id, task_id, for_update=True)
     milestone_id = task.milestone_id
+    before = task_share(task)
+    before_status = task.status
 
     await db.delete(task)
     await db.flush()
-    await recalculate_milestone_progress(db, milestone_id)
+    mark_task_changed(db, milestone_id, before=before)
+    analytics_snapshot.mark_task(db, user_id, before=before_status)
 
 
 # --- Task Notes ---
 async def create_task_note(db: AsyncSession, user_id: str, task_id: str, data: TaskNoteCreate) -> TaskNote:
-    await _verify_task_ownership(db, user_id, task_id)
+    await get_owned_task(db, user_id, task_id)
 
-    note = TaskNote(task_id=task_id, content=data.content)
+    note = TaskNote(task_id=task_id, user_id=user_id, content=data.content)
     db.add(note)
     await db.flush()
     await db.refresh(note)
     return note
 
 
-async def get_task_notes(db: AsyncSession, user_id: str, task_id: str) -> list[TaskNote]:
-    await _verify_task_ownership(db, user_id, task_id)
+async def get_task_notes(
+    db: AsyncSession, user_id: str, task_id: str, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+) -> tuple[list[Row], str | None]:
+    await get_owned_task(db, user_id, task_id)
 
-    result = await db.execute(
-        select(TaskNote).where(TaskNote.task_id == task_id).order_by(TaskNote.created_at.desc())
-    )
-    return list(result.scalars().all())
+    query = select(*columns(TaskNote, TaskNoteResponse)).where(TaskNote.task_id == task_id)
+    return await paginate(db, query, [TaskNote.created_at, TaskNote.id], cursor, limit, descending=True)
 
 
 async def update_task_note(db: AsyncSession, user_id: str, note_id: str, data: TaskNoteUpdate) -> TaskNote:
-    result = await db.execute(select(TaskNote).where(TaskNote.id == note_id))
-    note = result.scalar_one_or_none()
-    if not note:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Note not found")
-
-    await _verify_task_ownership(db, user_id, note.task_id)
+    note = await get_owned_note(db, user_id, note_id)
     note.content = data.content
     await db.flush()
     await db.refresh(note)
@@ -114,11 +129,6 @@ async def update_task_note(db: AsyncSession, user_id: str, note_id: str, data: T
 
 
 async def delete_task_note(db: AsyncSession, user_id: str, note_id: str) -> None:
-    result = await db.execute(select(TaskNote).where(TaskNote.id == note_id))
-    note = result.scalar_one_or_none()
-    if not note:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Note not found")
-
-    await _verify_task_ownership(db, user_id, note.task_id)
+    note = await get_owned_note(db, user_id, note_id)
     await db.delete(note)
     await db.flush()
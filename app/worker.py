@@ -0,0 +1,125 @@
+"""Background job worker.
+
+Usage:
+    python -m app.worker [--once]
+
+Runs up to JOB_CONCURRENCY jobs at a time from the jobs table (see
+app.core.job_queue) and polls every JOB_POLL_SECONDS while the queue is idle.
+Any number of workers can run against the same database. On SIGTERM the
+worker stops claiming and waits for its running jobs to finish.
+
+A handler runs in its own session, which the worker flushes like a request
+session (progress, analytics, resource versions) and commits together with the
+job's completion. Background work is not user activity, so the activity log is
+left to handlers that want it.
+"""
+import argparse
+import asyncio
+import logging
+import signal
+import traceback
+
+from app.config import get_settings
+from app.database import async_session
+from app.core import job_queue
+from app.core.progress_engine import flush_progress
+from app.core.analytics_snapshot import flush_analytics
+from app.core.resource_versions import flush_versions
+
+# Import all models so relationships resolve outside the API process
+from app.models.user import User  # noqa: F401
+from app.models.category import Category  # noqa: F401
+from app.models.goal import Goal  # noqa: F401
+from app.models.milestone import Milestone  # noqa: F401
+from app.models.task import Task, TaskNote  # noqa: F401
+from app.models.occurrence import TaskOccurrence  # noqa: F401
+from app.models.checklist import ChecklistItem  # noqa: F401
+from app.models.notification import Notification  # noqa: F401
+from app.models.analytics import UserAnalytics  # noqa: F401
+from app.models.activity import ActivityEvent, DailyActivity  # noqa: F401
+from app.models.resource_version import ResourceVersion  # noqa: F401
+from app.models.job import Job  # noqa: F401
+
+settings = get_settings()
+logger = logging.getLogger("app.worker")
+
+
+async def run_job(claimed: job_queue.ClaimedJob) -> None:
+    handler = job_queue.REGISTRY.get(claimed.name)
+    try:
+        if handler is None:
+            raise LookupError(f"No job handler named {claimed.name!r}")
+        async with async_session() as db:
+            # Give up before the lease runs out and another worker claims it
+            async with asyncio.timeout(claimed.timeout_seconds):
+                await handler.run(db, **claimed.payload)
+                await flush_progress(db)
+                await flush_analytics(db)
+                await flush_versions(db)
+                if not await job_queue.complete(db, claimed):
+                    await db.rollback()
+                    logger.warning("%s %s: lease lost, result discarded", claimed.name, claimed.id)
+                    return
+                await db.commit()
+        logger.info("%s %s: done (attempt %d)", claimed.name, claimed.id, claimed.attempts)
+    except Exception as exc:
+        logger.exception("%s %s: attempt %d failed", claimed.name, claimed.id, claimed.attempts)
+        error = "".join(traceback.format_exception_only(exc)).strip()
+        async with async_session() as db:
+            if await job_queue.fail(db, claimed, error):
+                await db.commit()
+
+
+async def run(once: bool) -> int:
+    job_queue.load_handlers()
+    async with async_session() as db:
+        await job_queue.schedule_periodic(db)
+        await db.commit()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    stopping = asyncio.ensure_future(stop.wait())
+
+    running: set[asyncio.Task] = set()
+    while not stop.is_set():
+        free = settings.JOB_CONCURRENCY - len(running)
+        claimed = []
+        if free:
+            try:
+                async with async_session() as db:
+                    claimed = await job_queue.claim(db, free)
+                    await db.commit()
+            except Exception:
+                logger.exception("claiming jobs failed")
+        for job in claimed:
+            task = asyncio.create_task(run_job(job))
+            running.add(task)
+            task.add_done_callback(running.discard)
+
+        if once and not claimed and not running:
+            break
+        # With every slot busy, wait for one to free up; otherwise the queue
+        # is drained, so poll again after a while
+        timeout = None if len(running) >= settings.JOB_CONCURRENCY else settings.JOB_POLL_SECONDS
+        await asyncio.wait({stopping, *running}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+    stopping.cancel()
+    if running:
+        logger.info("waiting for %d running jobs", len(running))
+        await asyncio.gather(*running)
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.worker")
+    parser.add_argument("--once", action="store_true", help="Run every job that is due, then exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if settings.DEBUG else logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    return asyncio.run(run(args.once))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
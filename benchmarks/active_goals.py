@@ -0,0 +1,99 @@
+"""Active goals summary: ORM hydration vs. the column projection.
+
+Usage:
+    python -m benchmarks.active_goals [--goals 6 --milestones 10 --tasks 200] [--budget-ms 150]
+
+Every third seeded goal is active. Reports latency and peak Python memory of
+both versions and checks that they return the same summaries.
+"""
+import asyncio
+import tracemalloc
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.database import async_session
+from app.models.goal import Goal
+from app.models.milestone import Milestone
+from app.services import goal_service
+from benchmarks.common import parser, seed_user, drop_user, measure, report
+
+
+async def orm_summary(db, user_id: str) -> list[dict]:
+    """The summary as it was built before, from fully loaded Goal/Milestone/Task objects."""
+    result = await db.execute(
+        select(Goal)
+        .where(Goal.user_id == user_id, Goal.is_active.is_(True))
+        .options(selectinload(Goal.milestones).selectinload(Milestone.tasks))
+        .order_by(Goal.created_at.desc(), Goal.id)
+    )
+    summaries = []
+    for goal in result.scalars().all():
+        milestones = sorted(goal.milestones, key=lambda m: (m.rank, m.id))
+        milestone_summaries = []
+        for milestone in milestones:
+            tasks = sorted(milestone.tasks, key=lambda t: (t.created_at, t.id))
+            milestone_summaries.append({
+                "milestone_id": milestone.id,
+                "title": milestone.title,
+                "task_count": len(tasks),
+                "tasks": [{"task_id": task.id, "title": task.title} for task in tasks],
+            })
+        summaries.append({
+            "goal_id": goal.id,
+            "title": goal.title,
+            "description": goal.description,
+            "is_active": goal.is_active,
+            "milestone_count": len(milestones),
+            "milestones": milestone_summaries,
+        })
+    return summaries
+
+
+async def peak_memory(db, call) -> int:
+    db.expunge_all()
+    tracemalloc.start()
+    try:
+        await call()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+async def main() -> int:
+    cli = parser(__doc__.splitlines()[0], budget_ms=150)
+    cli.set_defaults(goals=6, milestones=10, tasks=200)
+    args = cli.parse_args()
+    user_id = await seed_user(args.goals, args.milestones, args.tasks)
+
+    orm = lambda: orm_summary(db, user_id)  # noqa: E731
+    projection = lambda: goal_service.get_active_goals_summary(db, user_id)  # noqa: E731
+    try:
+        async with async_session() as db:
+            expected, actual = await orm(), await projection()
+            if expected != actual:
+                print("projection differs from the ORM version")
+                return 1
+            tasks = sum(m["task_count"] for goal in actual for m in goal["milestones"])
+            print(f"{len(actual)} active goals, {tasks} tasks, identical output")
+
+            for name, call in (("ORM", orm), ("projection", projection)):
+                print(f"{name:<12} peak memory {await peak_memory(db, call) / 1024:8.0f} KiB")
+
+            orm_samples = await measure(lambda: _fresh(db, orm), args.iterations)
+            projection_samples = await measure(lambda: _fresh(db, projection), args.iterations)
+    finally:
+        await drop_user(user_id)
+
+    report("selectinload ORM summary", orm_samples)
+    return 0 if report("get_active_goals_summary", projection_samples, args.budget_ms) else 1
+
+
+async def _fresh(db, call):
+    # A request starts with an empty identity map
+    db.expunge_all()
+    return await call()
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
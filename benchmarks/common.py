@@ -0,0 +1,121 @@
+"""Shared helpers for the benchmark scripts.
+
+Each benchmark seeds a throwaway user into DATABASE_URL, times the code under
+test and deletes the user again (everything below it cascades).
+"""
+import argparse
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert
+
+from app.database import async_session
+from app.core.analytics_snapshot import rebuild_analytics
+from app.core.ranking import spread_keys
+
+# Import all models so relationships resolve outside the API process
+from app.models.user import User
+from app.models.category import Category  # noqa: F401
+from app.models.goal import Goal, GoalStatus
+from app.models.milestone import Milestone, MilestoneStatus
+from app.models.task import Task, TaskNote, TaskStatus  # noqa: F401
+from app.models.occurrence import TaskOccurrence  # noqa: F401
+from app.models.checklist import ChecklistItem
+from app.models.notification import Notification  # noqa: F401
+from app.models.analytics import UserAnalytics  # noqa: F401
+from app.models.activity import ActivityEvent, DailyActivity  # noqa: F401
+from app.models.resource_version import ResourceVersion  # noqa: F401
+from app.models.job import Job  # noqa: F401
+
+
+def parser(description: str, budget_ms: float) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--goals", type=int, default=20)
+    parser.add_argument("--milestones", type=int, default=5, help="Milestones per goal")
+    parser.add_argument("--tasks", type=int, default=50, help="Tasks per milestone")
+    parser.add_argument("--checklist", type=int, default=0, help="Checklist items per task")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--budget-ms", type=float, default=budget_ms, help="Fail if p95 exceeds this")
+    return parser
+
+
+async def seed_user(goals: int, milestones: int, tasks: int, checklist: int = 0) -> str:
+    """Insert a user with goals x milestones x tasks (x checklist items) and return its ID."""
+    user_id = str(uuid.uuid4())
+    now = datetime.now(timezone.utc)
+    goal_rows, milestone_rows, task_rows, item_rows = [], [], [], []
+    milestone_ranks, item_ranks = spread_keys(milestones), spread_keys(checklist)
+
+    for g in range(goals):
+        goal_id = str(uuid.uuid4())
+        goal_rows.append({
+            "id": goal_id, "user_id": user_id, "title": f"Goal {g}",
+            "status": GoalStatus.COMPLETED if g % 5 == 0 else GoalStatus.ACTIVE,
+            "is_active": g % 3 == 0,
+        })
+        for m in range(milestones):
+            milestone_id = str(uuid.uuid4())
+            milestone_rows.append({
+                "id": milestone_id, "goal_id": goal_id, "user_id": user_id, "title": f"Milestone {m}",
+                "order_index": m, "rank": milestone_ranks[m],
+                "status": MilestoneStatus.COMPLETED if m % 4 == 0 else MilestoneStatus.ACTIVE,
+            })
+            for t in range(tasks):
+                task_id = str(uuid.uuid4())
+                task_rows.append({
+                    "id": task_id, "milestone_id": milestone_id, "user_id": user_id, "title": f"Task {t}",
+                    "status": list(TaskStatus)[t % len(TaskStatus)],
+                    "due_date": now + timedelta(days=t - tasks // 2),
+                    "estimated_time": 30 if t % 2 else None,
+                })
+                for i in range(checklist):
+                    item_rows.append({
+                        "id": str(uuid.uuid4()), "task_id": task_id, "user_id": user_id,
+                        "title": f"Item {i}", "is_completed": i % 2 == 0,
+                        "order_index": i, "rank": item_ranks[i],
+                    })
+
+    async with async_session() as db:
+        await db.execute(insert(User).values(
+            id=user_id, email=f"bench-{user_id}@example.com", password="x", name="Benchmark"
+        ))
+        for model, rows in ((Goal, goal_rows), (Milestone, milestone_rows), (Task, task_rows), (ChecklistItem, item_rows)):
+            if rows:
+                await db.execute(insert(model), rows)
+        await rebuild_analytics(db, [user_id])
+        await db.commit()
+
+    return user_id
+
+
+async def drop_user(user_id: str) -> None:
+    async with async_session() as db:
+        await db.execute(delete(User).where(User.id == user_id))
+        await db.commit()
+
+
+async def measure(fn, iterations: int) -> list[float]:
+    """Run `fn` once to warm up, then `iterations` times; returns milliseconds per call."""
+    await fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name: str, samples: list[float], budget_ms: float | None = None) -> bool:
+    """Print a summary line; returns False when p95 is over budget."""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    line = f"{name:<32} p50 {statistics.median(ordered):8.2f} ms   p95 {p95:8.2f} ms   n={len(ordered)}"
+    if budget_ms is None:
+        print(line)
+        return True
+
+    within = p95 <= budget_ms
+    print(f"{line}   budget {budget_ms:.0f} ms {'OK' if within else 'EXCEEDED'}")
+    return within
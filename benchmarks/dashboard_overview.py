@@ -0,0 +1,37 @@
+"""Response-time budget for the dashboard overview aggregation.
+
+Usage:
+    python -m benchmarks.dashboard_overview [--goals 20 --milestones 5 --tasks 50] [--budget-ms 25]
+"""
+import asyncio
+
+from sqlalchemy import event
+
+from app.database import async_session, engine
+from app.services import analytics_service
+from benchmarks.common import parser, seed_user, drop_user, measure, report
+
+
+async def main() -> int:
+    args = parser(__doc__.splitlines()[0], budget_ms=25).parse_args()
+    user_id = await seed_user(args.goals, args.milestones, args.tasks)
+    print(f"{args.goals * args.milestones * args.tasks} tasks across {args.goals * args.milestones} milestones")
+
+    statements = []
+    listener = lambda *_: statements.append(1)  # noqa: E731
+    try:
+        async with async_session() as db:
+            event.listen(engine.sync_engine, "before_cursor_execute", listener)
+            await analytics_service.get_dashboard_overview(db, user_id)
+            event.remove(engine.sync_engine, "before_cursor_execute", listener)
+            print(f"statements per call: {len(statements)}")
+
+            samples = await measure(lambda: analytics_service.get_dashboard_overview(db, user_id), args.iterations)
+    finally:
+        await drop_user(user_id)
+
+    return 0 if report("get_dashboard_overview", samples, args.budget_ms) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -0,0 +1,75 @@
+"""Response serialization: response_model validation vs. the fast row path.
+
+Usage:
+    python -m benchmarks.serialization [--tasks 500 --checklist 0] [--budget-ms 15]
+
+Times loading and encoding one milestone's task list both ways and checks
+that they produce the same bytes.
+"""
+import asyncio
+import json
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app.database import async_session
+from app.core.fast_json import columns, dumps
+from app.models.milestone import Milestone
+from app.models.task import Task
+from app.schemas.task import TaskResponse
+from benchmarks.common import parser, seed_user, drop_user, measure, report
+
+adapter = TypeAdapter(list[TaskResponse])
+
+
+async def response_model_path(db, milestone_id: str) -> bytes:
+    # What FastAPI does for a response_model: validate the ORM objects, dump
+    # them to JSON-compatible Python, then JSONResponse encodes with json.dumps
+    result = await db.execute(
+        select(Task).where(Task.milestone_id == milestone_id).order_by(Task.created_at, Task.id)
+    )
+    content = adapter.validate_python(result.scalars().all(), from_attributes=True)
+    payload = adapter.dump_python(content, mode="json")
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+async def fast_path(db, milestone_id: str) -> bytes:
+    # The query task_service.get_tasks() runs, minus its ownership check
+    result = await db.execute(
+        select(*columns(Task, TaskResponse)).where(Task.milestone_id == milestone_id).order_by(Task.created_at, Task.id)
+    )
+    return dumps([row._asdict() for row in result])
+
+
+async def main() -> int:
+    cli = parser(__doc__.splitlines()[0], budget_ms=15)
+    cli.set_defaults(goals=1, milestones=1, tasks=500)
+    args = cli.parse_args()
+    user_id = await seed_user(args.goals, args.milestones, args.tasks, args.checklist)
+
+    try:
+        async with async_session() as db:
+            milestone_id = await db.scalar(select(Milestone.id).where(Milestone.user_id == user_id).limit(1))
+            slow, fast = await response_model_path(db, milestone_id), await fast_path(db, milestone_id)
+            if slow != fast:
+                print("fast path output differs from the response_model path")
+                return 1
+            print(f"{args.tasks} tasks, {len(fast)} bytes, identical output")
+
+            slow_samples = await measure(lambda: _fresh(db, response_model_path(db, milestone_id)), args.iterations)
+            fast_samples = await measure(lambda: _fresh(db, fast_path(db, milestone_id)), args.iterations)
+    finally:
+        await drop_user(user_id)
+
+    report("response_model + json.dumps", slow_samples)
+    return 0 if report("columns + fast_json.dumps", fast_samples, args.budget_ms) else 1
+
+
+async def _fresh(db, call):
+    # A request starts with an empty identity map
+    db.expunge_all()
+    return await call
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
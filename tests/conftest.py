@@ -0,0 +1,47 @@
+# Tests run against the database in DATABASE_URL, migrated to head (make migrate)
+import uuid
+
+import httpx
+import pytest
+
+from app.main import app
+from app.database import engine, replica_engine
+
+
+@pytest.fixture(autouse=True)
+async def _fresh_pool():
+    # Each test runs in its own event loop; pooled connections cannot outlive it
+    yield
+    await engine.dispose()
+    await replica_engine.dispose()
+
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+async def register(client: httpx.AsyncClient) -> dict:
+    """Register a new user; returns their auth headers."""
+    response = await client.post(
+        "/api/auth/register",
+        json={"email": f"test-{uuid.uuid4().hex[:12]}@example.com", "password": "password", "name": "Test"},
+    )
+    assert response.status_code == 201, response.text
+    return {"Authorization": f"Bearer {response.json()['tokens']['access_token']}"}
+
+
+@pytest.fixture
+async def auth(client) -> dict:
+    """Headers of a freshly registered user."""
+    return await register(client)
+
+
+@pytest.fixture
+async def milestone(client, auth) -> dict:
+    """A milestone in a new goal of the `auth` user."""
+    goal = (await client.post("/api/goals", json={"title": "Goal"}, headers=auth)).json()
+    response = await client.post(f"/api/goals/{goal['id']}/milestones", json={"title": "Milestone"}, headers=auth)
+    assert response.status_code == 201, response.text
+    return response.json()
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app.core.recurrence import is_slot, slots
+from app.database import async_session
+from app.models.activity import ActivityEvent
+
+DAY = timedelta(days=1)
+FIRST = datetime(2026, 11, 2, 9, 0, tzinfo=timezone.utc)
+
+
+def test_window_is_half_open():
+    # A slot exactly at start is in, one exactly at end is out
+    assert slots(FIRST, DAY, FIRST + DAY, FIRST + 3 * DAY) == [FIRST + DAY, FIRST + 2 * DAY]
+    assert slots(FIRST, DAY, FIRST + DAY + timedelta(seconds=1), FIRST + 3 * DAY) == [FIRST + 2 * DAY]
+    assert slots(FIRST, DAY, FIRST, FIRST + timedelta(seconds=1)) == [FIRST]
+
+
+def test_series_starts_at_its_anchor():
+    assert slots(FIRST, DAY, FIRST - 5 * DAY, FIRST + DAY) == [FIRST]
+    assert slots(FIRST, DAY, FIRST - 5 * DAY, FIRST) == []
+
+
+def test_is_slot():
+    assert is_slot(FIRST, DAY, FIRST)
+    assert is_slot(FIRST, DAY, FIRST + 40 * DAY)
+    assert not is_slot(FIRST, DAY, FIRST - DAY)
+    assert not is_slot(FIRST, DAY, FIRST + DAY + timedelta(microseconds=1))
+
+
+async def _series(client, auth, milestone) -> dict:
+    response = await client.post(
+        f"/api/milestones/{milestone['id']}/tasks",
+        json={"title": "Daily", "repeat_type": "DAILY", "due_date": FIRST.isoformat()},
+        headers=auth,
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+async def _agenda(client, auth, start: datetime, end: datetime) -> list[tuple]:
+    response = await client.get(
+        "/api/agenda", params={"start": start.isoformat(), "end": end.isoformat()}, headers=auth
+    )
+    assert response.status_code == 200, response.text
+    return [
+        (datetime.fromisoformat(item["occurs_at"]), datetime.fromisoformat(item["scheduled_at"]), item["status"])
+        for item in response.json()
+    ]
+
+
+async def test_moved_occurrences_follow_their_new_time(client, auth, milestone):
+    task = await _series(client, auth, milestone)
+    url = f"/api/tasks/{task['id']}/occurrences"
+    week = (FIRST + 7 * DAY, FIRST + 10 * DAY)
+
+    # Into the window from before it, and out of it to after it
+    into = {"occurs_at": FIRST.isoformat(), "scheduled_at": (FIRST + 8 * DAY + timedelta(hours=3)).isoformat()}
+    out = {"occurs_at": (FIRST + 7 * DAY).isoformat(), "scheduled_at": (FIRST + 20 * DAY).isoformat()}
+    for body in (into, out):
+        assert (await client.put(url, json=body, headers=auth)).status_code == 200
+
+    assert [(occurs_at, scheduled_at) for occurs_at, scheduled_at, _ in await _agenda(client, auth, *week)] == [
+        (FIRST + 8 * DAY, FIRST + 8 * DAY),
+        (FIRST, FIRST + 8 * DAY + timedelta(hours=3)),
+        (FIRST + 9 * DAY, FIRST + 9 * DAY),
+    ]
+    # The moved-out occurrence is listed where it went, next to the regular slot there
+    later = await _agenda(client, auth, FIRST + 20 * DAY, FIRST + 21 * DAY)
+    assert [occurs_at for occurs_at, _, _ in later] == [FIRST + 20 * DAY, FIRST + 7 * DAY]
+
+
+async def test_overrides_at_the_window_edges(client, auth, milestone):
+    task = await _series(client, auth, milestone)
+    url = f"/api/tasks/{task['id']}/occurrences"
+    start, end = FIRST + 3 * DAY, FIRST + 5 * DAY
+
+    for occurs_at in (start, end):
+        body = {"occurs_at": occurs_at.isoformat(), "status": "COMPLETED"}
+        assert (await client.put(url, json=body, headers=auth)).status_code == 200
+
+    assert await _agenda(client, auth, start, end) == [
+        (start, start, "COMPLETED"),
+        (start + DAY, start + DAY, "OVERDUE" if start + DAY < datetime.now(timezone.utc) else "PENDING"),
+    ]
+    # Not a slot of the rule
+    body = {"occurs_at": (start + timedelta(hours=1)).isoformat(), "status": "COMPLETED"}
+    assert (await client.put(url, json=body, headers=auth)).status_code == 400
+
+
+async def test_skips_are_logged_as_skips(client, auth, milestone):
+    task = await _series(client, auth, milestone)
+    url = f"/api/tasks/{task['id']}/occurrences"
+    occurs_at = (FIRST + DAY).isoformat()
+
+    for status in ("SKIPPED", "COMPLETED", "SKIPPED", None):
+        body = {"occurs_at": occurs_at, "status": status}
+        assert (await client.put(url, json=body, headers=auth)).status_code == 200
+
+    async with async_session() as db:
+        result = await db.execute(
+            select(ActivityEvent.type).where(ActivityEvent.task_id == task["id"]).order_by(ActivityEvent.occurred_at)
+        )
+        assert [activity.value for activity in result.scalars()] == [
+            "OCCURRENCE_SKIPPED", "TASK_COMPLETED", "OCCURRENCE_SKIPPED",
+        ]
+
+    response = await client.get("/api/analytics/completions", headers=auth)
+    assert sum(day["tasks_completed"] for day in response.json()) == 1
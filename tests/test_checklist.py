@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from tests.conftest import register
+
+
+async def test_concurrent_toggles_keep_counters_exact(client, auth):
+    goal = (await client.post("/api/goals", json={"title": "G"}, headers=auth)).json()
+    milestone = (await client.post(f"/api/goals/{goal['id']}/milestones", json={"title": "M"}, headers=auth)).json()
+    task = (await client.post(f"/api/milestones/{milestone['id']}/tasks", json={"title": "T"}, headers=auth)).json()
+    items = [
+        (await client.post(f"/api/tasks/{task['id']}/checklist", json={"title": f"item {i}"}, headers=auth)).json()
+        for i in range(2)
+    ]
+
+    # An odd number of toggles leaves the first item completed
+    responses = await asyncio.gather(
+        *(client.patch(f"/api/checklist/{items[0]['id']}/toggle", headers=auth) for _ in range(7))
+    )
+    assert all(response.status_code == 200 for response in responses)
+    assert sorted(response.json()["is_completed"] for response in responses) == [False] * 3 + [True] * 4
+
+    tasks = (await client.get(f"/api/milestones/{milestone['id']}/tasks", headers=auth)).json()
+    assert tasks[0]["progress"] == 50.0
+
+
+async def _task_with_items(client, auth, milestone, count):
+    task = (await client.post(f"/api/milestones/{milestone['id']}/tasks", json={"title": "T"}, headers=auth)).json()
+    items = [
+        (await client.post(f"/api/tasks/{task['id']}/checklist", json={"title": f"item {i}"}, headers=auth)).json()
+        for i in range(count)
+    ]
+    return task, items
+
+
+async def test_batch_applies_mixed_operations(client, auth, milestone):
+    task, items = await _task_with_items(client, auth, milestone, 3)
+
+    response = await client.post(
+        f"/api/tasks/{task['id']}/checklist/batch",
+        json={
+            "operations": [
+                {"op": "toggle", "id": items[0]["id"]},
+                {"op": "update", "id": items[1]["id"], "title": "renamed"},
+                {"op": "toggle", "id": items[2]["id"]},
+                {"op": "delete", "id": items[2]["id"]},
+                {"op": "create", "title": "new"},
+            ]
+        },
+        headers=auth,
+    )
+    assert response.status_code == 200, response.text
+    assert [(item["title"], item["is_completed"]) for item in response.json()] == [
+        ("item 0", True),
+        ("renamed", False),
+        ("new", False),
+    ]
+
+    tasks = (await client.get(f"/api/milestones/{milestone['id']}/tasks", headers=auth)).json()
+    assert tasks[0]["progress"] == pytest.approx(100 / 3)
+
+
+async def test_batch_rejects_another_users_item(client, auth, milestone):
+    task, _ = await _task_with_items(client, auth, milestone, 1)
+    other_auth = await register(client)
+    other_goal = (await client.post("/api/goals", json={"title": "G"}, headers=other_auth)).json()
+    other_milestone = (
+        await client.post(f"/api/goals/{other_goal['id']}/milestones", json={"title": "M"}, headers=other_auth)
+    ).json()
+    other_task, foreign = await _task_with_items(client, other_auth, other_milestone, 1)
+
+    response = await client.post(
+        f"/api/tasks/{task['id']}/checklist/batch",
+        json={"operations": [{"op": "toggle", "id": foreign[0]["id"]}]},
+        headers=auth,
+    )
+    assert response.status_code == 404
+    items = (await client.get(f"/api/tasks/{other_task['id']}/checklist", headers=other_auth)).json()
+    assert items[0]["is_completed"] is False
+
+
+async def test_batch_checks_items_whose_toggles_cancel_out(client, auth, milestone):
+    task, items = await _task_with_items(client, auth, milestone, 1)
+
+    for item_id in (items[0]["id"], "00000000-0000-0000-0000-000000000000"):
+        response = await client.post(
+            f"/api/tasks/{task['id']}/checklist/batch",
+            json={"operations": [{"op": "toggle", "id": item_id}, {"op": "toggle", "id": item_id}]},
+            headers=auth,
+        )
+        assert response.status_code == (200 if item_id == items[0]["id"] else 404), response.text
@@ -0,0 +1,132 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert, select, update
+
+from app import dispatcher
+from app.core.principal_cache import principal_cache
+from app.core.push import FakePushBackend, PushResult
+from app.database import async_session
+from app.models.notification import Notification, NotificationType
+from app.models.user import User
+
+
+class ScriptedBackend(FakePushBackend):
+    """Answers with a fixed result per device token."""
+
+    def __init__(self, results: dict[str, PushResult] | None = None) -> None:
+        super().__init__()
+        self.results = results or {}
+
+    async def send(self, messages):
+        await super().send(messages)
+        return [self.results.get(message.token, PushResult.ACCEPTED) for message in messages]
+
+
+async def _dispatch(backend) -> int:
+    async with async_session() as db:
+        return await dispatcher.dispatch_once(db, backend)
+
+
+@pytest.fixture(autouse=True)
+async def empty_queue():
+    # Deliver whatever earlier runs left due, so each test sees only its own rows
+    while await _dispatch(FakePushBackend()):
+        pass
+
+
+async def _user(token: str | None) -> str:
+    async with async_session() as db:
+        user = User(email=f"push-{uuid.uuid4().hex[:12]}@example.com", password="x", name="Push", fcm_token=token)
+        db.add(user)
+        await db.commit()
+        return user.id
+
+
+async def _notifications(user_id: str, count: int, minutes_ago: int = 1) -> list[str]:
+    trigger_at = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "title": f"n{i}",
+            "body": "",
+            "type": NotificationType.TASK_REMINDER,
+            "trigger_at": trigger_at - timedelta(seconds=i),
+            "is_sent": False,
+            "is_read": False,
+        }
+        for i in range(count)
+    ]
+    async with async_session() as db:
+        await db.execute(insert(Notification), rows)
+        await db.commit()
+    return [row["id"] for row in rows]
+
+
+async def _state(ids: list[str]) -> dict[str, tuple]:
+    async with async_session() as db:
+        result = await db.execute(
+            select(Notification.id, Notification.is_sent, Notification.attempts, Notification.next_attempt_at)
+            .where(Notification.id.in_(ids))
+        )
+        return {row.id: row[1:] for row in result.all()}
+
+
+async def test_batches_and_digests(monkeypatch):
+    monkeypatch.setattr(dispatcher.settings, "DISPATCH_BATCH_SIZE", 6)
+    monkeypatch.setattr(dispatcher.settings, "DISPATCH_DIGEST_MIN", 3)
+    busy, quiet, no_device = await _user("busy"), await _user("quiet"), await _user(None)
+    busy_ids = await _notifications(busy, 4)
+    quiet_ids = await _notifications(quiet, 1)
+    silent_ids = await _notifications(no_device, 2, minutes_ago=0)
+
+    backend = ScriptedBackend()
+    # Oldest first: the busy and quiet users' five, and one of the newer pair
+    assert await _dispatch(backend) == 6
+    assert await _dispatch(backend) == 1
+    assert await _dispatch(backend) == 0
+
+    pushes = {message.token: message for message in backend.deliveries}
+    assert sorted(pushes) == ["busy", "quiet"]
+    assert pushes["busy"].data == {"type": "DIGEST"}
+    assert sorted(pushes["busy"].notification_ids) == sorted(busy_ids)
+    assert pushes["quiet"].notification_ids == quiet_ids
+    assert all(sent for sent, *_ in (await _state(busy_ids + quiet_ids + silent_ids)).values())
+
+
+async def test_retries_back_off_then_give_up(monkeypatch):
+    monkeypatch.setattr(dispatcher.settings, "DISPATCH_MAX_ATTEMPTS", 2)
+    user_id = await _user("flaky")
+    [notification_id] = await _notifications(user_id, 1)
+    backend = ScriptedBackend({"flaky": PushResult.FAILED})
+
+    assert await _dispatch(backend) == 1
+    sent, attempts, next_attempt_at = (await _state([notification_id]))[notification_id]
+    assert (sent, attempts) == (False, 1)
+    assert next_attempt_at > datetime.now(timezone.utc)
+    # Not due again until the backoff runs out
+    assert await _dispatch(backend) == 0
+
+    async with async_session() as db:
+        await db.execute(
+            update(Notification).where(Notification.id == notification_id).values(next_attempt_at=None)
+        )
+        await db.commit()
+    assert await _dispatch(backend) == 1
+    sent, attempts, _ = (await _state([notification_id]))[notification_id]
+    assert (sent, attempts) == (True, 2)
+    assert len(backend.deliveries) == 2
+
+
+async def test_invalid_token_is_cleared():
+    user_id = await _user("dead")
+    [notification_id] = await _notifications(user_id, 1)
+    principal_cache.put(user_id, "access", {"fcm_token": "dead"}, principal_cache.version)
+
+    assert await _dispatch(ScriptedBackend({"dead": PushResult.INVALID_TOKEN})) == 1
+    assert principal_cache.get(user_id, "access") is None
+    assert (await _state([notification_id]))[notification_id][:2] == (True, 0)
+    async with async_session() as db:
+        assert await db.scalar(select(User.fcm_token).where(User.id == user_id)) is None
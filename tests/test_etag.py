@@ -0,0 +1,29 @@
+from app.core import dependencies
+
+
+async def test_conditional_get_until_write(client, auth):
+    first = await client.get("/api/goals", headers=auth)
+    tag = first.headers["ETag"]
+
+    response = await client.get("/api/goals", headers=auth | {"If-None-Match": tag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == tag
+
+    await client.post("/api/goals", json={"title": "G"}, headers=auth)
+    response = await client.get("/api/goals", headers=auth | {"If-None-Match": tag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != tag
+    assert [goal["title"] for goal in response.json()] == ["G"]
+
+
+async def test_clock_dependent_tag_expires(client, auth, monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr(dependencies.time, "time", lambda: now)
+    tag = (await client.get("/api/notifications", headers=auth)).headers["ETag"]
+    assert (await client.get("/api/notifications", headers=auth | {"If-None-Match": tag})).status_code == 304
+
+    # A reminder may have come due without any write
+    now += dependencies.settings.ETAG_CLOCK_SECONDS
+    response = await client.get("/api/notifications", headers=auth | {"If-None-Match": tag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != tag
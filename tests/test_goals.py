@@ -0,0 +1,61 @@
+import asyncio
+
+from sqlalchemy import text
+
+from app.database import engine
+from app.schemas.goal import GoalTree
+
+
+async def test_concurrent_status_changes_count_once(client, auth):
+    goal = (await client.post("/api/goals", json={"title": "G"}, headers=auth)).json()
+
+    # Hold the row so every request is in flight before any of them can write
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1 FROM goals WHERE id = :id FOR UPDATE"), {"id": goal["id"]})
+        pending = asyncio.gather(
+            *(client.patch(f"/api/goals/{goal['id']}", json={"status": "COMPLETED"}, headers=auth) for _ in range(5))
+        )
+        await asyncio.sleep(0.3)
+        await connection.rollback()
+        responses = await pending
+    assert all(response.status_code == 200 for response in responses)
+
+    overview = (await client.get("/api/analytics/overview", headers=auth)).json()
+    assert (overview["total_goals"], overview["completed_goals"]) == (1, 1)
+
+
+async def test_streamed_tree_matches_the_lists(client, auth, milestone):
+    goal_id = milestone["goal_id"]
+    second = (await client.post(f"/api/goals/{goal_id}/milestones", json={"title": "Second"}, headers=auth)).json()
+    tasks = (
+        await client.post(
+            f"/api/milestones/{milestone['id']}/tasks/bulk", json={"tasks": [{"title": "a"}, {"title": "b"}]}, headers=auth
+        )
+    ).json()
+    for title in ("one", "two"):
+        await client.post(f"/api/tasks/{tasks[0]['id']}/checklist", json={"title": title}, headers=auth)
+    await client.post(f"/api/tasks/{tasks[1]['id']}/notes", json={"content": "note"}, headers=auth)
+
+    response = await client.get(f"/api/goals/{goal_id}/tree", headers=auth)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    GoalTree.model_validate_json(response.content)
+    tree = response.json()
+
+    assert [m["id"] for m in tree["milestones"]] == [milestone["id"], second["id"]]
+    assert tree["milestones"][1]["tasks"] == []
+    # Serialized as the list routes serialize the same rows
+    listed = (await client.get(f"/api/milestones/{milestone['id']}/tasks", headers=auth)).json()
+    branch = tree["milestones"][0]["tasks"]
+    assert [{key: task[key] for key in listed[0]} for task in branch] == listed
+    by_id = {task["id"]: task for task in branch}
+    assert [item["title"] for item in by_id[tasks[0]["id"]]["checklist_items"]] == ["one", "two"]
+    assert by_id[tasks[1]["id"]].get("notes") is None
+
+    with_notes = (await client.get(f"/api/goals/{goal_id}/tree", params={"include_notes": True}, headers=auth)).json()
+    by_id = {task["id"]: task for task in with_notes["milestones"][0]["tasks"]}
+    assert [note["content"] for note in by_id[tasks[1]["id"]]["notes"]] == ["note"]
+
+    tag = response.headers["ETag"]
+    assert (await client.get(f"/api/goals/{goal_id}/tree", headers=auth | {"If-None-Match": tag})).status_code == 304
+    assert (await client.get("/api/goals/missing/tree", headers=auth)).status_code == 404
@@ -0,0 +1,20 @@
+import uuid
+
+from sqlalchemy import select, func, update
+
+from app.core import job_queue
+from app.database import async_session
+from app.models.job import Job, JobStatus
+
+
+async def test_enqueue_deduplicates_on_key():
+    key = f"test:{uuid.uuid4()}"
+    async with async_session() as db:
+        assert await job_queue.enqueue(db, "repair-progress", key=key)
+        assert not await job_queue.enqueue(db, "repair-progress", key=key)
+        assert await db.scalar(select(func.count()).where(Job.key == key)) == 1
+
+        # A failed job no longer holds its key
+        await db.execute(update(Job).where(Job.key == key).values(status=JobStatus.FAILED))
+        assert await job_queue.enqueue(db, "repair-progress", key=key)
+        await db.rollback()
@@ -0,0 +1,86 @@
+import asyncio
+import json
+
+from sqlalchemy import select
+
+from app.core import live
+from app.core.live import Subscription, hub
+from app.core.security import decode_token
+from app.database import async_session
+
+
+def _delta(kind: str, entity_id: str, progress: float) -> tuple[tuple[str, str], dict]:
+    return (kind, entity_id), {"type": kind, "id": entity_id, "progress": progress, "status": "PENDING"}
+
+
+async def test_pending_changes_are_conflated():
+    subscription = Subscription(limit=10)
+    for key, delta in (_delta("task", "a", 10), _delta("task", "b", 20), _delta("task", "a", 30)):
+        subscription.offer(key, delta)
+
+    deltas, overflowed = await subscription.next()
+    assert not overflowed
+    # One per entity with its latest state, in the order of the last change
+    assert [(delta["id"], delta["progress"]) for delta in deltas] == [("b", 20), ("a", 30)]
+
+
+async def test_falling_behind_asks_for_a_resync():
+    subscription = Subscription(limit=2)
+    for entity_id in "abc":
+        subscription.offer(*_delta("task", entity_id, 0))
+    assert await subscription.next() == ([], True)
+
+    subscription.offer(*_delta("task", "d", 0))
+    deltas, overflowed = await subscription.next()
+    assert [delta["id"] for delta in deltas] == ["d"] and not overflowed
+
+
+async def test_only_committed_changes_are_published():
+    with hub.subscribe("live-user") as subscription:
+        async with async_session() as db:
+            live.record(db, "live-user", live.TASK, "rolled-back", 50.0, "PENDING")
+            await db.execute(select(1))
+            await db.rollback()
+            live.record(db, "live-user", live.TASK, "committed", 50.0, "PENDING")
+            await db.execute(select(1))
+            await db.commit()
+
+        deltas, _ = await asyncio.wait_for(subscription.next(), 1)
+    assert [delta["id"] for delta in deltas] == ["committed"]
+
+
+async def test_a_status_change_reaches_the_owner(client, auth, milestone):
+    user_id = decode_token(auth["Authorization"].removeprefix("Bearer "))["sub"]
+    task = (await client.post(f"/api/milestones/{milestone['id']}/tasks", json={"title": "T"}, headers=auth)).json()
+
+    with hub.subscribe(user_id) as subscription:
+        await client.patch(f"/api/tasks/{task['id']}", json={"status": "COMPLETED"}, headers=auth)
+        deltas, _ = await asyncio.wait_for(subscription.next(), 1)
+
+    progress = {(delta["type"], delta["id"]): delta["progress"] for delta in deltas}
+    assert progress == {
+        ("task", task["id"]): 100.0,
+        ("milestone", milestone["id"]): 100.0,
+        ("goal", milestone["goal_id"]): 100.0,
+    }
+
+
+async def test_stream_events(monkeypatch):
+    monkeypatch.setattr(live.settings, "LIVE_KEEPALIVE_SECONDS", 0.05)
+    monkeypatch.setattr(live.settings, "LIVE_MAX_PENDING", 2)
+    events = live.stream("stream-user")
+
+    # A (re)connecting client starts with a resync
+    assert await anext(events) == b"retry: 3000\nevent: resync\ndata: {}\n\n"
+    assert await anext(events) == b": keepalive\n\n"
+
+    hub.publish("stream-user", [_delta("task", "a", 40)])
+    event = await anext(events)
+    assert event.startswith(b"event: progress\ndata: ")
+    assert json.loads(event.removeprefix(b"event: progress\ndata: ")) == [_delta("task", "a", 40)[1]]
+
+    hub.publish("stream-user", [_delta("task", entity_id, 0) for entity_id in "abc"])
+    assert await anext(events) == b"event: resync\ndata: {}\n\n"
+
+    await events.aclose()
+    assert "stream-user" not in hub._subscribers
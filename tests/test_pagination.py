@@ -0,0 +1,91 @@
+import base64
+import json
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import DEFAULT_PAGE_SIZE, NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.models.checklist import ChecklistItem
+from app.models.goal import Goal
+
+
+def _raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+async def _pages(client, url, auth, **params) -> list[list[dict]]:
+    pages, cursor = [], None
+    while True:
+        page_params = {**params, "cursor": cursor} if cursor else params
+        response = await client.get(url, params=page_params, headers=auth)
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip():
+    key = (datetime(2026, 10, 18, 12, 30, tzinfo=timezone.utc), "goal-id")
+    assert decode_cursor(encode_cursor(key), [Goal.created_at, Goal.id]) == key
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        [1, "id"],  # int for the rank
+        [None, "id"],
+        [["a"], "id"],
+        ["a\x00", "id"],  # Postgres text cannot hold NUL
+        ["a"],
+        {"rank": "a", "id": "id"},
+    ],
+)
+def test_malformed_cursor_is_a_bad_request(payload):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(_raw_cursor(payload), [ChecklistItem.rank, ChecklistItem.id])
+    assert error.value.status_code == 400
+
+
+async def test_pages_cover_the_list_once(client, auth, milestone):
+    url = f"/api/milestones/{milestone['id']}/tasks"
+    # Created in one transaction, so they share created_at and the id breaks the tie
+    response = await client.post(f"{url}/bulk", json={"tasks": [{"title": f"t{i}"} for i in range(7)]}, headers=auth)
+    assert response.status_code == 201, response.text
+
+    pages = await _pages(client, url, auth, limit=3)
+    assert [len(page) for page in pages] == [3, 3, 1]
+    listed = [task["id"] for page in pages for task in page]
+    assert listed == sorted(task["id"] for task in response.json())
+
+
+async def test_lists_are_bounded_without_a_limit(client, auth, milestone):
+    url = f"/api/milestones/{milestone['id']}/tasks"
+    for start in range(0, DEFAULT_PAGE_SIZE + 1, 200):
+        count = min(200, DEFAULT_PAGE_SIZE + 1 - start)
+        await client.post(f"{url}/bulk", json={"tasks": [{"title": "t"}] * count}, headers=auth)
+
+    response = await client.get(url, headers=auth)
+    assert len(response.json()) == DEFAULT_PAGE_SIZE
+    assert NEXT_CURSOR_HEADER in response.headers
+
+
+async def test_skip_cannot_follow_a_cursor(client, auth):
+    for title in "abc":
+        await client.post("/api/goals", json={"title": title}, headers=auth)
+    response = await client.get("/api/goals", params={"limit": 1}, headers=auth)
+    cursor = response.headers[NEXT_CURSOR_HEADER]
+
+    assert (await client.get("/api/goals", params={"cursor": cursor, "skip": 1}, headers=auth)).status_code == 400
+    assert (await client.get("/api/notifications", params={"cursor": cursor, "skip": 1}, headers=auth)).status_code == 400
+    response = await client.get("/api/goals", params={"skip": 1}, headers=auth)
+    assert [goal["title"] for goal in response.json()] == ["b", "a"]
+
+
+async def test_malformed_rank_cursor_is_rejected_by_the_route(client, auth, milestone):
+    task = (await client.post(f"/api/milestones/{milestone['id']}/tasks", json={"title": "T"}, headers=auth)).json()
+    response = await client.get(
+        f"/api/tasks/{task['id']}/checklist", params={"cursor": _raw_cursor([1, 2])}, headers=auth
+    )
+    assert response.status_code == 400
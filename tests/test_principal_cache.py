@@ -0,0 +1,28 @@
+from app.core.principal_cache import PrincipalCache, principal_cache
+from app.core.security import decode_token
+
+
+def test_read_from_before_an_invalidation_is_not_cached():
+    cache = PrincipalCache(ttl_seconds=60, max_entries=10)
+    version = cache.version
+    cache.invalidate("user")
+    cache.put("user", "token", {"fcm_token": "old"}, version)
+    assert cache.get("user", "token") is None
+
+    cache.put("user", "token", {"fcm_token": "new"}, cache.version)
+    assert cache.get("user", "token") == {"fcm_token": "new"}
+
+
+async def test_registering_a_token_invalidates_after_commit(client, auth):
+    token = auth["Authorization"].removeprefix("Bearer ")
+    user_id = decode_token(token)["sub"]
+
+    await client.get("/api/notifications", headers=auth)
+    assert principal_cache.get(user_id, token)["fcm_token"] is None
+
+    response = await client.post("/api/notifications/fcm-token", json={"fcm_token": "device"}, headers=auth)
+    assert response.status_code == 204
+    assert principal_cache.get(user_id, token) is None
+
+    await client.get("/api/notifications", headers=auth)
+    assert principal_cache.get(user_id, token)["fcm_token"] == "device"
@@ -0,0 +1,84 @@
+from app.core import ranking
+from app.core.ranking import DIGITS, MAX_RANK_LENGTH, key_after, key_between, keys_between, spread_keys
+
+
+def test_key_after_counts_up():
+    assert key_after(None) == key_between(None, None)
+    assert key_after("a3") == "a4"
+    assert key_after("az") == "b"
+    assert key_after("zz") == "zz1"
+
+
+def test_appends_stay_short():
+    keys = keys_between(None, None, 1000)
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+    assert not any(key.endswith(DIGITS[0]) for key in keys)
+    assert max(map(len, keys)) <= MAX_RANK_LENGTH
+
+
+def test_appends_after_respacing():
+    last = spread_keys(500)[-1]
+    keys = keys_between(last, None, 200)
+    assert last < keys[0] and keys == sorted(keys)
+    assert max(map(len, keys)) <= 6
+
+
+async def test_create_appends_hundreds(client, auth, monkeypatch):
+    # Respace every hundred or so appends instead of every ~1400
+    monkeypatch.setattr(ranking, "MAX_RANK_LENGTH", 3)
+    goal = (await client.post("/api/goals", json={"title": "G"}, headers=auth)).json()
+    milestone = (await client.post(f"/api/goals/{goal['id']}/milestones", json={"title": "M"}, headers=auth)).json()
+    task = (await client.post(f"/api/milestones/{milestone['id']}/tasks", json={"title": "T"}, headers=auth)).json()
+
+    created = []
+    for i in range(400):
+        response = await client.post(f"/api/tasks/{task['id']}/checklist", json={"title": f"item {i}"}, headers=auth)
+        assert response.status_code == 201, response.text
+        created.append(response.json()["id"])
+
+    response = await client.get(f"/api/tasks/{task['id']}/checklist", params={"limit": 500}, headers=auth)
+    assert [item["id"] for item in response.json()] == created
+    assert all(len(item["rank"]) <= 3 for item in response.json())
+
+
+async def test_order_index_moves_to_that_position(client, auth, milestone):
+    task = (await client.post(f"/api/milestones/{milestone['id']}/tasks", json={"title": "T"}, headers=auth)).json()
+    url = f"/api/tasks/{task['id']}/checklist"
+
+    async def titles():
+        return [item["title"] for item in (await client.get(url, headers=auth)).json()]
+
+    for title in "abc":
+        await client.post(url, json={"title": title}, headers=auth)
+    first = (await client.post(url, json={"title": "first", "order_index": 0}, headers=auth)).json()
+    await client.post(url, json={"title": "second", "order_index": 1}, headers=auth)
+    await client.post(url, json={"title": "last", "order_index": 99}, headers=auth)
+    assert await titles() == ["first", "second", "a", "b", "c", "last"]
+
+    response = await client.patch(f"/api/checklist/{first['id']}", json={"order_index": 3}, headers=auth)
+    assert response.status_code == 200
+    assert await titles() == ["second", "a", "b", "first", "c", "last"]
+
+    items = (await client.get(url, headers=auth)).json()
+    response = await client.post(
+        f"{url}/batch",
+        json={
+            "operations": [
+                {"op": "create", "title": "new", "order_index": 0},
+                {"op": "update", "id": items[-1]["id"], "order_index": 1},
+                {"op": "delete", "id": items[0]["id"]},
+            ]
+        },
+        headers=auth,
+    )
+    assert [item["title"] for item in response.json()] == ["new", "last", "a", "b", "first", "c"]
+
+
+async def test_milestone_order_index_moves_to_that_position(client, auth, milestone):
+    url = f"/api/goals/{milestone['goal_id']}/milestones"
+    await client.post(url, json={"title": "second"}, headers=auth)
+    await client.post(url, json={"title": "first", "order_index": 0}, headers=auth)
+    response = await client.patch(f"/api/milestones/{milestone['id']}", json={"order_index": 2}, headers=auth)
+    assert response.status_code == 200
+    assert [m["title"] for m in (await client.get(url, headers=auth)).json()] == ["first", "second", "Milestone"]
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+
+from app.database import async_session
+from app.models.notification import Notification
+from app.models.task import Task, TaskStatus
+from tests.conftest import register
+
+
+async def test_naive_due_date_reopens_overdue_task(client, auth, milestone):
+    response = await client.post(
+        f"/api/milestones/{milestone['id']}/tasks", json={"title": "T", "due_date": "2020-01-01T09:00:00"}, headers=auth
+    )
+    assert response.status_code == 201, response.text
+    task = response.json()
+    async with async_session() as db:
+        await db.execute(update(Task).where(Task.id == task["id"]).values(status=TaskStatus.OVERDUE))
+        await db.commit()
+
+    # No offset: taken as UTC
+    response = await client.patch(f"/api/tasks/{task['id']}", json={"due_date": "2999-01-01T09:00:00"}, headers=auth)
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "PENDING"
+    assert response.json()["due_date"].startswith("2999-01-01T09:00:00")
+
+
+async def test_naive_reminder_at_is_scheduled(client, auth, milestone):
+    soon = (datetime.now(timezone.utc) + timedelta(minutes=5)).replace(tzinfo=None, microsecond=0)
+    response = await client.post(
+        f"/api/milestones/{milestone['id']}/tasks", json={"title": "T", "reminder_at": soon.isoformat()}, headers=auth
+    )
+    assert response.status_code == 201, response.text
+    task = response.json()
+
+    later = soon + timedelta(minutes=1)
+    response = await client.patch(f"/api/tasks/{task['id']}", json={"reminder_at": later.isoformat()}, headers=auth)
+    assert response.status_code == 200, response.text
+
+    async with async_session() as db:
+        result = await db.execute(
+            select(Notification.trigger_at).where(Notification.task_id == task["id"], Notification.is_sent.is_(False))
+        )
+        assert result.scalars().all() == [later.replace(tzinfo=timezone.utc)]
+
+
+async def test_bulk_create_rolls_progress_up_once(client, auth, milestone):
+    url = f"/api/milestones/{milestone['id']}/tasks"
+    done = (await client.post(url, json={"title": "done"}, headers=auth)).json()
+    await client.patch(f"/api/tasks/{done['id']}", json={"status": "COMPLETED"}, headers=auth)
+
+    soon = datetime.now(timezone.utc) + timedelta(minutes=5)
+    response = await client.post(
+        f"{url}/bulk",
+        json={"tasks": [{"title": "a"}, {"title": "b", "reminder_at": soon.isoformat()}, {"title": "c"}]},
+        headers=auth,
+    )
+    assert response.status_code == 201, response.text
+    created = response.json()
+    assert [task["title"] for task in created] == ["a", "b", "c"]
+
+    milestones = (await client.get(f"/api/goals/{milestone['goal_id']}/milestones", headers=auth)).json()
+    assert milestones[0]["progress"] == 25.0
+    assert (await client.get(f"/api/goals/{milestone['goal_id']}", headers=auth)).json()["progress"] == 25.0
+    overview = (await client.get("/api/analytics/overview", headers=auth)).json()
+    assert (overview["total_tasks"], overview["completed_tasks"]) == (4, 1)
+
+    async with async_session() as db:
+        result = await db.execute(
+            select(Notification.task_id).where(Notification.task_id.in_([task["id"] for task in created]))
+        )
+        assert result.scalars().all() == [created[1]["id"]]
+
+
+async def test_bulk_create_is_all_or_nothing(client, auth, milestone):
+    url = f"/api/milestones/{milestone['id']}/tasks"
+    assert (await client.post(f"{url}/bulk", json={"tasks": []}, headers=auth)).status_code == 422
+    response = await client.post(f"{url}/bulk", json={"tasks": [{"title": "a"}, {"due_date": "2026-10-18"}]}, headers=auth)
+    assert response.status_code == 422
+
+    other = await register(client)
+    response = await client.post(f"{url}/bulk", json={"tasks": [{"title": "a"}]}, headers=other)
+    assert response.status_code == 404
+    assert (await client.get(url, headers=auth)).json() == []